@@ -9,16 +9,40 @@ Este módulo proporciona clases y funciones para trabajar con archivos .DAT
 generados por analizadores de espectro Rohde & Schwarz.
 """
 
-from .sa_data import SAData, load_sa_data
+from .sa_data import SAData, load_sa_data, load_sa_data_many
 from .conversion_mixin import ConversionMixin
+from .processing_mixin import estimate_crops, detect_mirrors
 from .parser_mixin import ParserMixin
+from .stream_reader import SAStreamReader
+from .binary_format import convert_tree_to_binary
+from .follow_reader import SAFollowReader
+from .farfield import FarFieldGrid, load_farfield, load_farfield_many
+from .pipeline import Pipeline
+from .dataset import SADataset
+from .resampling import AngularResampler
+from .calibration import AngleCalibration
+from .noise import NoiseFloor
 
 # Exportar las principales clases y funciones
 __all__ = [
     'SAData',
     'load_sa_data',
+    'load_sa_data_many',
     'ConversionMixin',
-    'ParserMixin'
+    'estimate_crops',
+    'detect_mirrors',
+    'ParserMixin',
+    'SAStreamReader',
+    'convert_tree_to_binary',
+    'SAFollowReader',
+    'FarFieldGrid',
+    'load_farfield',
+    'load_farfield_many',
+    'Pipeline',
+    'SADataset',
+    'AngularResampler',
+    'AngleCalibration',
+    'NoiseFloor'
 ]
 
 # Información del paquete
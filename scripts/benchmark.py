@@ -0,0 +1,152 @@
+# benchmark.py - Mediciones de rendimiento de la carga de archivos .DAT
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+Benchmarks de las rutas de carga de SAData.
+
+Uso desde la raíz del repositorio:
+
+    python -m scripts.benchmark mediciones/Originales/*.DAT
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .parser_mixin import TraceData
+from .sa_data import SAData
+
+
+def _time_call(func, repeat: int) -> float:
+    """
+    Retorna el mejor tiempo (en segundos) de `repeat` ejecuciones de func
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_parser(file_paths: List[str], repeat: int = 5) -> Dict[str, float]:
+    """
+    Compara el parser vectorizado (motor 'numpy') contra el parser línea por línea
+
+    Ambos motores recorren _parse_file completo (lectura, header y datos),
+    y se verifica que los arrays resultantes sean idénticos.
+
+    Parameters:
+    -----------
+    file_paths : List[str]
+        Archivos .DAT a cargar en cada repetición
+    repeat : int
+        Número de repeticiones; se reporta el mejor tiempo
+
+    Returns:
+    --------
+    Dict[str, float]
+        Tiempos en segundos por motor y la aceleración obtenida
+    """
+    for path in file_paths:
+        reference = SAData(path, parser_engine='python')
+        candidate = SAData(path, parser_engine='numpy')
+        for key in reference.data:
+            if not np.array_equal(reference.data[key], candidate.data[key]):
+                raise AssertionError(f"Los motores difieren en '{key}' para {path}")
+
+    results = {}
+    for engine in ('python', 'numpy'):
+        results[engine] = _time_call(
+            lambda: [SAData(path, parser_engine=engine) for path in file_paths], repeat)
+    results['speedup'] = results['python'] / results['numpy']
+    return results
+
+
+def _save_dat_file_loop(sa: SAData, output_path: str) -> None:
+    """Escritor punto por punto (implementación previa), usado como referencia"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for key, value in sa.header_data.items():
+            f.write(f"{key};{value}\n")
+        n_points = len(sa.data['x'])
+        f.write(f"Values;{n_points};\n")
+        traces = TraceData.stack(sa.data)
+        for i in range(n_points):
+            row = ';'.join(f"{value}" for value in traces[i])
+            f.write(f"{sa.data['x'][i]};{row}\n")
+
+
+def bench_writer(file_paths: List[str], repeat: int = 5, precision: int = 6) -> Dict[str, float]:
+    """
+    Compara el escritor vectorizado de _save_dat_file contra el escritor punto por punto
+
+    Se verifica que la salida con precisión completa sea idéntica byte a byte.
+
+    Parameters:
+    -----------
+    file_paths : List[str]
+        Archivos .DAT a reescribir en cada repetición
+    repeat : int
+        Número de repeticiones; se reporta el mejor tiempo
+    precision : int
+        Decimales usados para medir el modo de precisión fija
+
+    Returns:
+    --------
+    Dict[str, float]
+        Tiempos en segundos por variante y la aceleración del modo por defecto
+    """
+    captures = [SAData(path) for path in file_paths]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        reference_path = os.path.join(tmp_dir, 'reference.DAT')
+        candidate_path = os.path.join(tmp_dir, 'candidate.DAT')
+        for sa in captures:
+            _save_dat_file_loop(sa, reference_path)
+            sa._save_dat_file(candidate_path, sa.data)
+            with open(reference_path, 'rb') as ref, open(candidate_path, 'rb') as cand:
+                if ref.read() != cand.read():
+                    raise AssertionError(f"La salida del escritor difiere para {sa.file_path}")
+
+        results = {
+            'loop': _time_call(
+                lambda: [_save_dat_file_loop(sa, reference_path) for sa in captures], repeat),
+            'vectorized': _time_call(
+                lambda: [sa._save_dat_file(candidate_path, sa.data) for sa in captures], repeat),
+            'fixed': _time_call(
+                lambda: [sa._save_dat_file(candidate_path, sa.data, precision=precision)
+                         for sa in captures], repeat)
+        }
+
+    results['speedup'] = results['loop'] / results['vectorized']
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Ejecuta los benchmarks sobre los archivos indicados en la línea de comandos"""
+    file_paths = sys.argv[1:] if argv is None else argv
+    if not file_paths:
+        print("Uso: python -m scripts.benchmark ARCHIVO.DAT [ARCHIVO.DAT ...]")
+        return
+
+    results = bench_parser(file_paths)
+    print(f"Parser ({len(file_paths)} archivos)")
+    print(f"  python: {results['python'] * 1e3:.2f} ms")
+    print(f"  numpy:  {results['numpy'] * 1e3:.2f} ms")
+    print(f"  aceleración: x{results['speedup']:.2f}")
+
+    results = bench_writer(file_paths)
+    print(f"Escritor ({len(file_paths)} archivos)")
+    print(f"  punto por punto:    {results['loop'] * 1e3:.2f} ms")
+    print(f"  vectorizado:        {results['vectorized'] * 1e3:.2f} ms")
+    print(f"  decimales fijos:    {results['fixed'] * 1e3:.2f} ms")
+    print(f"  aceleración: x{results['speedup']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+# binary_format.py - Contenedor binario compacto para datos de analizadores de espectro
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+Formato binario .sab para SAData.
+
+Estructura del archivo:
+- 8 bytes de firma (BINARY_MAGIC)
+- 8 bytes little-endian con la longitud del bloque de metadatos
+- Metadatos en JSON (UTF-8): header, número de puntos, historial de
+  procesamiento y la descripción (dtype, forma, offset) de cada array
+- Relleno hasta alinear a 64 bytes, seguido de los arrays x y trazas en crudo
+
+Como los arrays quedan alineados y sin comprimir, se pueden mapear en memoria
+directamente, sin ningún paso de parseo.
+"""
+
+import fnmatch
+import json
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from .compression import split_compression_extension
+
+BINARY_MAGIC = b'SADATA\x00\x01'
+BINARY_EXTENSION = '.sab'
+BINARY_VERSION = 1
+
+# Alineación en bytes del comienzo de cada array
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    """Redondea un offset hacia arriba al múltiplo de _ALIGNMENT"""
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_binary(output_path: str, header_data: Dict[str, str], x_values: np.ndarray,
+                 traces: np.ndarray, history: Optional[List[Dict]] = None,
+                 source: Optional[str] = None) -> str:
+    """
+    Escribe un archivo .sab con header, historial y arrays
+
+    Parameters:
+    -----------
+    output_path : str
+        Ruta del archivo a escribir
+    header_data : Dict[str, str]
+        Metadatos del header
+    x_values : np.ndarray
+        Valores del eje x
+    traces : np.ndarray
+        Array (n_points, n_traces) con las trazas
+    history : Optional[List[Dict]]
+        Historial de procesamiento
+    source : Optional[str]
+        Ruta del archivo original
+
+    Returns:
+    --------
+    str
+        Ruta del archivo escrito
+    """
+    arrays = {
+        'x': np.ascontiguousarray(x_values),
+        'traces': np.ascontiguousarray(traces)
+    }
+
+    # Los offsets dependen del largo del JSON, que a su vez contiene los offsets:
+    # se recalcula el layout hasta que el comienzo de los datos no cambia
+    layout = {}
+    data_start = 0
+    while True:
+        offset = data_start
+        for name, array in arrays.items():
+            offset = _align(offset)
+            layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset += array.nbytes
+
+        meta = {
+            'version': BINARY_VERSION,
+            'source': source,
+            'header': header_data,
+            'n_points': int(len(arrays['x'])),
+            'history': history or [],
+            'arrays': layout
+        }
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        required_start = _align(len(BINARY_MAGIC) + 8 + len(meta_bytes))
+        if required_start == data_start:
+            break
+        data_start = required_start
+
+    with open(output_path, 'wb') as file:
+        file.write(BINARY_MAGIC)
+        file.write(struct.pack('<Q', len(meta_bytes)))
+        file.write(meta_bytes)
+        for name, array in arrays.items():
+            file.write(b'\x00' * (layout[name]['offset'] - file.tell()))
+            file.write(array.tobytes())
+
+    return output_path
+
+
+def read_binary(file_path: str, mmap_mode: Optional[str] = 'c') -> Tuple[Dict, np.ndarray, np.ndarray]:
+    """
+    Lee un archivo .sab
+
+    Parameters:
+    -----------
+    file_path : str
+        Ruta del archivo .sab
+    mmap_mode : Optional[str]
+        Modo de np.memmap ('r', 'c', 'r+'). 'c' (default) mapea en memoria con
+        copy-on-write; None lee los arrays a memoria
+
+    Returns:
+    --------
+    Tuple[Dict, np.ndarray, np.ndarray]
+        (metadatos, x, trazas)
+
+    Raises:
+    -------
+    ValueError
+        Si el archivo no es un contenedor .sab válido
+    """
+    with open(file_path, 'rb') as file:
+        if file.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"El archivo {file_path} no es un contenedor binario de SAData")
+        (meta_length,) = struct.unpack('<Q', file.read(8))
+        meta = json.loads(file.read(meta_length).decode('utf-8'))
+
+        if meta.get('version') != BINARY_VERSION:
+            raise ValueError(f"Versión de formato no soportada en {file_path}: {meta.get('version')}")
+
+        arrays = {}
+        for name, spec in meta['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            shape = tuple(spec['shape'])
+            if mmap_mode is None or int(np.prod(shape)) == 0:
+                file.seek(spec['offset'])
+                count = int(np.prod(shape))
+                arrays[name] = np.fromfile(file, dtype=dtype, count=count).reshape(shape)
+            else:
+                arrays[name] = np.memmap(file_path, dtype=dtype, mode=mmap_mode,
+                                         offset=spec['offset'], shape=shape)
+
+    return meta, arrays['x'], arrays['traces']
+
+
+def convert_tree_to_binary(root: str, output_root: Optional[str] = None,
+                           pattern: str = '*.DAT') -> List[str]:
+    """
+    Convierte todos los .DAT de un árbol de directorios a contenedores .sab
+
+    El patrón no distingue mayúsculas de minúsculas y se compara con el nombre
+    sin extensión de compresión, así '*.DAT' también convierte 'x.dat' y
+    'x.DAT.gz'. Si un archivo existe comprimido y sin comprimir, se usa el
+    sin comprimir.
+
+    Parameters:
+    -----------
+    root : str
+        Directorio raíz a recorrer (por ejemplo './mediciones')
+    output_root : Optional[str]
+        Directorio raíz de salida; se replica la estructura de subdirectorios.
+        Si es None, cada .sab se escribe junto a su .DAT
+    pattern : str
+        Patrón de nombres de archivo a convertir (sin la extensión de compresión)
+
+    Returns:
+    --------
+    List[str]
+        Rutas de los archivos .sab generados
+    """
+    # Import local para evitar el ciclo sa_data -> binary_format -> sa_data
+    from .sa_data import SAData
+
+    written = []
+    for directory, subdirs, files in os.walk(root):
+        # No recorrer directorios ocultos (por ejemplo el cache .sa_cache)
+        subdirs[:] = sorted(d for d in subdirs if not d.startswith('.'))
+
+        target_dir = directory
+        if output_root is not None:
+            target_dir = os.path.normpath(os.path.join(output_root, os.path.relpath(directory, root)))
+            os.makedirs(target_dir, exist_ok=True)
+
+        converted = set()
+        for name in sorted(files):
+            base = split_compression_extension(name)[0]
+            if not fnmatch.fnmatch(base.lower(), pattern.lower()):
+                continue
+            output_path = os.path.join(target_dir, os.path.splitext(base)[0] + BINARY_EXTENSION)
+            # 'x.DAT' se ordena antes que 'x.DAT.gz': la copia comprimida se omite
+            if output_path in converted:
+                continue
+            converted.add(output_path)
+            sa = SAData(os.path.join(directory, name))
+            written.append(sa.save_binary(output_path))
+
+    return written
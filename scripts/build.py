@@ -0,0 +1,446 @@
+# build.py - Reprocesado incremental del árbol de mediciones
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+Grafo de dependencias estilo make para el árbol de mediciones.
+
+Cada paso declara sus archivos de entrada, sus salidas, la función que lo
+ejecuta y sus parámetros. Al ejecutar se guarda una firma por paso (hash del
+contenido de las entradas, de los parámetros y del nombre de la función), y
+en la siguiente corrida solo se rehacen los pasos cuya firma cambió o cuyas
+salidas faltan. Los hashes de archivos se cachean por (mtime, tamaño) para no
+releer archivos sin cambios.
+
+measurement_graph arma el grafo completo a partir de un manifiesto (ver
+scripts.manifest): .DAT original -> .DAT procesado -> métricas -> figuras.
+
+    grafo = measurement_graph('mediciones/preprocesado.toml')
+    grafo.stale()   # qué se rehace y por qué, sin ejecutar nada
+    grafo.run()
+
+Desde la línea de comandos (-n lista los pasos desactualizados sin ejecutar):
+
+    python -m scripts.build mediciones/preprocesado.toml -n
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .compression import split_compression_extension
+
+# Bloque de lectura para calcular hashes de archivos grandes
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class BuildStep:
+    """
+    Un nodo del grafo: función que produce `outputs` a partir de `inputs`
+    """
+
+    def __init__(self, name: str, action: Callable, inputs: Sequence[str], outputs: Sequence[str],
+                 params: Optional[Dict] = None):
+        """
+        Parameters:
+        -----------
+        name : str
+            Nombre único del paso
+        action : Callable
+            Función action(inputs, outputs, **params) que escribe las salidas
+        inputs : Sequence[str]
+            Archivos leídos por el paso
+        outputs : Sequence[str]
+            Archivos escritos por el paso
+        params : Optional[Dict]
+            Parámetros de la función (forman parte de la firma; deben ser
+            serializables a JSON)
+        """
+        self.name = name
+        self.action = action
+        self.inputs = [os.path.normpath(path) for path in inputs]
+        self.outputs = [os.path.normpath(path) for path in outputs]
+        self.params = dict(params or {})
+
+    def __repr__(self) -> str:
+        """Representación string del objeto"""
+        return f"BuildStep('{self.name}', inputs={len(self.inputs)}, outputs={len(self.outputs)})"
+
+
+class BuildGraph:
+    """
+    Grafo de pasos con reejecución incremental por hash de contenido
+    """
+
+    def __init__(self, state_path: str = '.build_state.json'):
+        """
+        Parameters:
+        -----------
+        state_path : str, optional
+            Archivo JSON donde se guardan las firmas de los pasos y los hashes
+            de archivos entre corridas
+        """
+        self.state_path = state_path
+        self.steps: Dict[str, BuildStep] = {}
+        self._producers: Dict[str, str] = {}
+        self._state = self._load_state()
+
+    def _load_state(self) -> Dict:
+        """Lee el estado de la corrida anterior (vacío si no existe o está dañado)"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault('steps', {})
+        state.setdefault('files', {})
+        return state
+
+    def _save_state(self) -> None:
+        """Escribe el estado de forma atómica"""
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.state_path)
+
+    def add(self, name: str, action: Callable, inputs: Sequence[str], outputs: Sequence[str],
+            **params) -> BuildStep:
+        """
+        Agrega un paso al grafo
+
+        Parameters:
+        -----------
+        name : str
+            Nombre único del paso
+        action : Callable
+            Función action(inputs, outputs, **params)
+        inputs : Sequence[str]
+            Archivos de entrada
+        outputs : Sequence[str]
+            Archivos de salida
+        **params
+            Parámetros de la función
+
+        Returns:
+        --------
+        BuildStep
+            El paso agregado
+
+        Raises:
+        -------
+        ValueError
+            Si el nombre ya existe o alguna salida ya la produce otro paso
+        """
+        if name in self.steps:
+            raise ValueError(f"Ya existe un paso llamado '{name}'")
+        step = BuildStep(name, action, inputs, outputs, params)
+        for output in step.outputs:
+            if output in self._producers:
+                raise ValueError(f"La salida '{output}' ya la produce el paso '{self._producers[output]}'")
+        for output in step.outputs:
+            self._producers[output] = name
+        self.steps[name] = step
+        return step
+
+    def order(self) -> List[BuildStep]:
+        """
+        Pasos en orden topológico (cada paso después de los que producen sus entradas)
+
+        Raises:
+        -------
+        ValueError
+            Si el grafo tiene un ciclo
+        """
+        ordered: List[BuildStep] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, chain: List[str]) -> None:
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Ciclo de dependencias: {' -> '.join(chain + [name])}")
+            state[name] = 'visiting'
+            for path in self.steps[name].inputs:
+                if path in self._producers:
+                    visit(self._producers[path], chain + [name])
+            state[name] = 'done'
+            ordered.append(self.steps[name])
+
+        for name in self.steps:
+            visit(name, [])
+        return ordered
+
+    def _file_hash(self, path: str) -> str:
+        """SHA-256 del contenido, recalculado solo si cambió el mtime o el tamaño"""
+        info = os.stat(path)
+        cached = self._state['files'].get(path)
+        if cached and cached['mtime_ns'] == info.st_mtime_ns and cached['size'] == info.st_size:
+            return cached['sha256']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        self._state['files'][path] = {'mtime_ns': info.st_mtime_ns, 'size': info.st_size,
+                                      'sha256': digest.hexdigest()}
+        return digest.hexdigest()
+
+    def _signature(self, step: BuildStep) -> str:
+        """Firma del paso: función, parámetros y contenido de cada entrada"""
+        digest = hashlib.sha256()
+        # Solo el nombre calificado: el módulo es __main__ al correr con python -m
+        action = step.action.__qualname__
+        digest.update(json.dumps([action, step.params, step.outputs], sort_keys=True, default=str).encode())
+        for path in step.inputs:
+            digest.update(f"\n{path}:{self._file_hash(path)}".encode())
+        return digest.hexdigest()
+
+    def _check(self, step: BuildStep, outdated: set) -> Optional[str]:
+        """
+        Motivo por el que el paso está desactualizado, o None si está al día
+
+        `outdated` son los pasos ya marcados para rehacer en esta corrida: sus
+        salidas van a cambiar, así que los pasos que las leen también se rehacen.
+        """
+        for path in step.inputs:
+            if self._producers.get(path) in outdated:
+                return f"depende de '{self._producers[path]}'"
+        for path in step.inputs:
+            if not os.path.exists(path):
+                return f"falta la entrada '{path}'"
+        missing = [path for path in step.outputs if not os.path.exists(path)]
+        if missing:
+            return f"falta la salida '{missing[0]}'"
+        recorded = self._state['steps'].get(step.name)
+        if recorded is None:
+            return 'sin firma registrada'
+        if recorded != self._signature(step):
+            return 'cambiaron las entradas o los parámetros'
+        return None
+
+    def stale(self, force: bool = False) -> List[Dict]:
+        """
+        Lista los pasos que se rehacen en la próxima corrida, sin ejecutar nada
+
+        Parameters:
+        -----------
+        force : bool, optional
+            Si es True, considera desactualizados todos los pasos
+
+        Returns:
+        --------
+        List[Dict]
+            Por paso desactualizado, en orden de ejecución: 'step', 'reason' y 'outputs'
+        """
+        outdated: set = set()
+        result = []
+        for step in self.order():
+            reason = 'forzado' if force else self._check(step, outdated)
+            if reason is not None:
+                outdated.add(step.name)
+                result.append({'step': step.name, 'reason': reason, 'outputs': list(step.outputs)})
+        return result
+
+    def run(self, dry_run: bool = False, force: bool = False) -> List[Dict]:
+        """
+        Ejecuta en orden los pasos desactualizados
+
+        Un paso que falla no aborta la corrida, pero los pasos que dependen de
+        sus salidas no se ejecutan ('blocked'). Las firmas se guardan al final.
+
+        Parameters:
+        -----------
+        dry_run : bool, optional
+            Si es True, solo reporta ('stale') sin ejecutar ni guardar estado
+        force : bool, optional
+            Si es True, rehace todos los pasos
+
+        Returns:
+        --------
+        List[Dict]
+            Un reporte por paso con 'step', 'status' ('built', 'up_to_date',
+            'stale', 'error' o 'blocked'), 'reason', 'seconds' y 'error'
+        """
+        outdated: set = set()
+        failed: set = set()
+        reports = []
+
+        for step in self.order():
+            report = {'step': step.name, 'status': 'up_to_date', 'reason': None,
+                      'seconds': 0.0, 'error': None}
+            reports.append(report)
+
+            blocking = [self._producers[path] for path in step.inputs if self._producers.get(path) in failed]
+            if blocking:
+                failed.add(step.name)
+                report.update(status='blocked', reason=f"falló '{blocking[0]}'")
+                continue
+
+            # En dry-run las salidas de los pasos anteriores todavía no cambiaron
+            report['reason'] = 'forzado' if force else self._check(step, outdated if dry_run else set())
+            if report['reason'] is None:
+                continue
+            outdated.add(step.name)
+            if dry_run:
+                report['status'] = 'stale'
+                continue
+
+            start = time.perf_counter()
+            try:
+                for output in step.outputs:
+                    directory = os.path.dirname(output)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                step.action(list(step.inputs), list(step.outputs), **step.params)
+                self._state['steps'][step.name] = self._signature(step)
+                report['status'] = 'built'
+            except Exception as e:
+                # Registrar el error del paso sin abortar la corrida
+                failed.add(step.name)
+                self._state['steps'].pop(step.name, None)
+                report.update(status='error', error=str(e))
+            report['seconds'] = time.perf_counter() - start
+
+        if not dry_run:
+            self._save_state()
+        return reports
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __repr__(self) -> str:
+        """Representación string del objeto"""
+        return f"BuildGraph(steps={len(self.steps)}, state='{self.state_path}')"
+
+
+def _process_action(inputs: List[str], outputs: List[str], entry: Dict, output_dir: str) -> None:
+    """Paso .DAT original -> .DAT procesado (misma secuencia que run_manifest)"""
+    from .manifest import _process_entry
+    _process_entry(entry, output_dir)
+
+
+def _metrics_action(inputs: List[str], outputs: List[str], level_db: float = 3.0) -> None:
+    """Paso .DAT procesado -> JSON con máximo, ancho de haz y directividad"""
+    from .dataset import SADataset
+    dataset = SADataset.from_files(inputs)
+    peak, peak_angle = dataset.peak()
+    metrics = {'file': os.path.basename(inputs[0]),
+               'y_unit': dataset.y_unit,
+               'peak': float(peak[0]),
+               'peak_deg': float(peak_angle[0]),
+               'beamwidth_deg': float(dataset.beamwidth(level_db)[0]),
+               'beamwidth_level_db': level_db}
+    if dataset.y_unit.upper() == 'DBM':
+        metrics['directivity_db'] = float(dataset.directivity()[0])
+    with open(outputs[0], 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, indent=2)
+
+
+def _figure_action(inputs: List[str], outputs: List[str], mag: str = 'dB') -> None:
+    """Paso .DAT procesado -> diagrama polar en PNG"""
+    import matplotlib.pyplot as plt
+    from .sa_data import load_sa_data
+    fig, _ = load_sa_data(inputs[0]).plot_polar(mag=mag, savefig=outputs[0])
+    plt.close(fig)
+
+
+def measurement_graph(manifest: str, metrics_dir: Optional[str] = None, figures_dir: Optional[str] = None,
+                      state_path: Optional[str] = None, mag: str = 'dB') -> BuildGraph:
+    """
+    Arma el grafo original -> procesado -> métricas -> figuras de un manifiesto
+
+    Parameters:
+    -----------
+    manifest : str
+        Manifiesto de preprocesado (ver scripts.manifest)
+    metrics_dir : Optional[str]
+        Directorio de los JSON de métricas (default: '<output_dir>/metricas')
+    figures_dir : Optional[str]
+        Directorio de las figuras (default: '<output_dir>/figuras')
+    state_path : Optional[str]
+        Archivo de estado (default: '<output_dir>/.build_state.json')
+    mag : str, optional
+        Escala de las figuras ('dB' o 'dBm')
+
+    Returns:
+    --------
+    BuildGraph
+        Grafo con un paso de procesado, uno de métricas y uno de figura por entrada
+    """
+    from .manifest import load_manifest
+
+    entries, options = load_manifest(manifest)
+    output_dir = options.get('output_dir', os.path.dirname(os.path.abspath(manifest)))
+    metrics_dir = os.path.join(output_dir, 'metricas') if metrics_dir is None else metrics_dir
+    figures_dir = os.path.join(output_dir, 'figuras') if figures_dir is None else figures_dir
+    if state_path is None:
+        state_path = os.path.join(output_dir, '.build_state.json')
+
+    graph = BuildGraph(state_path)
+    for entry in entries:
+        # Mismo nombre de salida que set_output_filename
+        base, compression_extension = split_compression_extension(entry['output'])
+        name = base[:-4] if base.endswith('.DAT') else base
+        processed = os.path.join(output_dir, f"{name}.DAT{compression_extension}")
+        inputs = [entry['input']] + ([entry['reference']] if entry['mirror'] == 'auto' else [])
+        graph.add(f"procesar:{name}", _process_action, inputs, [processed],
+                  entry=entry, output_dir=output_dir)
+        graph.add(f"metricas:{name}", _metrics_action, [processed],
+                  [os.path.join(metrics_dir, f"{name}.json")])
+        graph.add(f"figura:{name}", _figure_action, [processed],
+                  [os.path.join(figures_dir, f"{name}_{mag}.png")], mag=mag)
+    return graph
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Línea de comandos de measurement_graph
+
+    Ejemplo:
+
+        python -m scripts.build mediciones/preprocesado.toml -n
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m scripts.build',
+        description='Reprocesa solo lo que cambió en el árbol de mediciones de un manifiesto')
+    parser.add_argument('manifest', help='manifiesto de preprocesado')
+    parser.add_argument('-n', '--dry-run', action='store_true', help='listar pasos desactualizados sin ejecutar')
+    parser.add_argument('-B', '--force', action='store_true', help='rehacer todos los pasos')
+    parser.add_argument('--metrics-dir', help="directorio de métricas (default: '<output_dir>/metricas')")
+    parser.add_argument('--figures-dir', help="directorio de figuras (default: '<output_dir>/figuras')")
+    parser.add_argument('--state', help="archivo de estado (default: '<output_dir>/.build_state.json')")
+    parser.add_argument('--mag', choices=('dB', 'dBm'), default='dB', help='escala de las figuras')
+    args = parser.parse_args(argv)
+
+    graph = measurement_graph(args.manifest, metrics_dir=args.metrics_dir, figures_dir=args.figures_dir,
+                              state_path=args.state, mag=args.mag)
+    reports = graph.run(dry_run=args.dry_run, force=args.force)
+
+    for report in reports:
+        if report['status'] == 'up_to_date':
+            continue
+        if report['status'] == 'built':
+            print(f"  {report['step']}: {report['seconds'] * 1e3:.1f} ms ({report['reason']})")
+        elif report['status'] == 'stale':
+            print(f"  {report['step']}: desactualizado ({report['reason']})")
+        else:
+            print(f"  {report['step']}: {report['status']}: {report['error'] or report['reason']}")
+
+    counts = {status: sum(r['status'] == status for r in reports)
+              for status in ('built', 'stale', 'up_to_date', 'error', 'blocked')}
+    if args.dry_run:
+        print(f"Desactualizados: {counts['stale']}, al día: {counts['up_to_date']}")
+    else:
+        print(f"Rehechos: {counts['built']}, al día: {counts['up_to_date']}, "
+              f"errores: {counts['error']}, bloqueados: {counts['blocked']}")
+    return 1 if counts['error'] or counts['blocked'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
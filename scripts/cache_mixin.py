@@ -0,0 +1,170 @@
+# CacheMixin - Mixin para cachear en binario los archivos .DAT ya parseados
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+import hashlib
+import json
+import os
+import warnings
+from typing import Dict, Tuple
+import numpy as np
+
+from .parser_mixin import TraceData
+
+# Directorio de cache creado junto a cada archivo .DAT
+CACHE_DIR_NAME = '.sa_cache'
+
+# Versión del formato de cache; al cambiarla se invalidan los sidecars existentes
+# (3: las trazas se guardan siempre como se parsearon, sin aplicar trace_dtype)
+CACHE_VERSION = 3
+
+
+def _file_hash(file_path: str) -> str:
+    """Calcula el hash del contenido de un archivo leyéndolo por bloques"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CacheMixin:
+    """
+    Mixin para cachear en binario el header y los datos parseados de un archivo .DAT
+
+    Para cada archivo se guardan tres sidecars en `.sa_cache/` junto al original:
+    - `<nombre>.x.npy`: array con los valores de x
+    - `<nombre>.traces.npy`: array (n_points, n_traces) con todas las trazas
+    - `<nombre>.json`: header, número de puntos y firma del archivo original
+
+    La firma contiene tamaño, mtime y hash del contenido. Un cambio de tamaño
+    invalida el cache; si solo cambia el mtime se recalcula el hash y el cache
+    sigue siendo válido cuando el contenido es el mismo. Las cargas en caliente
+    mapean el .npy en memoria en lugar de parsear texto.
+    """
+
+    __slots__ = ()
+
+    def _cache_paths(self) -> Tuple[str, str, str]:
+        """
+        Retorna las rutas (x, trazas, metadatos) de los sidecars del archivo actual
+
+        Returns:
+        --------
+        Tuple[str, str, str]
+            Rutas de los dos .npy y del .json
+        """
+        directory, name = os.path.split(os.path.abspath(self.file_path))
+        base = os.path.join(directory, CACHE_DIR_NAME, name)
+        return f"{base}.x.npy", f"{base}.traces.npy", f"{base}.json"
+
+    def _load_from_cache(self, verify_hash: bool = False) -> bool:
+        """
+        Intenta cargar header y datos desde el cache
+
+        Parameters:
+        -----------
+        verify_hash : bool, optional
+            Si es True, verifica el hash del contenido aunque tamaño y mtime coincidan
+
+        Returns:
+        --------
+        bool
+            True si el cache era válido y se cargó, False en caso contrario
+        """
+        x_path, traces_path, meta_path = self._cache_paths()
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+            stat = os.stat(self.file_path)
+        except (OSError, ValueError):
+            return False
+
+        signature = meta.get('signature', {})
+        if meta.get('version') != CACHE_VERSION or signature.get('size') != stat.st_size:
+            return False
+
+        if signature.get('mtime_ns') != stat.st_mtime_ns or verify_hash:
+            if signature.get('hash') != _file_hash(self.file_path):
+                return False
+            if signature.get('mtime_ns') != stat.st_mtime_ns:
+                # Mismo contenido con otro mtime: actualizar la firma
+                signature['mtime_ns'] = stat.st_mtime_ns
+                self._write_cache_meta(meta_path, meta)
+
+        try:
+            # Copy-on-write: los datos se pueden modificar sin tocar el cache
+            x_values = np.load(x_path, mmap_mode='c')
+            traces = np.load(traces_path, mmap_mode='c')
+        except (OSError, ValueError):
+            return False
+
+        self.header_data = dict(meta['header'])
+        self.n_points = meta['n_points']
+        self.data = TraceData(x_values, self._to_trace_dtype(traces))
+        return True
+
+    def _parse_into_cache(self) -> None:
+        """
+        Parsea el archivo, guarda el cache y recién después aplica trace_dtype
+
+        El cache guarda siempre las trazas tal como se parsearon (float64), así
+        una carga posterior con otro trace_dtype no hereda la conversión.
+        """
+        trace_dtype = self.trace_dtype
+        self.trace_dtype = None
+        try:
+            self._parse_file()
+        finally:
+            self.trace_dtype = trace_dtype
+        self._store_cache()
+        if trace_dtype is not None:
+            self.data = TraceData(self.data['x'], self._to_trace_dtype(TraceData.stack(self.data)))
+
+    def _store_cache(self) -> None:
+        """
+        Guarda el header y los datos actuales en los sidecars de cache
+
+        Los errores de escritura (por ejemplo, directorio de solo lectura) solo
+        generan una advertencia: el cache es una optimización, no un requisito.
+        """
+        if self.data is None:
+            return
+
+        x_path, traces_path, meta_path = self._cache_paths()
+        try:
+            stat = os.stat(self.file_path)
+            meta = {
+                'version': CACHE_VERSION,
+                'signature': {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'hash': _file_hash(self.file_path)
+                },
+                'header': self.header_data,
+                'n_points': self.n_points
+            }
+
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            np.save(x_path, self.data['x'])
+            np.save(traces_path, TraceData.stack(self.data))
+            self._write_cache_meta(meta_path, meta)
+
+        except OSError as e:
+            warnings.warn(f"No se pudo escribir el cache de {self.file_path}: {str(e)}")
+
+    @staticmethod
+    def _write_cache_meta(meta_path: str, meta: Dict) -> None:
+        """Escribe el .json de metadatos de forma atómica"""
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(meta, file, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    def clear_cache(self) -> None:
+        """
+        Elimina los sidecars de cache del archivo actual, si existen
+        """
+        for path in self._cache_paths():
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,350 @@
+# calibration.py - Calibración tiempo -> ángulo de las mediciones con tornamesa
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+Calibración del eje de tiempo de una medición a ángulo de tornamesa.
+
+convert_to_degree asume que los n puntos están equiespaciados en ángulo entre
+el inicio y el fin de la vuelta. AngleCalibration usa en cambio los tiempos
+reales del eje x, con uno de tres modelos:
+
+- velocidad constante: ángulo lineal en el tiempo medido entre start_deg y stop_deg
+- perfil de velocidad: integral de una velocidad angular conocida (grados/s)
+- marcas de sincronismo: una traza con pulsos en ángulos conocidos
+
+El resultado se remuestrea a una grilla angular uniforme con una sola
+operación vectorizada sobre todas las trazas. El mapa tiempo -> ángulo y los
+pesos de interpolación se cachean por configuración de adquisición (SWT,
+número de puntos y parámetros de la calibración), así un lote de capturas
+con la misma configuración se calibra una sola vez y resample_many las
+remuestrea juntas.
+
+Ejemplo (la tornamesa va de -190° a +190°):
+
+    calibracion = AngleCalibration(start_deg=-190, stop_deg=190)
+    sa_deg = calibracion.resample(load_sa_data('./mediciones/Originales/1ra med 31Ghz.DAT'))
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .parser_mixin import TraceData
+from .sa_data import SAData
+
+# Perfil de velocidad: (tiempos desde el inicio en s, velocidades en grados/s) o función de t
+SpeedProfile = Union[Tuple[Sequence[float], Sequence[float]], Callable[[np.ndarray], np.ndarray]]
+
+
+class AngleCalibration:
+    """
+    Mapa del eje de tiempo medido a ángulo de tornamesa, cacheado por configuración
+    """
+
+    def __init__(self, start_deg: float = 0.0, stop_deg: float = 360.0,
+                 speed_profile: Optional[SpeedProfile] = None, scale_to_stop: bool = True,
+                 marker_trace: Optional[str] = None, marker_angles: Optional[Sequence[float]] = None,
+                 marker_threshold: Optional[float] = None):
+        """
+        Parameters:
+        -----------
+        start_deg : float, optional
+            Ángulo al comienzo de la captura (primer punto)
+        stop_deg : float, optional
+            Ángulo al final de la captura (último punto)
+        speed_profile : Optional[SpeedProfile]
+            Velocidad angular en grados/s, como tupla (tiempos, velocidades) o
+            función del tiempo desde el inicio. None supone velocidad constante
+        scale_to_stop : bool, optional
+            Con perfil de velocidad: si es True (default), el perfil solo
+            define la forma y se escala para terminar exactamente en stop_deg
+        marker_trace : Optional[str]
+            Traza con los pulsos de sincronismo (por ejemplo 'y2'). Si se
+            indica, tiene prioridad sobre el perfil de velocidad
+        marker_angles : Optional[Sequence[float]]
+            Ángulo de cada pulso; por defecto se reparten uniformemente entre
+            start_deg y stop_deg
+        marker_threshold : Optional[float]
+            Umbral de detección de flancos ascendentes (default: punto medio
+            entre el mínimo y el máximo de la traza de marcas)
+        """
+        self.start_deg = start_deg
+        self.stop_deg = stop_deg
+        self.speed_profile = speed_profile
+        self.scale_to_stop = scale_to_stop
+        self.marker_trace = marker_trace
+        self.marker_angles = None if marker_angles is None else np.asarray(marker_angles, dtype=float)
+        self.marker_threshold = marker_threshold
+        self._cache: Dict[Tuple, Dict] = {}
+
+    @property
+    def mode(self) -> str:
+        """Modelo usado: 'markers', 'profile' o 'constant'"""
+        if self.marker_trace is not None:
+            return 'markers'
+        if self.speed_profile is not None:
+            return 'profile'
+        return 'constant'
+
+    def cache_key(self) -> Tuple:
+        """
+        Parámetros de la calibración como tupla inmutable
+
+        Es la clave con la que se memorizan las conversiones calibradas (ver
+        convert_to_degree): si se modifica algún atributo, la clave cambia y
+        no se reutilizan resultados viejos. Un perfil dado como función entra
+        por identidad.
+        """
+        profile = self.speed_profile
+        if profile is not None and not callable(profile):
+            profile = tuple(tuple(float(value) for value in values) for values in profile)
+        marker_angles = None if self.marker_angles is None else tuple(np.asarray(self.marker_angles, dtype=float))
+        return ('AngleCalibration', self.mode, float(self.start_deg), float(self.stop_deg), profile,
+                bool(self.scale_to_stop), self.marker_trace, marker_angles, self.marker_threshold)
+
+    def _setup_key(self, sa: SAData) -> Tuple:
+        """
+        Clave de la configuración de adquisición de una medición
+
+        Capturas con el mismo SWT y número de puntos comparten el mapa (el eje
+        de tiempo del analizador es el mismo barrido); sin SWT en el header se
+        usa la duración medida. Los parámetros de la calibración (cache_key)
+        también forman parte de la clave.
+        """
+        x_data = sa.data['x']
+        sweep_time = sa.header_data.get('SWT') or f"{float(x_data[-1] - x_data[0]):.9g}"
+        key = self.cache_key() + (sweep_time, len(x_data))
+        if self.mode == 'markers':
+            # Las marcas cambian en cada captura: forman parte de la clave
+            key += (hash(np.ascontiguousarray(sa.data[self.marker_trace]).tobytes()),)
+        return key
+
+    def _constant_angles(self, t_rel: np.ndarray) -> np.ndarray:
+        """Velocidad constante: ángulo proporcional al tiempo medido"""
+        duration = t_rel[-1]
+        if duration <= 0:
+            raise ValueError("El eje de tiempo no es creciente")
+        return self.start_deg + t_rel * ((self.stop_deg - self.start_deg) / duration)
+
+    def _profile_angles(self, t_rel: np.ndarray) -> np.ndarray:
+        """Perfil de velocidad: integral trapezoidal acumulada sobre el eje medido"""
+        if callable(self.speed_profile):
+            speed = np.asarray(self.speed_profile(t_rel), dtype=float)
+        else:
+            times, speeds = (np.asarray(values, dtype=float) for values in self.speed_profile)
+            speed = np.interp(t_rel, times, speeds)
+
+        travelled = np.concatenate(([0.0], np.cumsum(0.5 * (speed[1:] + speed[:-1]) * np.diff(t_rel))))
+        if self.scale_to_stop:
+            if travelled[-1] == 0:
+                raise ValueError("El perfil de velocidad no produce desplazamiento")
+            travelled *= (self.stop_deg - self.start_deg) / travelled[-1]
+        return self.start_deg + travelled
+
+    def _marker_times(self, t_rel: np.ndarray, channel: np.ndarray) -> np.ndarray:
+        """Tiempos de los flancos ascendentes, interpolados entre muestras"""
+        threshold = self.marker_threshold
+        if threshold is None:
+            threshold = 0.5 * (np.nanmin(channel) + np.nanmax(channel))
+
+        edges = np.flatnonzero((channel[:-1] < threshold) & (channel[1:] >= threshold))
+        fraction = (threshold - channel[edges]) / (channel[edges + 1] - channel[edges])
+        return t_rel[edges] + fraction * (t_rel[edges + 1] - t_rel[edges])
+
+    def _marker_angles_map(self, t_rel: np.ndarray, channel: np.ndarray) -> np.ndarray:
+        """Marcas de sincronismo: interpolación lineal entre marcas, extrapolada en los extremos"""
+        marker_times = self._marker_times(t_rel, channel)
+        if len(marker_times) < 2:
+            raise ValueError(f"Se detectaron {len(marker_times)} marcas de sincronismo; se necesitan al menos 2")
+
+        marker_angles = self.marker_angles
+        if marker_angles is None:
+            marker_angles = np.linspace(self.start_deg, self.stop_deg, len(marker_times))
+        elif len(marker_angles) != len(marker_times):
+            raise ValueError(f"Se detectaron {len(marker_times)} marcas pero hay {len(marker_angles)} ángulos de marca")
+
+        angles = np.interp(t_rel, marker_times, marker_angles)
+        # np.interp satura fuera de las marcas: extrapolar con la pendiente de los extremos
+        first_slope = (marker_angles[1] - marker_angles[0]) / (marker_times[1] - marker_times[0])
+        last_slope = (marker_angles[-1] - marker_angles[-2]) / (marker_times[-1] - marker_times[-2])
+        before = t_rel < marker_times[0]
+        after = t_rel > marker_times[-1]
+        angles[before] = marker_angles[0] + (t_rel[before] - marker_times[0]) * first_slope
+        angles[after] = marker_angles[-1] + (t_rel[after] - marker_times[-1]) * last_slope
+        return angles
+
+    def _entry(self, sa: SAData) -> Dict:
+        """Mapa de ángulos (y pesos de remuestreo ya calculados) de la configuración de sa"""
+        if sa.data is None:
+            raise ValueError("No hay datos disponibles para calibrar")
+        x_unit = sa.header_data.get('x-Unit', '')
+        if x_unit.upper() not in ('S', 'S;'):
+            raise ValueError(f"La calibración requiere el eje x en segundos, pero tiene unidad '{x_unit}'")
+
+        key = self._setup_key(sa)
+        if key not in self._cache:
+            x_data = np.asarray(sa.data['x'], dtype=float)
+            t_rel = x_data - x_data[0]
+            if self.mode == 'markers':
+                angles = self._marker_angles_map(t_rel, np.asarray(sa.data[self.marker_trace], dtype=float))
+            elif self.mode == 'profile':
+                angles = self._profile_angles(t_rel)
+            else:
+                angles = self._constant_angles(t_rel)
+            angles.flags.writeable = False
+            self._cache[key] = {'angles': angles, 'weights': {}}
+        return self._cache[key]
+
+    def angles(self, sa: SAData) -> np.ndarray:
+        """
+        Retorna el ángulo calibrado de cada punto de la medición
+
+        Parameters:
+        -----------
+        sa : SAData
+            Medición con el eje x en segundos
+
+        Returns:
+        --------
+        np.ndarray
+            Ángulos en grados (no necesariamente equiespaciados), solo lectura
+
+        Raises:
+        -------
+        ValueError
+            Si no hay datos o el eje x no está en segundos
+        """
+        return self._entry(sa)['angles']
+
+    @staticmethod
+    def _interpolation_weights(source: np.ndarray, target: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Índices y pesos de interpolación lineal (sin envolver) de source a target"""
+        segment = np.clip(np.searchsorted(source, target, side='right') - 1, 0, len(source) - 2)
+        weight = (target - source[segment]) / (source[segment + 1] - source[segment])
+        return segment, segment + 1, np.clip(weight, 0.0, 1.0)
+
+    def _weights(self, entry: Dict, n_points: Optional[int]) -> Tuple[np.ndarray, ...]:
+        """
+        Grilla uniforme, índices y pesos de interpolación de una configuración (cacheados)
+
+        Los índices apuntan al orden original de las muestras, también cuando
+        la tornamesa gira en sentido negativo.
+
+        Raises:
+        -------
+        ValueError
+            Si el mapa calibrado no es monótono
+        """
+        angles = entry['angles']
+        if n_points is None:
+            n_points = len(angles)
+
+        if n_points not in entry['weights']:
+            step = np.diff(angles)
+            descending = bool(np.all(step < 0))
+            if descending:
+                # Giro en sentido negativo: recorrer el mapa al revés
+                angles = angles[::-1]
+            elif not np.all(step > 0):
+                raise ValueError("El mapa tiempo -> ángulo calibrado no es monótono")
+
+            grid = np.linspace(min(self.start_deg, self.stop_deg), max(self.start_deg, self.stop_deg), n_points)
+            lower, upper, weight = self._interpolation_weights(angles, grid)
+            if descending:
+                lower, upper = len(angles) - 1 - lower, len(angles) - 1 - upper
+            entry['weights'][n_points] = (grid, lower, upper, weight[:, np.newaxis])
+        return entry['weights'][n_points]
+
+    @staticmethod
+    def _gather(traces: np.ndarray, lower: np.ndarray, upper: np.ndarray, weight: np.ndarray) -> np.ndarray:
+        """Dos gathers y una combinación lineal para todas las columnas a la vez"""
+        return traces[lower] * (1 - weight) + traces[upper] * weight
+
+    def _calibrated(self, sa: SAData, grid: np.ndarray, values: np.ndarray) -> SAData:
+        """Nueva instancia con x en grados, el header de sa y la entrada de historial"""
+        header = dict(sa.header_data)
+        header['x-Unit'] = 'deg'
+        result = SAData.from_arrays(grid, values, header, file_path=sa.file_path)
+        result.history = sa.get_history() + [{'operation': 'calibrate', 'mode': self.mode,
+                                              'start_deg': self.start_deg, 'stop_deg': self.stop_deg,
+                                              'n_points': len(grid)}]
+        return result
+
+    def resample(self, sa: SAData, n_points: Optional[int] = None) -> SAData:
+        """
+        Remuestrea todas las trazas a una grilla angular uniforme entre start_deg y stop_deg
+
+        Parameters:
+        -----------
+        sa : SAData
+            Medición con el eje x en segundos
+        n_points : Optional[int]
+            Puntos de la grilla uniforme (default: los de la medición)
+
+        Returns:
+        --------
+        SAData
+            Nueva instancia con x en grados ('x-Unit': 'deg') y las mismas trazas
+
+        Raises:
+        -------
+        ValueError
+            Si el eje x no está en segundos o el mapa calibrado no es monótono
+            (por ejemplo, un perfil con velocidad nula o marcas mal detectadas)
+        """
+        grid, lower, upper, weight = self._weights(self._entry(sa), n_points)
+        return self._calibrated(sa, grid, self._gather(TraceData.stack(sa.data), lower, upper, weight))
+
+    def resample_many(self, measurements: Sequence[SAData], n_points: Optional[int] = None) -> List[SAData]:
+        """
+        Calibra y remuestrea un lote de mediciones
+
+        Las capturas con la misma configuración de adquisición comparten el
+        mapa tiempo -> ángulo y los pesos de interpolación, y sus trazas se
+        remuestrean juntas con un solo gather.
+
+        Parameters:
+        -----------
+        measurements : Sequence[SAData]
+            Mediciones con el eje x en segundos
+        n_points : Optional[int]
+            Puntos de la grilla uniforme (default: los de cada medición)
+
+        Returns:
+        --------
+        List[SAData]
+            Mediciones calibradas, en el mismo orden
+
+        Raises:
+        -------
+        ValueError
+            Como resample, para la primera medición que falle
+        """
+        groups: Dict[int, List[int]] = {}
+        entries = {}
+        for index, sa in enumerate(measurements):
+            entry = self._entry(sa)
+            entries[id(entry)] = entry
+            groups.setdefault(id(entry), []).append(index)
+
+        results: List[Optional[SAData]] = [None] * len(measurements)
+        for key, indices in groups.items():
+            grid, lower, upper, weight = self._weights(entries[key], n_points)
+            blocks = [TraceData.stack(measurements[index].data) for index in indices]
+            values = self._gather(np.hstack(blocks), lower, upper, weight)
+            # Cada medición recibe sus columnas del resultado común (vistas)
+            bounds = np.cumsum([block.shape[1] for block in blocks])[:-1]
+            for index, columns in zip(indices, np.split(values, bounds, axis=1)):
+                results[index] = self._calibrated(measurements[index], grid, columns)
+        return results
+
+    def clear_cache(self) -> None:
+        """
+        Descarta los mapas y pesos cacheados
+        """
+        self._cache.clear()
+
+    def __repr__(self) -> str:
+        """Representación string del objeto"""
+        return (f"AngleCalibration(mode='{self.mode}', start_deg={self.start_deg}, "
+                f"stop_deg={self.stop_deg}, cached_setups={len(self._cache)})")
@@ -0,0 +1,131 @@
+# compression.py - Apertura transparente de archivos comprimidos
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+Utilidades para leer y escribir archivos .DAT comprimidos (gzip, xz, bz2)
+sin archivos temporales: la (des)compresión se hace en streaming.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+from typing import IO, Optional, Tuple
+
+# Extensión de archivo -> formato de compresión
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.xz': 'xz',
+    '.bz2': 'bz2'
+}
+
+# Firma inicial (magic bytes) -> formato de compresión
+_COMPRESSION_MAGIC = {
+    b'\x1f\x8b': 'gzip',
+    b'\xfd7zXZ\x00': 'xz',
+    b'BZh': 'bz2'
+}
+
+# Formato de compresión -> función de apertura
+_OPENERS = {
+    'gzip': gzip.open,
+    'xz': lzma.open,
+    'bz2': bz2.open
+}
+
+
+def split_compression_extension(file_path: str) -> Tuple[str, str]:
+    """
+    Separa la extensión de compresión de una ruta
+
+    Parameters:
+    -----------
+    file_path : str
+        Ruta del archivo (por ejemplo 'medicion.DAT.gz')
+
+    Returns:
+    --------
+    Tuple[str, str]
+        (ruta sin extensión de compresión, extensión o '' si no hay)
+    """
+    base, extension = os.path.splitext(file_path)
+    if extension.lower() in COMPRESSION_EXTENSIONS:
+        return base, extension
+    return file_path, ''
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    """
+    Detecta el formato de compresión de un archivo por extensión o por magic bytes
+
+    Parameters:
+    -----------
+    file_path : str
+        Ruta del archivo
+
+    Returns:
+    --------
+    Optional[str]
+        'gzip', 'xz', 'bz2' o None si el archivo no está comprimido
+    """
+    _, extension = split_compression_extension(file_path)
+    if extension:
+        return COMPRESSION_EXTENSIONS[extension.lower()]
+
+    try:
+        with open(file_path, 'rb') as file:
+            head = file.read(6)
+    except OSError:
+        return None
+
+    for magic, compression in _COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_file(file_path: str, mode: str = 'rb', encoding: Optional[str] = None,
+              compression: Optional[str] = 'auto') -> IO:
+    """
+    Abre un archivo plano o comprimido con la misma interfaz que open()
+
+    Parameters:
+    -----------
+    file_path : str
+        Ruta del archivo
+    mode : str, optional
+        Modo de apertura ('rb', 'rt', 'wb', 'wt', ...)
+    encoding : Optional[str]
+        Codificación para los modos de texto
+    compression : Optional[str]
+        'auto' (default) detecta por extensión; en lectura también por magic bytes.
+        None fuerza archivo plano; 'gzip', 'xz' o 'bz2' fuerzan ese formato
+
+    Returns:
+    --------
+    IO
+        Objeto archivo abierto
+
+    Raises:
+    -------
+    ValueError
+        Si el formato de compresión no es válido
+    """
+    if compression == 'auto':
+        if 'r' in mode:
+            compression = detect_compression(file_path)
+        else:
+            _, extension = split_compression_extension(file_path)
+            compression = COMPRESSION_EXTENSIONS.get(extension.lower())
+
+    if compression is None:
+        return open(file_path, mode, encoding=encoding)
+
+    if compression not in _OPENERS:
+        raise ValueError(f"Compresión '{compression}' no válida. Use una de {tuple(_OPENERS)}")
+
+    # Los openers de compresión distinguen texto/binario explícitamente
+    if 't' not in mode and 'b' not in mode:
+        mode += 't' if encoding else 'b'
+    return _OPENERS[compression](file_path, mode, encoding=encoding)
@@ -2,23 +2,113 @@
 # Author: [Simón Aulet]
 # Date: 2025-09-10
 
+import functools
+import inspect
 import numpy as np
 from typing import Dict, Optional, Tuple
 
+from .parser_mixin import TraceData
+
+
+def _key_part(value):
+    """
+    Hashable stand-in for a memoized argument
+
+    Objects that define cache_key() (e.g. AngleCalibration) are keyed on the
+    parameters it returns rather than on the object itself, so mutating them
+    does not leave a stale entry behind.
+    """
+    cache_key = getattr(value, 'cache_key', None)
+    return cache_key() if callable(cache_key) else value
+
+
+def _memoized(method):
+    """
+    Cache the result of a conversion in the instance's `_conversion_cache`
+
+    The key is the method name plus its bound arguments (defaults applied, so
+    convert_to_db() and convert_to_db(all_traces=False) share one entry).
+    The cached array is internal and read-only: callers get a fresh copy,
+    except when the method has a `copy` argument and is called with
+    copy=False, which returns the shared read-only array itself. Arguments
+    are keyed through _key_part. Instances without a `_conversion_cache`
+    (e.g. the chunked readers) and calls with unhashable arguments are not
+    cached.
+    """
+    signature = inspect.signature(method)
+    has_copy = 'copy' in signature.parameters
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, '_conversion_cache', None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(list(bound.arguments.items())[1:])
+        # copy only decides what is returned: both values share one cache entry
+        copy = arguments.pop('copy', True)
+        key = (method.__name__,) + tuple(_key_part(value) for value in arguments.values())
+        try:
+            result = cache[key]
+        except KeyError:
+            if has_copy:
+                arguments['copy'] = False
+            result = method(self, **arguments)
+            result.flags.writeable = False
+            cache[key] = result
+        except TypeError:
+            # Unhashable argument: compute without caching
+            return method(self, *args, **kwargs)
+
+        return result.copy() if copy else result
+
+    return wrapper
+
+
 class ConversionMixin:
     """
     Mixin for unit conversion operations of spectrum analyzer data
+
+    On SAData the conversions are memoized per instance, keyed on method and
+    arguments. The cache is cleared whenever `data` is replaced (loading, or
+    crop_data/mirror_data with in_place=True). Each call returns a fresh,
+    writable copy of the cached result; read-only callers (plots, metrics)
+    pass copy=False to get the shared read-only array without copying. After
+    mutating the data arrays in place, call clear_conversion_cache().
     """
 
-    def convert_to_db(self) -> np.ndarray:
+    __slots__ = ()
+
+    def clear_conversion_cache(self) -> None:
+        """
+        Discard all memoized conversion results
+        """
+        cache = getattr(self, '_conversion_cache', None)
+        if cache is not None:
+            cache.clear()
+
+    @_memoized
+    def convert_to_db(self, all_traces: bool = False, copy: bool = True) -> np.ndarray:
         """
         Convert y1 data to normalized dB scale (P - max(P))
 
+        Parameters:
+        -----------
+        all_traces : bool, optional
+            If True, convert every trace (y1...yN) in one vectorized operation,
+            each one normalized to its own maximum
+        copy : bool, optional
+            If False, return the memoized read-only array without copying.
+            If True (default), return a new writable array
+
         Returns:
         --------
         np.ndarray
             Array with values normalized to dB scale relative to maximum
             Each value is calculated as: value - max(values)
+            With all_traces=True, an array of shape (n_points, n_traces)
 
         Raises:
         -------
@@ -28,19 +118,34 @@ class ConversionMixin:
         if self.data is None:
             raise ValueError("No data available for conversion")
 
+        if all_traces:
+            traces = TraceData.stack(self.data)
+            return traces - np.max(traces, axis=0)
+
         y_data = self.data['y1']
 
         # Normalize data: P - max(P)
         return y_data - np.max(y_data)
 
-    def convert_to_dBm(self) -> np.ndarray:
+    @_memoized
+    def convert_to_dBm(self, all_traces: bool = False, copy: bool = True) -> np.ndarray:
         """
         Convert y1 data to dBm according to units specified in the header
 
+        Parameters:
+        -----------
+        all_traces : bool, optional
+            If True, convert every trace (y1...yN) in one vectorized operation
+        copy : bool, optional
+            If False, return the memoized read-only array without copying (a
+            view of the stored data when it is already in dBm). If True
+            (default), return a new writable array
+
         Returns:
         --------
         np.ndarray
             Array with values converted to dBm
+            With all_traces=True, an array of shape (n_points, n_traces)
 
         Raises:
         -------
@@ -50,19 +155,54 @@ class ConversionMixin:
         if self.data is None:
             raise ValueError("No data available for conversion")
 
+        if all_traces:
+            return self._y_to_dBm(TraceData.stack(self.data), copy)
+
+        return self._y_to_dBm(self.data['y1'], copy)
+
+    def _y_to_dBm(self, y_data: np.ndarray, copy: bool = True) -> np.ndarray:
+        """
+        Convert an array of y values to dBm according to the header units
+
+        Shared by convert_to_dBm and the chunked readers, which apply it
+        to one block of samples at a time.
+
+        Parameters:
+        -----------
+        y_data : np.ndarray
+            Values in the unit given by the 'y-Unit' header entry
+        copy : bool, optional
+            If False and the values are already in dBm, return a read-only
+            view instead of a copy
+
+        Returns:
+        --------
+        np.ndarray
+            Values converted to dBm (a new array unless copy=False and no
+            conversion was needed)
+
+        Raises:
+        -------
+        ValueError
+            If the unit is not recognized
+        """
         y_unit = self.header_data.get('y-Unit', '').upper()
-        y_data = self.data['y1']
 
         if y_unit in ['DBM', 'dBm', 'DBM;']:
             # dBm is already in the correct scale
-            return y_data.copy()
+            if copy:
+                return y_data.copy()
+            view = y_data.view()
+            view.flags.writeable = False
+            return view
         elif y_unit in ['W', 'WATT', 'W;', 'WATT;']:
             # Convert from watts to dBm (10*log10(W/0.001))
             return 10 * np.log10(np.abs(y_data / 0.001))
         else:
             raise ValueError(f"Unit '{y_unit}' not recognized for conversion to dBm")
 
-    def convert_to_polar(self) -> np.ndarray:
+    @_memoized
+    def convert_to_polar(self, calibration=None, copy: bool = True) -> np.ndarray:
         """
         Convert X-axis data to polar coordinates (radians)
 
@@ -70,6 +210,15 @@ class ConversionMixin:
         and the last data point corresponds to 360° (2π radians), with
         linear interpolation in between.
 
+        Parameters:
+        -----------
+        calibration : AngleCalibration, optional
+            If given, use the calibrated angle of each sample (from the measured
+            time axis, see scripts.calibration) instead of the linear ramp
+        copy : bool, optional
+            If False, return the memoized read-only array without copying.
+            If True (default), return a new writable array
+
         Returns:
         --------
         np.ndarray
@@ -84,6 +233,9 @@ class ConversionMixin:
         if self.data is None:
             raise ValueError("No data available for conversion")
 
+        if calibration is not None:
+            return np.deg2rad(calibration.angles(self))
+
         # Check current X-axis unit and handle accordingly
         x_unit = self.header_data.get('x-Unit', '').upper()
         
@@ -103,12 +255,15 @@ class ConversionMixin:
 
         return angles_radians
 
-    def convert_to_degree(self, min_deg: float = 0.0, max_deg: float = 360.0) -> np.ndarray:
+    @_memoized
+    def convert_to_degree(self, min_deg: float = 0.0, max_deg: float = 360.0,
+                          calibration=None, copy: bool = True) -> np.ndarray:
         """
         Convert X-axis data to degree scale with specified range
         
         Converts the time-based X-axis to degrees, useful for antenna pattern measurements
-        where time corresponds to angular position.
+        where time corresponds to angular position. Data whose X-axis is already in
+        degrees (e.g. simulated far-field cuts) keeps its actual angular spacing.
         
         Parameters:
         -----------
@@ -116,8 +271,14 @@ class ConversionMixin:
             Minimum degree value (default: 0.0)
         max_deg : float, optional
             Maximum degree value (default: 360.0)
+        calibration : AngleCalibration, optional
+            If given, return the calibrated angle of each sample, computed from
+            the measured time axis (see scripts.calibration). min_deg and
+            max_deg are then ignored in favor of the calibration's own range
+        copy : bool, optional
+            If False, return the memoized read-only array without copying.
+            If True (default), return a new writable array
 
-            
         Returns:
         --------
         np.ndarray
@@ -126,13 +287,23 @@ class ConversionMixin:
         Raises:
         -------
         ValueError
-            If no data is available or the X-axis is not in time units
+            If no data is available or the X-axis is not in time or degree units
         """
         if self.data is None:
             raise ValueError("No data available for conversion")
+
+        if calibration is not None:
+            # The calibration returns its own cached read-only array
+            angles = calibration.angles(self)
+            return angles.copy() if copy else angles
     
-        # Verify that the X-axis is in time units
+        # Verify that the X-axis is in time (or angle) units
         x_unit = self.header_data.get('x-Unit', '').upper()
+        if x_unit in ['DEG', 'DEG;']:
+            # Already angular: shift the first point to min_deg and scale one full
+            # turn (360°) to the requested range
+            x_data = self.data['x']
+            return min_deg + (x_data - x_data[0]) * (max_deg - min_deg) / 360.0
         if x_unit not in ['S', 'S;']:
             raise ValueError(f"X-axis must be in seconds for degree conversion, but has unit '{x_unit}'")
     
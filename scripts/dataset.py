@@ -0,0 +1,545 @@
+# dataset.py - Colección de mediciones apiladas en un único array
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+SADataset: N diagramas (medidos o simulados) apilados en un array (N, n_angles)
+sobre una grilla angular común, con metadatos por fila (frecuencia,
+polarización, origen). Las conversiones y métricas se calculan con una sola
+operación de NumPy sobre todas las filas, salvo sidelobe_level, que busca los
+picos fila por fila.
+
+Ejemplo:
+
+    ds = SADataset.from_files(glob.glob('./mediciones/*GHz.DAT') +
+                              glob.glob('./simulaciones/*GHz.DAT'), normalize=True)
+    directas = ds.select(polarization='directa', source='medida')
+    anchos = directas.beamwidth()
+"""
+
+import os
+import re
+import warnings
+from typing import Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+from scipy.signal import find_peaks
+
+from .resampling import AngularResampler
+from .sa_data import SAData, load_sa_data
+
+# Nombre de los archivos preprocesados, por ejemplo 'directa_2.7GHz.DAT'
+_NAME_PATTERN = re.compile(r'(?P<polarization>[A-Za-z]+)_(?P<frequency>\d+(?:\.\d+)?)\s*GHz', re.IGNORECASE)
+
+# Metadatos por los que se ordenan las filas al apilar, para que las
+# selecciones habituales sean bloques contiguos (vistas)
+DEFAULT_SORT_KEYS = ('polarization', 'source', 'frequency')
+
+# Unidades logarítmicas de potencia (10·log10), en mayúsculas
+_LOG_UNITS = ('DB', 'DBM', 'DBI')
+
+# Directorio -> origen de la medición
+_SOURCE_NAMES = {
+    'mediciones': 'medida',
+    'simulaciones': 'simulada'
+}
+
+
+def metadata_from_path(file_path: str) -> Dict[str, Union[str, float]]:
+    """
+    Deduce los metadatos de una medición a partir de su ruta
+
+    Parameters:
+    -----------
+    file_path : str
+        Ruta como './mediciones/directa_2.7GHz.DAT'
+
+    Returns:
+    --------
+    Dict[str, Union[str, float]]
+        {'frequency': Hz, 'polarization': 'directa'/'cruzada', 'source':
+        'medida'/'simulada', 'name': nombre del archivo}. Los campos que no se
+        pueden deducir quedan como '' (o NaN para la frecuencia)
+    """
+    name = os.path.basename(file_path)
+    directory = os.path.basename(os.path.dirname(os.path.abspath(file_path))).lower()
+    match = _NAME_PATTERN.search(name)
+    return {
+        'frequency': float(match.group('frequency')) * 1e9 if match else np.nan,
+        'polarization': match.group('polarization').lower() if match else '',
+        'source': _SOURCE_NAMES.get(directory, directory),
+        'name': name
+    }
+
+
+class SADataset:
+    """
+    Colección de N diagramas apilados en un array (N, n_angles)
+
+    Atributos:
+    - angles: grilla angular común en grados, forma (n_angles,)
+    - values: array (N, n_angles) con un diagrama por fila
+    - metadata: columnas de metadatos, un array de largo N por clave
+    - y_unit: unidad de los valores ('dBm', 'dB', 'W', ...)
+
+    select() retorna vistas de `values` cuando las filas elegidas están
+    equiespaciadas. from_measurements ordena las filas por DEFAULT_SORT_KEYS,
+    así que seleccionar por polarización, por polarización y origen, o por
+    esos criterios y una frecuencia, da bloques contiguos. Las selecciones que
+    NumPy no puede representar como vista se copian, con una advertencia. Las
+    vistas comparten memoria con el dataset original.
+    """
+
+    def __init__(self, angles: np.ndarray, values: np.ndarray,
+                 metadata: Optional[Dict[str, Sequence]] = None, y_unit: str = 'dBm'):
+        """
+        Parameters:
+        -----------
+        angles : np.ndarray
+            Grilla angular común en grados, forma (n_angles,)
+        values : np.ndarray
+            Array (N, n_angles)
+        metadata : Optional[Dict[str, Sequence]]
+            Columnas de metadatos, cada una de largo N
+        y_unit : str
+            Unidad de los valores
+
+        Raises:
+        -------
+        ValueError
+            Si las formas de angles, values o metadata no son consistentes
+        """
+        values = np.asarray(values)
+        if values.ndim != 2 or values.shape[1] != len(angles):
+            raise ValueError(f"values debe tener forma (N, {len(angles)}), pero tiene {values.shape}")
+
+        self.angles = np.asarray(angles)
+        self.values = values
+        self.metadata: Dict[str, np.ndarray] = {}
+        for key, column in (metadata or {}).items():
+            column = np.asarray(column)
+            if len(column) != len(values):
+                raise ValueError(f"La columna de metadatos '{key}' tiene {len(column)} filas, se esperaban {len(values)}")
+            self.metadata[key] = column
+        self.y_unit = y_unit
+
+    @classmethod
+    def from_measurements(cls, measurements: Sequence[SAData],
+                          metadata: Optional[Sequence[Dict]] = None, n_angles: Optional[int] = None,
+                          min_deg: float = 0.0, max_deg: float = 360.0, trace: str = 'y1',
+                          normalize: bool = False,
+                          sort_keys: Optional[Sequence[str]] = DEFAULT_SORT_KEYS) -> 'SADataset':
+        """
+        Apila varias mediciones sobre una grilla angular común
+
+        Si todas tienen el mismo número de puntos y no se pide n_angles, las
+        filas se copian tal cual; si no, se interpolan (periódicamente, con
+        AngularResampler) sobre `n_angles` puntos equiespaciados entre min_deg
+        y max_deg.
+
+        Parameters:
+        -----------
+        measurements : Sequence[SAData]
+            Mediciones a apilar (x en segundos o en grados, ver convert_to_degree)
+        metadata : Optional[Sequence[Dict]]
+            Metadatos de cada medición (default: deducidos de la ruta del archivo)
+        n_angles : Optional[int]
+            Puntos de la grilla común (default: el mayor número de puntos)
+        min_deg : float, optional
+            Ángulo del primer punto de cada medición
+        max_deg : float, optional
+            Ángulo del último punto de cada medición
+        trace : str, optional
+            Traza a apilar ('y1' por defecto)
+        normalize : bool, optional
+            Si es True, normaliza cada fila a dB relativos a su máximo, lo que
+            permite apilar mediciones en dBm junto a simulaciones en dBi
+        sort_keys : Optional[Sequence[str]]
+            Metadatos por los que se ordenan las filas (ver sort_by); los que
+            no están en los metadatos se ignoran. None conserva el orden de
+            `measurements`
+
+        Returns:
+        --------
+        SADataset
+            Colección con una fila por medición (ordenadas por sort_keys)
+
+        Raises:
+        -------
+        ValueError
+            Si no hay mediciones o las unidades de y no coinciden
+        """
+        if not measurements:
+            raise ValueError("No hay mediciones para apilar")
+        if metadata is None:
+            metadata = [metadata_from_path(sa.file_path) for sa in measurements]
+
+        units = {sa.header_data.get('y-Unit', '').rstrip(';') for sa in measurements}
+        if len(units) > 1 and not normalize:
+            raise ValueError(f"Las mediciones tienen unidades distintas: {sorted(units)}. "
+                             f"Use normalize=True para apilarlas en dB normalizados")
+
+        lengths = {len(sa.data['x']) for sa in measurements}
+        resample = n_angles is not None or len(lengths) > 1
+        if n_angles is None:
+            n_angles = max(lengths)
+
+        rows = [sa.data[trace] for sa in measurements]
+        if resample:
+            # Un remuestreo vectorizado por cada largo distinto de medición
+            resampler = AngularResampler(n_points=n_angles, min_deg=min_deg, max_deg=max_deg,
+                                         period=max_deg - min_deg)
+            angles = resampler.angles
+            values = resampler.resample(rows)
+        else:
+            angles = np.linspace(min_deg, max_deg, n_angles)
+            values = np.vstack(rows).astype(float)
+
+        y_unit = units.pop() or 'dBm'
+        if normalize:
+            values -= np.max(values, axis=1, keepdims=True)
+            y_unit = 'dB'
+
+        columns = {key: [entry.get(key) for entry in metadata] for key in metadata[0]}
+        dataset = cls(angles, values, columns, y_unit=y_unit)
+        keys = [key for key in (sort_keys or ()) if key in dataset.metadata]
+        return dataset.sort_by(*keys) if keys else dataset
+
+    @classmethod
+    def from_files(cls, file_paths: Sequence[str], metadata: Optional[Sequence[Dict]] = None,
+                   **options) -> 'SADataset':
+        """
+        Carga y apila varios archivos .DAT (ver from_measurements)
+
+        Parameters:
+        -----------
+        file_paths : Sequence[str]
+            Rutas de los archivos
+        metadata : Optional[Sequence[Dict]]
+            Metadatos por archivo (default: deducidos de cada ruta)
+        **options
+            Argumentos de from_measurements (n_angles, min_deg, max_deg, trace,
+            normalize, sort_keys)
+
+        Returns:
+        --------
+        SADataset
+            Colección con una fila por archivo
+        """
+        measurements = [load_sa_data(path) for path in file_paths]
+        return cls.from_measurements(measurements, metadata, **options)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[np.ndarray, 'SADataset']:
+        """Una fila (vista 1D) por índice entero, o un sub-dataset (vista) por slice"""
+        if isinstance(index, slice):
+            return self._subset(index)
+        return self.values[index]
+
+    def _subset(self, rows: Union[slice, np.ndarray]) -> 'SADataset':
+        """Sub-dataset con las filas indicadas (vista si rows es un slice)"""
+        subset = SADataset.__new__(SADataset)
+        subset.angles = self.angles
+        subset.values = self.values[rows]
+        subset.metadata = {key: column[rows] for key, column in self.metadata.items()}
+        subset.y_unit = self.y_unit
+        return subset
+
+    def _like(self, values: np.ndarray, y_unit: str) -> 'SADataset':
+        """Dataset con los mismos ángulos y metadatos y otros valores"""
+        result = self._subset(slice(None))
+        result.values = values
+        result.y_unit = y_unit
+        return result
+
+    def _match(self, criteria: Dict) -> np.ndarray:
+        """Máscara de filas que cumplen todos los criterios"""
+        mask = np.ones(len(self), dtype=bool)
+        for key, expected in criteria.items():
+            if key not in self.metadata:
+                raise KeyError(f"Metadato '{key}' no disponible. Use uno de {list(self.metadata)}")
+            column = self.metadata[key]
+            options = expected if isinstance(expected, (list, tuple, set)) else [expected]
+            if np.issubdtype(column.dtype, np.number):
+                # Frecuencias y demás valores numéricos: comparación con tolerancia
+                mask &= np.isclose(column[:, np.newaxis], np.asarray(list(options), dtype=float)).any(axis=1)
+            else:
+                mask &= np.isin(column, list(options))
+        return mask
+
+    def select(self, **criteria) -> 'SADataset':
+        """
+        Selecciona las filas cuyos metadatos coinciden con los criterios
+
+        Ejemplo: ds.select(polarization='directa', frequency=[2.7e9, 3.1e9])
+
+        Parameters:
+        -----------
+        **criteria
+            Clave de metadato -> valor, o lista de valores aceptados
+
+        Returns:
+        --------
+        SADataset
+            Sub-dataset; `values` es una vista si las filas están equiespaciadas.
+            Si no, es una copia y se emite un RuntimeWarning (ver sort_by)
+        """
+        rows = np.flatnonzero(self._match(criteria))
+        if len(rows) == 0:
+            return self._subset(slice(0, 0))
+
+        steps = np.diff(rows)
+        if len(rows) == 1 or np.all(steps == steps[0]):
+            # Filas equiespaciadas: se pueden representar como slice (vista)
+            step = int(steps[0]) if len(rows) > 1 else 1
+            return self._subset(slice(int(rows[0]), int(rows[-1]) + 1, step))
+        warnings.warn(f"Las filas de {criteria} no están equiespaciadas: la selección es una copia. "
+                      f"Ordene el dataset con sort_by() por esos metadatos para obtener vistas",
+                      RuntimeWarning, stacklevel=2)
+        return self._subset(rows)
+
+    def get(self, **criteria) -> np.ndarray:
+        """
+        Retorna la única fila que cumple los criterios, como vista 1D
+
+        Raises:
+        -------
+        ValueError
+            Si ninguna o más de una fila cumplen los criterios
+        """
+        rows = np.flatnonzero(self._match(criteria))
+        if len(rows) != 1:
+            raise ValueError(f"Se esperaba una fila para {criteria}, pero hay {len(rows)}")
+        return self.values[rows[0]]
+
+    def sort_by(self, *keys: str) -> 'SADataset':
+        """
+        Retorna una copia con las filas ordenadas por los metadatos indicados
+
+        Ordenar por los criterios de selección más usados (por ejemplo
+        'source', 'polarization', 'frequency') hace que las selecciones
+        posteriores sean contiguas y por lo tanto vistas.
+
+        Returns:
+        --------
+        SADataset
+            Dataset reordenado (copia)
+        """
+        order = np.lexsort([self.metadata[key] for key in reversed(keys)])
+        return self._subset(order)
+
+    def _row_max(self) -> np.ndarray:
+        """Máximo de cada fila ignorando NaN (puntos enmascarados), forma (N, 1)"""
+        with warnings.catch_warnings():
+            # Una fila completamente enmascarada da NaN sin advertencia
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return np.nanmax(self.values, axis=1, keepdims=True)
+
+    def _peak_indices(self) -> np.ndarray:
+        """Índice del máximo de cada fila ignorando NaN (0 en filas completamente enmascaradas)"""
+        return np.argmax(np.nan_to_num(self.values, nan=-np.inf), axis=1)
+
+    def to_db(self) -> 'SADataset':
+        """
+        Normaliza todas las filas a dB relativos a su máximo (P - max(P))
+
+        Returns:
+        --------
+        SADataset
+            Dataset en dB con el máximo de cada fila en 0
+        """
+        return self._like(self.values - self._row_max(), 'dB')
+
+    def to_linear(self) -> 'SADataset':
+        """
+        Convierte todas las filas de dBm a watts: P = 10^((P_dBm - 30) / 10)
+
+        Returns:
+        --------
+        SADataset
+            Dataset en watts
+
+        Raises:
+        -------
+        ValueError
+            Si los valores no están en dBm
+        """
+        if self.y_unit.upper() != 'DBM':
+            raise ValueError(f"La conversión a watts requiere dBm, pero la unidad es '{self.y_unit}'")
+        return self._like(10 ** ((self.values - 30) / 10), 'W')
+
+    def peak(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Valor máximo de cada fila y el ángulo donde ocurre
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            (máximos, ángulos en grados), cada uno de largo N
+        """
+        indices = self._peak_indices()
+        valid = ~np.isnan(self._row_max()[:, 0])
+        angles = np.where(valid, self.angles[indices], np.nan)
+        return self.values[np.arange(len(self)), indices], angles
+
+    def beamwidth(self, level_db: float = 3.0) -> np.ndarray:
+        """
+        Ancho de haz de cada fila a `level_db` por debajo del máximo
+
+        Mismo criterio que plot_directivity_beamwidth: separación angular entre
+        el primer y el último punto que superan el umbral. Los puntos
+        enmascarados (NaN) no superan el umbral.
+
+        Parameters:
+        -----------
+        level_db : float, optional
+            Caída respecto del máximo (3 dB por defecto)
+
+        Returns:
+        --------
+        np.ndarray
+            Ancho de haz en grados de cada fila
+        """
+        threshold = self._row_max() - level_db
+        with np.errstate(invalid='ignore'):
+            above = self.values >= threshold
+        first = np.argmax(above, axis=1)
+        last = self.values.shape[1] - 1 - np.argmax(above[:, ::-1], axis=1)
+        return np.where(above.any(axis=1), np.abs(self.angles[last] - self.angles[first]), np.nan)
+
+    def directivity(self) -> np.ndarray:
+        """
+        Directividad en el plano medido: max(P) / promedio(P) en lineal, en dB
+
+        El promedio se toma sobre los puntos no enmascarados. Como es un
+        cociente no depende de la referencia: acepta dBm, dB normalizados
+        (normalize=True), dBi o watts.
+
+        Returns:
+        --------
+        np.ndarray
+            Directividad en dB de cada fila
+
+        Raises:
+        -------
+        ValueError
+            Si la unidad no es logarítmica (dB, dBm, dBi) ni watts
+        """
+        unit = self.y_unit.upper().rstrip(';')
+        if unit in _LOG_UNITS:
+            # Relativo al máximo de cada fila: la referencia se cancela en el cociente
+            linear = 10 ** ((self.values - self._row_max()) / 10)
+        elif unit in ('W', 'WATT'):
+            linear = self.values
+        else:
+            raise ValueError(f"La directividad requiere dB, dBm, dBi o W, pero la unidad es '{self.y_unit}'")
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return 10 * np.log10(np.nanmax(linear, axis=1) / np.nanmean(linear, axis=1))
+
+    def axial_ratio(self, cross: 'SADataset') -> np.ndarray:
+        """
+        Relación axial: máximo de cada fila menos la fila correspondiente de
+        `cross` en el mismo ángulo (en dB)
+
+        Es NaN si `cross` está enmascarada en ese ángulo (la cruzada está bajo
+        el piso de ruido y la relación solo tiene una cota inferior).
+
+        Parameters:
+        -----------
+        cross : SADataset
+            Polarización cruzada, con las mismas filas y grilla angular
+
+        Returns:
+        --------
+        np.ndarray
+            Relación axial en dB de cada fila
+
+        Raises:
+        -------
+        ValueError
+            Si los datasets no tienen la misma forma
+        """
+        if cross.values.shape != self.values.shape:
+            raise ValueError(f"Formas distintas: {self.values.shape} y {cross.values.shape}")
+        indices = self._peak_indices()
+        rows = np.arange(len(self))
+        return self.values[rows, indices] - cross.values[rows, indices]
+
+    def sidelobe_level(self, min_sll_level: float = -15.0) -> np.ndarray:
+        """
+        Nivel del mayor lóbulo secundario de cada fila, en dB relativos al máximo
+
+        Mismo criterio que plot_sidelobe_level: el lóbulo principal abarca el
+        máximo ± 1.5 veces el ancho de haz a -3 dB, y los lóbulos secundarios
+        son los picos (prominencia >= 1 dB, separados al menos n/20 puntos) por
+        encima de min_sll_level fuera de esa región. Los puntos enmascarados
+        (NaN) no cuentan como picos.
+
+        Es la única métrica que no es una sola operación sobre todas las filas:
+        la búsqueda de picos (find_peaks, con prominencia y distancia mínima)
+        se hace fila por fila; el resto (normalización, ancho de haz, región
+        del lóbulo principal) está vectorizado.
+
+        Parameters:
+        -----------
+        min_sll_level : float, optional
+            Nivel mínimo en dB relativos al máximo para considerar un pico
+
+        Returns:
+        --------
+        np.ndarray
+            Nivel en dB de cada fila; -inf si no hay lóbulos secundarios y NaN
+            si la fila está completamente enmascarada
+        """
+        relative = self.to_db().values
+        beamwidth = self.beamwidth(3.0)
+        _, peak_angles = self.peak()
+        half_width = 1.5 * beamwidth
+        # Distancia angular circular de cada punto al máximo de su fila
+        distance = np.abs((self.angles - peak_angles[:, np.newaxis] + 180.0) % 360.0 - 180.0)
+        outside = distance > half_width[:, np.newaxis]
+
+        result = np.full(len(self), -np.inf)
+        for row, values in enumerate(relative):
+            if np.isnan(beamwidth[row]):
+                result[row] = np.nan
+                continue
+            # Los NaN se rellenan con el mínimo: nunca superan min_sll_level
+            filled = np.where(np.isnan(values), np.nanmin(values), values)
+            peaks, _ = find_peaks(filled, height=min_sll_level, distance=max(len(filled) // 20, 1),
+                                  prominence=1.0)
+            peaks = peaks[outside[row, peaks]]
+            if len(peaks):
+                result[row] = filled[peaks].max()
+        return result
+
+    def to_sadata(self, index: int) -> SAData:
+        """
+        Crea un SAData con una fila (x en grados), para usar ploteos de SAData
+
+        Parameters:
+        -----------
+        index : int
+            Índice de la fila
+
+        Returns:
+        --------
+        SAData
+            Instancia con la fila como y1
+        """
+        header = {'x-Unit': 'deg', 'y-Unit': self.y_unit}
+        name = str(self.metadata['name'][index]) if 'name' in self.metadata else ''
+        return SAData.from_arrays(self.angles, self.values[index], header, file_path=name)
+
+    def nbytes(self) -> int:
+        """
+        Retorna la memoria ocupada por los valores, ángulos y metadatos, en bytes
+        """
+        return self.values.nbytes + self.angles.nbytes + sum(column.nbytes for column in self.metadata.values())
+
+    def __repr__(self) -> str:
+        """Representación string del objeto"""
+        return (f"SADataset(rows={len(self)}, angles={len(self.angles)}, "
+                f"y_unit='{self.y_unit}', metadata={list(self.metadata)})")
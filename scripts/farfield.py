@@ -0,0 +1,437 @@
+# farfield.py - Carga de exportaciones de campo lejano (theta x phi) de simuladores
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+Carga de las exportaciones de campo lejano con columnas Theta/Phi (como las de
+`simulaciones/originales/`) en una grilla 2D compacta por magnitud, con
+extracción vectorizada de cortes a theta o phi constante como objetos SAData.
+"""
+
+import glob
+import re
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+from .sa_data import SAData
+
+# Nombre y unidad de cada columna del encabezado, por ejemplo 'Abs(Horiz)[dBi   ]'
+_COLUMN_PATTERN = re.compile(r'([^\s\[]+)\s*\[([^\]]*)\]')
+
+# Frecuencia codificada en el nombre del archivo, por ejemplo 'Diagrama_2_7GHz_...'
+_FREQUENCY_PATTERN = re.compile(r'(\d+)[_.](\d+)\s*GHz', re.IGNORECASE)
+
+
+def _quantity_key(column_name: str) -> str:
+    """Normaliza un nombre de columna: 'Abs(Horiz)' -> 'abs_horiz', 'Ax.Ratio' -> 'ax_ratio'"""
+    return re.sub(r'[^0-9a-z]+', '_', column_name.lower()).strip('_')
+
+
+def _frequency_from_name(file_path: str) -> Optional[float]:
+    """Extrae la frecuencia en Hz del nombre del archivo, si está codificada"""
+    match = _FREQUENCY_PATTERN.search(file_path)
+    if match is None:
+        return None
+    return float(f"{match.group(1)}.{match.group(2)}") * 1e9
+
+
+class FarFieldGrid:
+    """
+    Grilla de campo lejano con una matriz (n_theta, n_phi) por magnitud.
+
+    Las magnitudes se guardan con claves normalizadas ('abs_grlz', 'abs_horiz',
+    'phase_horiz', 'abs_verti', 'phase_verti', 'ax_ratio'). Los puntos que no
+    aparecen en la exportación quedan como NaN.
+    """
+
+    def __init__(self, theta: np.ndarray, phi: np.ndarray, quantities: Dict[str, np.ndarray],
+                 units: Dict[str, str], frequency: Optional[float] = None, file_path: str = ''):
+        """
+        Parameters:
+        -----------
+        theta : np.ndarray
+            Valores de theta en grados, ordenados
+        phi : np.ndarray
+            Valores de phi en grados, ordenados
+        quantities : Dict[str, np.ndarray]
+            Matriz (n_theta, n_phi) por magnitud
+        units : Dict[str, str]
+            Unidad de cada magnitud
+        frequency : Optional[float]
+            Frecuencia en Hz
+        file_path : str
+            Archivo de origen
+        """
+        self.theta = theta
+        self.phi = phi
+        self.quantities = quantities
+        self.units = units
+        self.frequency = frequency
+        self.file_path = file_path
+
+    @classmethod
+    def from_file(cls, file_path: str, dtype: np.dtype = np.float64) -> 'FarFieldGrid':
+        """
+        Carga una exportación de texto con columnas Theta, Phi y magnitudes
+
+        Parameters:
+        -----------
+        file_path : str
+            Ruta del archivo exportado por el simulador
+        dtype : np.dtype, optional
+            Tipo de las matrices de magnitudes (np.float32 para reducir memoria)
+
+        Returns:
+        --------
+        FarFieldGrid
+            Grilla con todas las magnitudes del archivo
+
+        Raises:
+        -------
+        ValueError
+            Si el archivo no tiene columnas Theta y Phi
+        """
+        # Import local: así `python -m scripts.txt2dat` no importa el módulo dos veces
+        from .txt2dat import _find_text_data_start
+
+        with open(file_path, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+
+        data_start = _find_text_data_start(lines)
+        columns = []
+        for line in lines[:data_start]:
+            columns = _COLUMN_PATTERN.findall(line)
+            if columns:
+                break
+
+        names = [_quantity_key(name) for name, _ in columns]
+        if names[:2] != ['theta', 'phi']:
+            raise ValueError(f"El archivo {file_path} no tiene columnas Theta y Phi")
+
+        table = np.loadtxt(lines[data_start:], ndmin=2)
+
+        # Ubicar cada fila en la grilla con un solo paso vectorizado
+        theta, theta_index = np.unique(table[:, 0], return_inverse=True)
+        phi, phi_index = np.unique(table[:, 1], return_inverse=True)
+
+        quantities = {}
+        units = {}
+        for column, (name, (_, unit)) in enumerate(zip(names, columns)):
+            if column < 2:
+                continue
+            grid = np.full((len(theta), len(phi)), np.nan, dtype=dtype)
+            grid[theta_index, phi_index] = table[:, column]
+            quantities[name] = grid
+            units[name] = unit.strip()
+
+        return cls(theta, phi, quantities, units, _frequency_from_name(file_path), file_path)
+
+    def get_quantity_names(self) -> List[str]:
+        """
+        Retorna los nombres de las magnitudes disponibles
+
+        Returns:
+        --------
+        List[str]
+            Claves normalizadas de las magnitudes
+        """
+        return list(self.quantities)
+
+    def _grid(self, quantity: str) -> np.ndarray:
+        """Retorna la matriz de una magnitud o lanza KeyError con las opciones válidas"""
+        if quantity not in self.quantities:
+            raise KeyError(f"Magnitud '{quantity}' no disponible. Use una de {self.get_quantity_names()}")
+        return self.quantities[quantity]
+
+    @staticmethod
+    def _check_coverage(axis: np.ndarray, values: np.ndarray, period: Optional[float], name: str) -> None:
+        """
+        Verifica que los valores pedidos estén cubiertos por la grilla muestreada
+
+        Un valor está cubierto si está a no más de un paso de grilla de alguna
+        muestra. En un eje periódico con menos de 3 muestras (por ejemplo los
+        planos phi = 90/270 de las exportaciones planares) el paso no describe
+        el eje, así que solo se aceptan valores muestreados.
+
+        Raises:
+        -------
+        ValueError
+            Si algún valor queda lejos de todas las muestras
+        """
+        distances = np.abs(values[:, np.newaxis] - axis[np.newaxis, :])
+        if period is not None:
+            distances = np.mod(distances, period)
+            distances = np.minimum(distances, period - distances)
+        nearest = distances.min(axis=1)
+
+        if period is not None and len(axis) < 3:
+            limit = 1e-6
+        else:
+            steps = np.diff(axis)
+            limit = steps[steps > 0].min() if np.any(steps > 0) else 1e-6
+        outside = nearest > limit
+        if np.any(outside):
+            raise ValueError(f"{name}={values[outside][0]:g}° no está cubierto por la grilla "
+                             f"(valores muestreados: {np.array2string(axis, threshold=8)})")
+
+    @staticmethod
+    def _interpolation_weights(axis: np.ndarray, values: np.ndarray, period: Optional[float],
+                               method: str, name: str = 'valor'):
+        """
+        Calcula índices y pesos para interpolar en `axis` todos los `values` a la vez
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            (índice inferior, índice superior, peso del superior)
+
+        Raises:
+        -------
+        ValueError
+            Si el método no es válido o algún valor no está cubierto por la grilla
+        """
+        values = np.asarray(values, dtype=float)
+        FarFieldGrid._check_coverage(axis, values, period, name)
+        if period is not None:
+            values = np.mod(values - axis[0], period) + axis[0]
+
+        if method == 'nearest':
+            distances = np.abs(values[:, np.newaxis] - axis[np.newaxis, :])
+            if period is not None:
+                distances = np.minimum(distances, period - distances)
+            nearest = np.argmin(distances, axis=1)
+            return nearest, nearest, np.zeros(len(values))
+
+        if method != 'linear':
+            raise ValueError(f"Método '{method}' no válido. Use 'nearest' o 'linear'")
+
+        upper = np.searchsorted(axis, values, side='right')
+        lower = upper - 1
+        if period is not None:
+            # Entre el último valor y el primero + período, envolviendo
+            lower = np.mod(lower, len(axis))
+            upper = np.mod(upper, len(axis))
+            span = np.mod(axis[upper] - axis[lower], period)
+            span[span == 0] = period if len(axis) == 1 else 1.0
+            weight = np.mod(values - axis[lower], period) / span
+        else:
+            lower = np.clip(lower, 0, len(axis) - 1)
+            upper = np.clip(upper, 0, len(axis) - 1)
+            span = axis[upper] - axis[lower]
+            weight = np.divide(values - axis[lower], span, out=np.zeros(len(values)), where=span != 0)
+        return lower, upper, weight
+
+    @staticmethod
+    def _blend(lower: np.ndarray, upper: np.ndarray, weight: np.ndarray, phase: bool = False) -> np.ndarray:
+        """
+        Mezcla lineal que no propaga un NaN del vecino cuando su peso es cero
+
+        Con phase=True los valores son fases en grados y se mezclan como
+        fasores exp(1j·φ), así 350° y 10° dan 0° y no 180°. El resultado
+        queda en [0, 360) si las fases de entrada no son negativas (como en
+        las exportaciones), o en (-180, 180] si no.
+        """
+        if phase:
+            phasor = ((1 - weight) * np.exp(1j * np.deg2rad(lower))
+                      + weight * np.exp(1j * np.deg2rad(upper)))
+            blended = np.rad2deg(np.angle(phasor))
+            if not (np.any(lower < 0) or np.any(upper < 0)):
+                blended = np.mod(blended, 360.0)
+                # np.mod de un ángulo apenas negativo redondea a 360
+                blended[blended >= 360.0] = 0.0
+            blended = blended.astype(lower.dtype)
+        else:
+            blended = lower * (1 - weight) + upper * weight
+        return np.where(weight == 0, lower, blended)
+
+    def phi_cuts(self, phis: Sequence[float], quantity: str, method: str = 'linear') -> np.ndarray:
+        """
+        Extrae varios cortes a phi constante en una sola operación
+
+        Parameters:
+        -----------
+        phis : Sequence[float]
+            Valores de phi en grados
+        quantity : str
+            Magnitud a extraer (por ejemplo 'abs_horiz')
+        method : str, optional
+            'linear' (default) interpola entre columnas de phi (las fases,
+            sobre el círculo unitario); 'nearest' usa la más cercana
+
+        Returns:
+        --------
+        np.ndarray
+            Array (n_cortes, n_theta)
+
+        Raises:
+        -------
+        ValueError
+            Si algún phi está a más de un paso de grilla de las columnas
+            muestreadas (o no es una de ellas, con menos de 3 columnas)
+        """
+        grid = self._grid(quantity)
+        lower, upper, weight = self._interpolation_weights(self.phi, phis, 360.0, method, 'phi')
+        return self._blend(grid[:, lower], grid[:, upper], weight.astype(grid.dtype),
+                           quantity.startswith('phase')).T
+
+    def theta_cuts(self, thetas: Sequence[float], quantity: str, method: str = 'linear') -> np.ndarray:
+        """
+        Extrae varios cortes a theta constante en una sola operación
+
+        Parameters:
+        -----------
+        thetas : Sequence[float]
+            Valores de theta en grados
+        quantity : str
+            Magnitud a extraer
+        method : str, optional
+            'linear' (default) interpola entre filas de theta (las fases,
+            sobre el círculo unitario); 'nearest' usa la más cercana
+
+        Returns:
+        --------
+        np.ndarray
+            Array (n_cortes, n_phi)
+
+        Raises:
+        -------
+        ValueError
+            Si algún theta está a más de un paso de grilla de las filas muestreadas
+        """
+        grid = self._grid(quantity)
+        lower, upper, weight = self._interpolation_weights(self.theta, thetas, None, method, 'theta')
+        return self._blend(grid[lower, :], grid[upper, :], weight.astype(grid.dtype)[:, np.newaxis],
+                           quantity.startswith('phase'))
+
+    def _to_sadata(self, angles: np.ndarray, values: np.ndarray, quantity: str, label: str) -> SAData:
+        """Crea un SAData con eje x en grados y la unidad de la magnitud"""
+        header = {
+            'Type': 'FARFIELD',
+            'Mode': 'SIMULATED',
+            'Cut': label,
+            'x-Unit': 'deg',
+            'y-Unit': self.units.get(quantity, '')
+        }
+        if self.frequency is not None:
+            header['Center Freq'] = f"{self.frequency:.6f};Hz"
+        return SAData.from_arrays(angles, values, header, file_path=self.file_path)
+
+    def phi_cut(self, phi: float, quantity: str, full_circle: bool = True,
+                method: str = 'linear') -> SAData:
+        """
+        Extrae un corte a phi constante como SAData (eje x en grados)
+
+        Parameters:
+        -----------
+        phi : float
+            Valor de phi en grados
+        quantity : str
+            Magnitud a extraer
+        full_circle : bool, optional
+            Si es True (default), une el corte en phi (theta 0→180) con el de
+            phi + 180 (theta 180→0) para obtener un plano completo de 0 a 360°,
+            sin repetir los polos
+        method : str, optional
+            'linear' o 'nearest'
+
+        Returns:
+        --------
+        SAData
+            Corte con x en grados e y en la unidad de la magnitud
+
+        Raises:
+        -------
+        ValueError
+            Si phi (o phi + 180 con full_circle) no está cubierto por la grilla
+        """
+        if not full_circle:
+            values = self.phi_cuts([phi], quantity, method)[0]
+            return self._to_sadata(self.theta.copy(), values, quantity, f"phi={phi:g}")
+
+        front, back = self.phi_cuts([phi, phi + 180.0], quantity, method)
+        # El semiplano opuesto se recorre de theta alto a bajo, sin los polos
+        inner = (self.theta > 0) & (self.theta < 180)
+        angles = np.concatenate((self.theta, 360.0 - self.theta[inner][::-1]))
+        values = np.concatenate((front, back[inner][::-1]))
+        return self._to_sadata(angles, values, quantity, f"phi={phi:g}/{phi + 180.0:g}")
+
+    def theta_cut(self, theta: float, quantity: str, method: str = 'linear') -> SAData:
+        """
+        Extrae un corte a theta constante como SAData (eje x = phi en grados)
+
+        Parameters:
+        -----------
+        theta : float
+            Valor de theta en grados
+        quantity : str
+            Magnitud a extraer
+        method : str, optional
+            'linear' o 'nearest'
+
+        Returns:
+        --------
+        SAData
+            Corte con x en grados e y en la unidad de la magnitud
+        """
+        values = self.theta_cuts([theta], quantity, method)[0]
+        return self._to_sadata(self.phi.copy(), values, quantity, f"theta={theta:g}")
+
+    def nbytes(self) -> int:
+        """
+        Retorna la memoria ocupada por las matrices de magnitudes, en bytes
+
+        Returns:
+        --------
+        int
+            Suma de los tamaños de todas las matrices y ejes
+        """
+        return sum(grid.nbytes for grid in self.quantities.values()) + self.theta.nbytes + self.phi.nbytes
+
+    def __repr__(self) -> str:
+        """Representación string del objeto"""
+        return (f"FarFieldGrid(file_path='{self.file_path}', "
+                f"theta={len(self.theta)}, phi={len(self.phi)}, "
+                f"quantities={self.get_quantity_names()})")
+
+
+def load_farfield(file_path: str, dtype: np.dtype = np.float64) -> FarFieldGrid:
+    """
+    Función de conveniencia para cargar una exportación de campo lejano
+
+    Parameters:
+    -----------
+    file_path : str
+        Ruta del archivo exportado por el simulador
+    dtype : np.dtype, optional
+        Tipo de las matrices (np.float32 para reducir memoria)
+
+    Returns:
+    --------
+    FarFieldGrid
+        Grilla con todas las magnitudes
+    """
+    return FarFieldGrid.from_file(file_path, dtype=dtype)
+
+
+def load_farfield_many(pattern: str, dtype: np.dtype = np.float64) -> Dict[float, FarFieldGrid]:
+    """
+    Carga todas las exportaciones que coinciden con un patrón glob, indexadas por frecuencia
+
+    Parameters:
+    -----------
+    pattern : str
+        Patrón glob (por ejemplo './simulaciones/originales/*.txt')
+    dtype : np.dtype, optional
+        Tipo de las matrices
+
+    Returns:
+    --------
+    Dict[float, FarFieldGrid]
+        Grilla por frecuencia en Hz (los archivos sin frecuencia en el nombre se omiten)
+    """
+    grids = {}
+    for path in sorted(glob.glob(pattern)):
+        grid = load_farfield(path, dtype=dtype)
+        if grid.frequency is not None:
+            grids[grid.frequency] = grid
+    return grids
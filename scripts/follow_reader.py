@@ -0,0 +1,208 @@
+# SAFollowReader - Lectura incremental de archivos .DAT que todavía se están escribiendo
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+import time
+from typing import Dict, Iterator, Optional, Tuple
+import numpy as np
+
+from .parser_mixin import ParserMixin, TraceData
+from .sa_data import SAData
+
+
+class SAFollowReader(ParserMixin):
+    """
+    Lector en modo "tail -f" para exportaciones .DAT que crecen durante la adquisición.
+
+    El header se parsea una sola vez, cuando aparece la primera línea de datos.
+    Cada llamada a poll() lee solo las líneas completas agregadas desde el último
+    offset y las anexa a arrays que crecen con capacidad amortizada (se duplica
+    al llenarse), sin volver a parsear lo ya leído.
+
+    Solo soporta archivos planos: un archivo comprimido no se puede seguir
+    mientras se escribe.
+    """
+
+    def __init__(self, file_path: str, initial_capacity: int = 4096, parser_engine: str = 'numpy'):
+        """
+        Inicializa el lector; el archivo puede no tener datos todavía
+
+        Parameters:
+        -----------
+        file_path : str
+            Ruta completa al archivo .DAT
+        initial_capacity : int, optional
+            Capacidad inicial (en puntos) de los arrays internos
+        parser_engine : str, optional
+            Motor de parsing de cada bloque nuevo ('numpy' o 'python')
+        """
+        self.file_path = file_path
+        self.parser_engine = parser_engine
+        self.header_data: Dict[str, str] = {}
+        self.n_points: Optional[int] = None
+        self._data_offset = 0
+
+        self._header_ready = False
+        self._offset = 0
+        self._size = 0
+        self._capacity = max(int(initial_capacity), 1)
+        self._x: Optional[np.ndarray] = None
+        self._traces: Optional[np.ndarray] = None
+
+    def _try_parse_header(self) -> bool:
+        """Intenta parsear el header; retorna False si todavía no hay datos en el archivo"""
+        try:
+            self._parse_header_only()
+        except ValueError:
+            # El header todavía no está completo: reintentar en el próximo poll
+            self.header_data = {}
+            return False
+
+        self._header_ready = True
+        self._offset = self._data_offset
+        return True
+
+    def _append(self, x_new: np.ndarray, traces_new: np.ndarray) -> None:
+        """Anexa puntos nuevos, duplicando la capacidad de los arrays cuando hace falta"""
+        if self._x is None:
+            self._x = np.empty(self._capacity)
+            self._traces = np.empty((self._capacity, traces_new.shape[1]))
+
+        required = self._size + len(x_new)
+        if required > len(self._x):
+            capacity = len(self._x)
+            while capacity < required:
+                capacity *= 2
+            x_grown = np.empty(capacity)
+            traces_grown = np.empty((capacity, self._traces.shape[1]))
+            x_grown[:self._size] = self._x[:self._size]
+            traces_grown[:self._size] = self._traces[:self._size]
+            self._x, self._traces = x_grown, traces_grown
+
+        n_traces = min(traces_new.shape[1], self._traces.shape[1])
+        self._x[self._size:required] = x_new
+        self._traces[self._size:required, :n_traces] = traces_new[:, :n_traces]
+        self._traces[self._size:required, n_traces:] = np.nan
+        self._size = required
+
+    def poll(self) -> int:
+        """
+        Lee las líneas completas agregadas desde la última llamada
+
+        Una línea sin salto de línea final se considera incompleta y se lee en
+        el siguiente poll.
+
+        Returns:
+        --------
+        int
+            Número de puntos nuevos incorporados
+        """
+        if not self._header_ready and not self._try_parse_header():
+            return 0
+
+        with open(self.file_path, 'rb') as file:
+            file.seek(self._offset)
+            new_bytes = file.read()
+
+        last_newline = new_bytes.rfind(b'\n')
+        if last_newline == -1:
+            return 0
+
+        complete = new_bytes[:last_newline + 1]
+        self._offset += len(complete)
+
+        lines = complete.decode('utf-8').splitlines()
+        if not any(line.strip() for line in lines):
+            return 0
+
+        x_new, traces_new = self._parse_columns(lines)
+        if len(x_new):
+            self._append(x_new, traces_new)
+        return len(x_new)
+
+    def is_complete(self) -> bool:
+        """
+        Indica si ya se recibieron todos los puntos anunciados en el header ('Values')
+
+        Returns:
+        --------
+        bool
+            True si el header declara n_points y ya se leyeron todos
+        """
+        return self.n_points is not None and self._size >= self.n_points
+
+    def follow(self, interval: float = 0.5, timeout: Optional[float] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Sigue el archivo mientras crece, entregando los puntos nuevos de cada poll
+
+        Termina cuando se completan los puntos del header o se agota el timeout.
+
+        Parameters:
+        -----------
+        interval : float, optional
+            Segundos entre polls
+        timeout : Optional[float]
+            Tiempo máximo total en segundos; None espera indefinidamente
+
+        Yields:
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Vistas (x, trazas) de los puntos nuevos; quedan válidas hasta el próximo poll
+        """
+        start = time.monotonic()
+        while True:
+            previous = self._size
+            if self.poll():
+                yield self._x[previous:self._size], self._traces[previous:self._size]
+
+            if self.is_complete():
+                return
+            if timeout is not None and time.monotonic() - start >= timeout:
+                return
+            time.sleep(interval)
+
+    @property
+    def data(self) -> Optional[Dict[str, np.ndarray]]:
+        """Vistas de los datos recibidos hasta ahora (se invalidan al crecer los arrays)"""
+        if self._x is None:
+            return None
+        return TraceData(self._x[:self._size], self._traces[:self._size])
+
+    def get_received_points(self) -> int:
+        """
+        Retorna la cantidad de puntos leídos hasta ahora
+
+        Returns:
+        --------
+        int
+            Número de puntos recibidos
+        """
+        return self._size
+
+    def to_sadata(self) -> SAData:
+        """
+        Crea un SAData con una copia de los datos recibidos hasta ahora
+
+        Permite usar ploteos y métricas de SAData durante la adquisición.
+
+        Returns:
+        --------
+        SAData
+            Instancia con el header y los puntos recibidos
+
+        Raises:
+        -------
+        ValueError
+            Si todavía no se recibieron datos
+        """
+        if self._x is None:
+            raise ValueError(f"Todavía no hay datos en el archivo {self.file_path}")
+
+        return SAData.from_arrays(self._x[:self._size].copy(), self._traces[:self._size].copy(),
+                                  self.header_data, file_path=self.file_path)
+
+    def __repr__(self) -> str:
+        """Representación string del objeto"""
+        return (f"SAFollowReader(file_path='{self.file_path}', "
+                f"received={self._size}, "
+                f"expected={self.n_points})")
@@ -0,0 +1,390 @@
+# manifest.py - Preprocesado por lotes a partir de un manifiesto
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+Preprocesado de mediciones descripto por un manifiesto en lugar de código.
+
+Cada entrada del manifiesto reproduce la secuencia de Preprocesado.py
+(load_sa_data -> recorte -> espejado opcional -> guardado) sin gráficos ni
+intervención manual, y las entradas se procesan en paralelo.
+
+Campos de una entrada:
+
+- input: archivo .DAT original (relativo al directorio del manifiesto)
+- polarization, frequency: metadatos; arman el nombre de salida por defecto
+  '{polarization}_{frequency}GHz'
+- crop: 'auto' (estimate_crop), corrimientos en grados como en
+  plot_superposition ([izquierdo, derecho], 'izquierdo,derecho' o
+  {left_shift_deg, right_shift_deg}), índices {start_index, end_index},
+  o vacío para no recortar
+- mirror: true/false, o 'auto' para decidirlo contra `reference` (detect_mirror)
+- reference: archivo .DAT de referencia para mirror = 'auto'
+- output: nombre de salida (sin extensión o con .DAT, .DAT.gz, ...)
+
+Formatos: CSV (una fila por entrada, columnas con esos nombres), JSON (lista
+de entradas, u objeto con 'entries' y opciones) o TOML (tablas [[entries]] y
+opciones en el nivel superior). La única opción global es output_dir.
+
+Ejemplo (TOML):
+
+    output_dir = "."
+
+    [[entries]]
+    input = "Originales/1ra med 31Ghz.DAT"
+    polarization = "directa"
+    frequency = "3.1"
+    crop = [15, 20]
+
+    [[entries]]
+    input = "Originales/2da med 29Ghz.DAT"
+    polarization = "directa"
+    frequency = "2.9"
+    crop = "auto"
+    mirror = "auto"
+    reference = "Originales/1ra med 31Ghz.DAT"
+
+A diferencia de Preprocesado.py (donde mirror_data descarta el recorte
+previo), el espejado se aplica sobre los datos ya recortados (ver Pipeline).
+
+Uso:
+
+    python -m scripts.manifest mediciones/preprocesado.toml -j 4
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+from .pipeline import Pipeline
+from .sa_data import SAData, load_sa_data
+
+MANIFEST_FORMATS = ('.csv', '.json', '.toml')
+
+# Referencias de mirror = 'auto' ya cargadas en este proceso, por ruta
+_REFERENCE_CACHE: Dict[str, SAData] = {}
+
+
+def _parse_bool(value: Union[str, bool, None]) -> Union[bool, str]:
+    """Interpreta el campo mirror: booleano, 'auto', o texto sí/no"""
+    if isinstance(value, bool):
+        return value
+    text = '' if value is None else str(value).strip().lower()
+    if text == 'auto':
+        return 'auto'
+    if text in ('', '0', 'false', 'no', 'n'):
+        return False
+    if text in ('1', 'true', 'si', 'sí', 'yes', 's', 'y'):
+        return True
+    raise ValueError(f"Valor de mirror '{value}' no válido. Use true, false o 'auto'")
+
+
+def _parse_crop(value) -> Optional[Union[str, Dict[str, float]]]:
+    """
+    Normaliza el campo crop
+
+    Returns:
+    --------
+    Optional[Union[str, Dict[str, float]]]
+        None (sin recorte), 'auto', {'left_shift_deg', 'right_shift_deg'} o
+        {'start_index', 'end_index'}
+    """
+    if value is None or (isinstance(value, str) and value.strip() in ('', 'none')):
+        return None
+    if isinstance(value, str):
+        if value.strip().lower() == 'auto':
+            return 'auto'
+        value = value.replace(';', ',').split(',')
+    if isinstance(value, dict):
+        if 'start_index' in value and 'end_index' in value:
+            return {'start_index': int(value['start_index']), 'end_index': int(value['end_index'])}
+        return {'left_shift_deg': float(value.get('left_shift_deg', 0.0)),
+                'right_shift_deg': float(value.get('right_shift_deg', 0.0))}
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        return {'left_shift_deg': float(value[0]), 'right_shift_deg': float(value[1])}
+    raise ValueError(f"Recorte '{value}' no válido. Use 'auto', [izquierdo, derecho] o índices")
+
+
+def _normalize_entry(raw: Dict, base_dir: str) -> Dict:
+    """
+    Valida una entrada del manifiesto y resuelve sus rutas
+
+    Raises:
+    -------
+    ValueError
+        Si falta el archivo de entrada o algún campo no es válido
+    """
+    raw = {key.strip(): value for key, value in raw.items() if key is not None}
+    if not raw.get('input'):
+        raise ValueError(f"Entrada sin campo 'input': {raw}")
+
+    polarization = (raw.get('polarization') or '').strip() or None
+    frequency = raw.get('frequency')
+    frequency = None if frequency in (None, '') else str(frequency).strip()
+    output = (raw.get('output') or '').strip() or None
+    if output is None:
+        if polarization and frequency:
+            output = f"{polarization}_{frequency}GHz"
+        else:
+            name = os.path.splitext(os.path.basename(raw['input']))[0]
+            output = f"{name}_processed"
+
+    mirror = _parse_bool(raw.get('mirror'))
+    reference = (raw.get('reference') or '').strip() or None
+    if mirror == 'auto' and reference is None:
+        raise ValueError(f"La entrada '{raw['input']}' usa mirror = 'auto' sin 'reference'")
+
+    return {'input': os.path.join(base_dir, raw['input']),
+            'polarization': polarization,
+            'frequency': frequency,
+            'crop': _parse_crop(raw.get('crop')),
+            'mirror': mirror,
+            'reference': None if reference is None else os.path.join(base_dir, reference),
+            'output': output}
+
+
+def load_manifest(path: str) -> Tuple[List[Dict], Dict]:
+    """
+    Lee un manifiesto CSV, JSON o TOML
+
+    Parameters:
+    -----------
+    path : str
+        Ruta del manifiesto; las rutas de las entradas son relativas a su directorio
+
+    Returns:
+    --------
+    Tuple[List[Dict], Dict]
+        (entradas normalizadas, opciones globales como 'output_dir')
+
+    Raises:
+    -------
+    ValueError
+        Si el formato no es soportado o alguna entrada no es válida
+    """
+    extension = os.path.splitext(path)[1].lower()
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    if extension == '.csv':
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            raw_entries = [row for row in csv.DictReader(f) if any((v or '').strip() for v in row.values())]
+        options = {}
+    elif extension in ('.json', '.toml'):
+        if extension == '.json':
+            with open(path, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+        else:
+            if tomllib is None:
+                raise ValueError("Leer manifiestos TOML requiere Python 3.11 o superior")
+            with open(path, 'rb') as f:
+                document = tomllib.load(f)
+        if isinstance(document, list):
+            document = {'entries': document}
+        raw_entries = document.get('entries', [])
+        options = {key: value for key, value in document.items() if key != 'entries'}
+    else:
+        raise ValueError(f"Formato de manifiesto '{extension}' no soportado. Use uno de {MANIFEST_FORMATS}")
+
+    if 'output_dir' in options:
+        options['output_dir'] = os.path.join(base_dir, options['output_dir'])
+    return [_normalize_entry(raw, base_dir) for raw in raw_entries], options
+
+
+def _reference(path: str) -> SAData:
+    """Carga una referencia una sola vez por proceso"""
+    if path not in _REFERENCE_CACHE:
+        _REFERENCE_CACHE[path] = load_sa_data(path)
+    return _REFERENCE_CACHE[path]
+
+
+def _process_entry(entry: Dict, output_dir: str) -> Dict:
+    """
+    Procesa una entrada completa (corre en un worker del pool)
+
+    Returns:
+    --------
+    Dict
+        Resultado parcial del reporte: 'output', 'crop', 'confidence', 'mirror', 'seconds'
+    """
+    start = time.perf_counter()
+    sa = load_sa_data(entry['input'])
+    pipeline = Pipeline()
+    result = {'crop': None, 'confidence': None, 'mirror': entry['mirror']}
+
+    crop = entry['crop']
+    if crop == 'auto':
+        crop, result['confidence'] = sa.estimate_crop()
+    elif crop is not None and 'left_shift_deg' in crop:
+        crop = sa.superposition_crop(**crop)
+    if crop is not None:
+        pipeline.crop(**crop)
+        result['crop'] = dict(crop)
+
+    if entry['mirror'] == 'auto':
+        pipeline.auto_mirror(_reference(entry['reference']))
+    elif entry['mirror']:
+        pipeline.mirror()
+
+    if len(pipeline):
+        pipeline.apply(sa)
+        # Con mirror = 'auto', la decisión tomada queda en la última etapa del historial
+        if entry['mirror'] == 'auto':
+            result['mirror'] = sa.history[-1]['stages'][-1]['mirror']
+    else:
+        sa.processed_data = sa.data
+
+    sa.set_output_filename(entry['output'])
+    result['output'] = sa.save_processed_data(output_dir=output_dir)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def run_manifest(manifest: Union[str, List[Dict]], output_dir: Optional[str] = None,
+                 max_workers: Optional[int] = None, executor: str = 'process') -> List[Dict]:
+    """
+    Procesa todas las entradas de un manifiesto en paralelo
+
+    Los errores de una entrada se registran en su reporte sin abortar el lote.
+
+    Parameters:
+    -----------
+    manifest : Union[str, List[Dict]]
+        Ruta del manifiesto, o lista de entradas ya leídas con load_manifest
+    output_dir : Optional[str]
+        Directorio de salida (default: el del manifiesto, o su directorio)
+    max_workers : Optional[int]
+        Número de workers del pool (default: el del executor de Python)
+    executor : str
+        'process' (default), 'thread', o 'serial' para procesar sin pool
+
+    Returns:
+    --------
+    List[Dict]
+        Un reporte por entrada con 'input', 'output', 'status' ('ok' o
+        'error'), 'crop', 'confidence' (recorte automático), 'mirror'
+        (decisión tomada), 'seconds' y 'error'
+
+    Raises:
+    -------
+    ValueError
+        Si el executor no es válido o el manifiesto no se puede leer
+    """
+    if executor not in ('process', 'thread', 'serial'):
+        raise ValueError(f"Executor '{executor}' no válido. Use 'process', 'thread' o 'serial'")
+
+    if isinstance(manifest, str):
+        entries, options = load_manifest(manifest)
+        default_dir = options.get('output_dir', os.path.dirname(os.path.abspath(manifest)))
+    else:
+        entries, default_dir = manifest, '.'
+    output_dir = default_dir if output_dir is None else output_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    reports = [{'input': entry['input'], 'output': None, 'status': 'ok', 'crop': None,
+                'confidence': None, 'mirror': entry['mirror'], 'seconds': 0.0, 'error': None}
+               for entry in entries]
+
+    if executor == 'serial':
+        for report, entry in zip(reports, entries):
+            try:
+                report.update(_process_entry(entry, output_dir))
+            except Exception as e:
+                report.update(status='error', error=str(e))
+        return reports
+
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    with pool_class(max_workers=max_workers) as pool:
+        futures = [pool.submit(_process_entry, entry, output_dir) for entry in entries]
+        for report, future in zip(reports, futures):
+            try:
+                report.update(future.result())
+            except Exception as e:
+                # Registrar el error de la entrada sin abortar el lote
+                report.update(status='error', error=str(e))
+
+    return reports
+
+
+def summarize(reports: List[Dict], elapsed: Optional[float] = None) -> Dict:
+    """
+    Resume los reportes de run_manifest
+
+    Parameters:
+    -----------
+    reports : List[Dict]
+        Reportes de run_manifest
+    elapsed : Optional[float]
+        Tiempo total de pared del lote, en segundos
+
+    Returns:
+    --------
+    Dict
+        'entries', 'ok', 'errors', 'failures' ({entrada: error}),
+        'cpu_seconds' (suma por entrada), 'slowest' (entrada y segundos) y 'elapsed'
+    """
+    ok = [report for report in reports if report['status'] == 'ok']
+    slowest = max(ok, key=lambda report: report['seconds'], default=None)
+    return {'entries': len(reports),
+            'ok': len(ok),
+            'errors': len(reports) - len(ok),
+            'failures': {report['input']: report['error'] for report in reports if report['status'] != 'ok'},
+            'cpu_seconds': sum(report['seconds'] for report in reports),
+            'slowest': None if slowest is None else (slowest['input'], slowest['seconds']),
+            'elapsed': elapsed}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Línea de comandos de run_manifest
+
+    Ejemplo:
+
+        python -m scripts.manifest mediciones/preprocesado.toml -j 4 --summary resumen.json
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m scripts.manifest',
+        description='Preprocesa las mediciones descriptas en un manifiesto (CSV, JSON o TOML)')
+    parser.add_argument('manifest', help='archivo de manifiesto')
+    parser.add_argument('-o', '--output-dir', help='directorio de salida (default: el del manifiesto)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='número de workers')
+    parser.add_argument('--executor', choices=('process', 'thread', 'serial'), default='process')
+    parser.add_argument('--summary', help='guardar reportes y resumen en un archivo JSON')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    reports = run_manifest(args.manifest, output_dir=args.output_dir,
+                           max_workers=args.workers, executor=args.executor)
+    summary = summarize(reports, elapsed=time.perf_counter() - start)
+
+    for report in reports:
+        name = os.path.basename(report['input'])
+        if report['status'] == 'ok':
+            details = f"recorte {report['crop']}" if report['crop'] else 'sin recorte'
+            if report['confidence'] is not None:
+                details += f" (confianza {report['confidence']:.2f})"
+            if report['mirror']:
+                details += ', espejado'
+            print(f"  {name}: {report['seconds'] * 1e3:.1f} ms -> {os.path.basename(report['output'])}, {details}")
+        else:
+            print(f"  {name}: error: {report['error']}")
+
+    print(f"Procesadas: {summary['ok']}, errores: {summary['errors']}, "
+          f"tiempo total: {summary['elapsed']:.2f} s")
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'entries': reports}, f, indent=2, ensure_ascii=False)
+    return 1 if summary['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+# noise.py - Sustracción del piso de ruido y enmascarado por SNR
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+Piso de ruido medido como referencia para limpiar diagramas.
+
+NoiseFloor toma una captura de ruido (por ejemplo '7ma med piso ruido.DAT')
+y calcula una sola vez sus estadísticas en potencia lineal por traza. Con
+ellas, subtract() resta el ruido en lineal (P - N) a cualquier número de
+diagramas en una sola operación vectorizada, y reemplaza por NaN los puntos
+cuya SNR, 10·log10((P - N) / N), queda por debajo de min_snr_db. Las métricas
+de SADataset ignoran los NaN, así que no se calculan sobre ruido.
+
+    ruido = NoiseFloor.from_file('./mediciones/Originales/7ma med piso ruido.DAT')
+    ds = SADataset.from_files(glob.glob('./mediciones/*GHz.DAT'))
+    limpio = ruido.apply(ds, min_snr_db=3.0)
+    limpio.sidelobe_level()
+"""
+
+import os
+from typing import Dict, Optional, Tuple, Union
+import numpy as np
+
+from .dataset import SADataset
+from .parser_mixin import TraceData
+from .sa_data import SAData, load_sa_data
+
+NOISE_STATISTICS = ('mean', 'median', 'p95')
+
+# Referencias ya cargadas, por (ruta, mtime, tamaño)
+_NOISE_CACHE: Dict[Tuple, 'NoiseFloor'] = {}
+
+
+def _dBm_to_watts(values: np.ndarray) -> np.ndarray:
+    """P[W] = 10^((P[dBm] - 30) / 10)"""
+    return 10 ** ((np.asarray(values, dtype=float) - 30) / 10)
+
+
+class NoiseFloor:
+    """
+    Estadísticas en potencia lineal de una captura de piso de ruido
+    """
+
+    def __init__(self, reference: SAData, statistic: str = 'mean'):
+        """
+        Parameters:
+        -----------
+        reference : SAData
+            Captura del piso de ruido (cualquier unidad convertible a dBm)
+        statistic : str, optional
+            Estadístico usado como nivel de ruido: 'mean' (default, potencia
+            media), 'median' o 'p95' (percentil 95, más conservador)
+
+        Raises:
+        -------
+        ValueError
+            Si el estadístico no es válido o la referencia no tiene datos
+        """
+        if statistic not in NOISE_STATISTICS:
+            raise ValueError(f"Estadístico '{statistic}' no válido. Use uno de {NOISE_STATISTICS}")
+        if reference.data is None:
+            raise ValueError("La referencia de ruido no tiene datos")
+
+        self.file_path = reference.file_path
+        self.statistic = statistic
+        self.trace_names = [key for key in reference.data if key != 'x']
+
+        # Estadísticas por traza calculadas una sola vez, en watts
+        watts = _dBm_to_watts(reference._y_to_dBm(TraceData.stack(reference.data)))
+        self.stats: Dict[str, np.ndarray] = {
+            'mean': watts.mean(axis=0),
+            'median': np.median(watts, axis=0),
+            'p95': np.percentile(watts, 95, axis=0),
+            'std': watts.std(axis=0),
+        }
+        for values in self.stats.values():
+            values.flags.writeable = False
+        self.n_samples = len(watts)
+
+    @classmethod
+    def from_file(cls, file_path: str, statistic: str = 'mean') -> 'NoiseFloor':
+        """
+        Carga una captura de ruido, reutilizando la ya cargada si el archivo no cambió
+
+        Parameters:
+        -----------
+        file_path : str
+            Ruta de la captura de ruido
+        statistic : str, optional
+            Estadístico usado como nivel de ruido (ver NoiseFloor)
+
+        Returns:
+        --------
+        NoiseFloor
+            Referencia de ruido
+        """
+        info = os.stat(file_path)
+        key = (os.path.abspath(file_path), info.st_mtime_ns, info.st_size, statistic)
+        if key not in _NOISE_CACHE:
+            _NOISE_CACHE[key] = cls(load_sa_data(file_path), statistic)
+        return _NOISE_CACHE[key]
+
+    def level(self, trace: str = 'y1') -> float:
+        """
+        Nivel de ruido de una traza en watts, según el estadístico elegido
+
+        Parameters:
+        -----------
+        trace : str, optional
+            Traza de la referencia ('y1' por defecto)
+
+        Returns:
+        --------
+        float
+            Potencia de ruido en watts
+        """
+        if trace not in self.trace_names:
+            raise ValueError(f"La referencia de ruido no tiene la traza '{trace}'. Use una de {self.trace_names}")
+        return float(self.stats[self.statistic][self.trace_names.index(trace)])
+
+    def level_dBm(self, trace: str = 'y1') -> float:
+        """Nivel de ruido de una traza en dBm"""
+        return float(10 * np.log10(self.level(trace)) + 30)
+
+    def snr(self, values_dBm: np.ndarray, trace: str = 'y1') -> np.ndarray:
+        """
+        SNR de cada punto: 10·log10((P - N) / N), NaN donde P <= N
+
+        Parameters:
+        -----------
+        values_dBm : np.ndarray
+            Potencias en dBm, de cualquier forma
+        trace : str, optional
+            Traza de la referencia a usar como ruido
+
+        Returns:
+        --------
+        np.ndarray
+            SNR en dB, misma forma que values_dBm
+        """
+        noise = self.level(trace)
+        excess = _dBm_to_watts(values_dBm) - noise
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(excess > 0, 10 * np.log10(excess / noise), np.nan)
+
+    def subtract(self, values_dBm: np.ndarray, min_snr_db: Optional[float] = 3.0,
+                 trace: Union[str, np.ndarray] = 'y1') -> np.ndarray:
+        """
+        Resta el ruido en potencia lineal y enmascara los puntos con SNR baja
+
+        Parameters:
+        -----------
+        values_dBm : np.ndarray
+            Potencias en dBm: un diagrama (n,), un lote (N, n), o las trazas
+            de una medición (n, n_trazas) con trace = array de niveles
+        min_snr_db : Optional[float]
+            SNR mínima en dB; los puntos por debajo quedan en NaN. None solo
+            enmascara los puntos sin potencia por encima del ruido
+        trace : Union[str, np.ndarray]
+            Traza de la referencia a usar como ruido, o niveles de ruido en
+            watts que se difunden contra values_dBm
+
+        Returns:
+        --------
+        np.ndarray
+            Potencias sin ruido en dBm (array nuevo), con NaN en los puntos enmascarados
+        """
+        noise = self.level(trace) if isinstance(trace, str) else np.asarray(trace, dtype=float)
+        excess = _dBm_to_watts(values_dBm) - noise
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            keep = excess > 0
+            if min_snr_db is not None:
+                keep &= excess >= noise * 10 ** (min_snr_db / 10)
+            return np.where(keep, 10 * np.log10(excess) + 30, np.nan)
+
+    def clean_traces(self, sa: SAData, min_snr_db: Optional[float] = 3.0) -> TraceData:
+        """
+        Resta el ruido a todas las trazas de una medición en una sola operación
+
+        Cada traza usa el nivel de ruido de la traza del mismo nombre en la
+        referencia (o el de 'y1' si la referencia no la tiene).
+
+        Parameters:
+        -----------
+        sa : SAData
+            Medición en cualquier unidad convertible a dBm
+        min_snr_db : Optional[float]
+            SNR mínima en dB (ver subtract)
+
+        Returns:
+        --------
+        TraceData
+            x sin cambios (copia) y trazas en dBm, con NaN donde hay ruido
+        """
+        if sa.data is None:
+            raise ValueError("No hay datos disponibles para restar el ruido")
+        names = [key for key in sa.data if key != 'x']
+        levels = np.array([self.level(name if name in self.trace_names else 'y1') for name in names])
+        traces = sa._y_to_dBm(TraceData.stack(sa.data))
+        return TraceData(np.array(sa.data['x']), self.subtract(traces, min_snr_db, levels))
+
+    def apply(self, data: Union[SADataset, SAData], min_snr_db: Optional[float] = 3.0,
+              trace: str = 'y1') -> Union[SADataset, SAData]:
+        """
+        Retorna una copia sin ruido de un SADataset o de un SAData
+
+        Parameters:
+        -----------
+        data : Union[SADataset, SAData]
+            Un dataset en dBm (todas las filas en una operación, con el ruido de
+            `trace`), o una medición (cada traza con el ruido de su misma traza)
+        min_snr_db : Optional[float]
+            SNR mínima en dB (ver subtract)
+        trace : str, optional
+            Traza de la referencia usada para un SADataset
+
+        Returns:
+        --------
+        Union[SADataset, SAData]
+            Copia del mismo tipo, en dBm, con NaN donde hay ruido
+
+        Raises:
+        -------
+        ValueError
+            Si el dataset no está en dBm (los dB normalizados no conservan el
+            nivel absoluto necesario para comparar con el ruido)
+        """
+        if isinstance(data, SADataset):
+            if data.y_unit.upper() != 'DBM':
+                raise ValueError(f"La sustracción de ruido requiere dBm, pero la unidad es '{data.y_unit}'")
+            return data._like(self.subtract(data.values, min_snr_db, trace), 'dBm')
+        cleaned = self.clean_traces(data, min_snr_db)
+        header = dict(data.header_data)
+        header['y-Unit'] = 'dBm'
+        result = SAData.from_arrays(cleaned['x'], TraceData.stack(cleaned), header, file_path=data.file_path)
+        result.history = data.get_history() + [self._history_entry(min_snr_db)]
+        return result
+
+    def _history_entry(self, min_snr_db: Optional[float]) -> Dict:
+        """Entrada de historial de una sustracción con esta referencia"""
+        return {'operation': 'noise_subtraction', 'reference': self.file_path,
+                'statistic': self.statistic, 'min_snr_db': min_snr_db}
+
+    def __repr__(self) -> str:
+        """Representación string del objeto"""
+        levels = ', '.join(f"{name}={self.level_dBm(name):.1f} dBm" for name in self.trace_names)
+        return f"NoiseFloor(statistic='{self.statistic}', {levels}, samples={self.n_samples})"
@@ -6,16 +6,117 @@ import re
 from typing import Dict, List, Tuple, Optional
 import numpy as np
 
+from .compression import open_file
+
+# Motores de parsing disponibles para el bloque de datos
+PARSER_ENGINES = ('numpy', 'python')
+
+
+class TraceData(dict):
+    """
+    Diccionario de datos de medición con todas las trazas en un único array 2D
+
+    Se comporta como el diccionario {'x', 'y1', ..., 'yN'} de siempre, pero las
+    entradas 'yK' son vistas de columnas de `traces`, un array contiguo de forma
+    (n_points, n_traces). Así las operaciones sobre todas las trazas se hacen
+    con una sola operación vectorizada sobre `traces`.
+    """
+
+    def __init__(self, x: np.ndarray, traces: np.ndarray):
+        """
+        Parameters:
+        -----------
+        x : np.ndarray
+            Valores del eje x
+        traces : np.ndarray
+            Array (n_points, n_traces) con una columna por traza
+        """
+        if traces.ndim == 1:
+            traces = traces[:, np.newaxis]
+        names = [f'y{i + 1}' for i in range(traces.shape[1])]
+        views = {name: traces[:, i] for i, name in enumerate(names)}
+        super().__init__(x=x, **views)
+        self.traces = traces
+        self._views = views
+
+    def __reduce__(self):
+        # Reconstruir las vistas al deserializar (p. ej. al volver de un worker)
+        return (TraceData, (self['x'], TraceData.stack(self)))
+
+    @staticmethod
+    def trace_names(data_dict: Dict[str, np.ndarray]) -> List[str]:
+        """
+        Retorna los nombres de traza ('y1', 'y2', ...) ordenados numéricamente
+
+        Parameters:
+        -----------
+        data_dict : Dict[str, np.ndarray]
+            Diccionario de datos
+
+        Returns:
+        --------
+        List[str]
+            Nombres de las trazas presentes en el diccionario
+        """
+        names = [key for key in data_dict if re.fullmatch(r'y\d+', key)]
+        return sorted(names, key=lambda name: int(name[1:]))
+
+    @classmethod
+    def stack(cls, data_dict: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Retorna las trazas de un diccionario de datos como array (n_points, n_traces)
+
+        Si el diccionario es un TraceData cuyas vistas no fueron reemplazadas, se
+        retorna el array interno sin copiar; en otro caso se apilan las columnas.
+
+        Parameters:
+        -----------
+        data_dict : Dict[str, np.ndarray]
+            Diccionario de datos
+
+        Returns:
+        --------
+        np.ndarray
+            Array 2D con una columna por traza
+        """
+        names = cls.trace_names(data_dict)
+        if isinstance(data_dict, TraceData) and len(names) == len(data_dict._views) and \
+                all(data_dict[name] is data_dict._views.get(name) for name in names):
+            return data_dict.traces
+        return np.column_stack([data_dict[name] for name in names])
+
+
+
 class ParserMixin:
     """
     Mixin para funcionalidad de parsing de archivos .DAT de analizadores de espectro
+
+    El bloque de datos se parsea por defecto con NumPy en una sola llamada
+    (motor 'numpy'). Si el bloque está mal formado se recurre al parser
+    línea por línea (motor 'python'), que descarta las filas inválidas.
+
+    Los archivos comprimidos (gzip, xz, bz2) se detectan por extensión o por
+    magic bytes y se descomprimen en streaming.
     """
 
+    __slots__ = ()
+
+    # Motor usado por _parse_data ('numpy' o 'python')
+    parser_engine: str = 'numpy'
+
+    # Tipo de almacenamiento de las trazas (None conserva float64; x siempre es float64)
+    trace_dtype: Optional[np.dtype] = None
+
+    def _to_trace_dtype(self, traces: np.ndarray) -> np.ndarray:
+        """Convierte las trazas al tipo de almacenamiento configurado, si hay uno"""
+        if self.trace_dtype is None:
+            return traces
+        return traces.astype(self.trace_dtype, copy=False)
 
     def _parse_file(self) -> None:
         """Parsear el archivo completo y extraer header y datos"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
+            with open_file(self.file_path, 'rt', encoding='utf-8') as file:
                 lines = file.readlines()
 
             # Encontrar la línea que separa header de datos
@@ -30,6 +131,44 @@ class ParserMixin:
         except Exception as e:
             raise ValueError(f"Error al parsear el archivo {self.file_path}: {str(e)}")
 
+    def _parse_header_only(self) -> None:
+        """
+        Parsea solo el header y registra la posición donde comienzan los datos
+
+        Lee el archivo línea por línea hasta encontrar la primera línea de datos,
+        sin tocar el bloque numérico. Los datos se cargan luego con _load_data().
+        """
+        try:
+            header_lines = []
+            with open_file(self.file_path, 'rb') as file:
+                while True:
+                    offset = file.tell()
+                    raw_line = file.readline()
+                    if not raw_line:
+                        raise ValueError("No se encontraron datos en el archivo")
+                    line = raw_line.decode('utf-8')
+                    if self._is_data_line(line):
+                        break
+                    header_lines.append(line)
+
+            self._parse_header(header_lines)
+            self._data_offset = offset
+
+        except Exception as e:
+            raise ValueError(f"Error al parsear el header del archivo {self.file_path}: {str(e)}")
+
+    def _load_data(self) -> None:
+        """Carga el bloque de datos desde la posición registrada por _parse_header_only"""
+        try:
+            with open_file(self.file_path, 'rb') as file:
+                file.seek(self._data_offset)
+                data_lines = file.read().decode('utf-8').splitlines()
+
+            self._parse_data(data_lines)
+
+        except Exception as e:
+            raise ValueError(f"Error al cargar los datos del archivo {self.file_path}: {str(e)}")
+
     def _find_data_start(self, lines: List[str]) -> int:
         """
         Encuentra el índice donde comienzan los datos numéricos
@@ -110,34 +249,131 @@ class ParserMixin:
 
     def _parse_data(self, data_lines: List[str]) -> None:
         """
-        Extrae y almacena los datos de medición
+        Extrae y almacena los datos de medición usando el motor configurado
+
+        Se conservan todas las columnas de trazas (y1...yN) en un único array 2D.
+
+        Parameters:
+        -----------
+        data_lines : List[str]
+            Líneas de datos a parsear
+        """
+        x_values, traces = self._parse_columns(data_lines)
+        self.data = TraceData(x_values, self._to_trace_dtype(traces))
+
+    def _parse_columns(self, data_lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convierte líneas de datos en el array x y el array de trazas usando el motor configurado
+
+        Parameters:
+        -----------
+        data_lines : List[str]
+            Líneas de datos a parsear
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            Array x y array (n_points, n_traces) con las columnas y1...yN
+
+        Raises:
+        -------
+        ValueError
+            Si el motor configurado no existe
+        """
+        if self.parser_engine not in PARSER_ENGINES:
+            raise ValueError(f"Motor de parsing '{self.parser_engine}' no válido. Use uno de {PARSER_ENGINES}")
+
+        if self.parser_engine == 'numpy':
+            try:
+                return self._parse_data_numpy(data_lines)
+            except (ValueError, IndexError):
+                # Bloque mal formado: usar el parser línea por línea
+                pass
+
+        return self._parse_data_python(data_lines)
+
+    @staticmethod
+    def _count_columns(line: str) -> int:
+        """Cuenta las columnas de una línea de datos, ignorando un ';' final"""
+        return len(line.strip().rstrip(';').split(';'))
+
+    def _parse_data_numpy(self, data_lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Parsea el bloque de datos completo con una sola llamada a NumPy
 
         Parameters:
         -----------
         data_lines : List[str]
             Líneas de datos a parsear
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            Array x y array (n_points, n_traces)
+
+        Raises:
+        -------
+        ValueError
+            Si alguna fila no tiene todas las columnas numéricas de la primera
+        """
+        n_columns = self._count_columns(data_lines[0])
+        if n_columns < 2:
+            raise ValueError("La primera línea de datos tiene menos de dos columnas")
+
+        # np.loadtxt ignora líneas vacías; cualquier fila inválida lanza ValueError
+        table = np.loadtxt(data_lines, delimiter=';', usecols=range(n_columns), ndmin=2)
+
+        return np.ascontiguousarray(table[:, 0]), np.ascontiguousarray(table[:, 1:])
+
+    def _parse_data_python(self, data_lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Parsea los datos línea por línea, descartando las filas inválidas
+
+        Las filas sin x o y1 válidos se descartan. El número de trazas se toma de
+        la primera fila válida; las trazas faltantes o inválidas de otras filas
+        quedan como NaN.
+
+        Parameters:
+        -----------
+        data_lines : List[str]
+            Líneas de datos a parsear
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            Array x y array (n_points, n_traces)
         """
         x_values = []
-        y1_values = []
+        trace_rows = []
+        n_traces = None
 
         for line in data_lines:
-            line = line.strip()
+            line = line.strip().rstrip(';')
             if line and ';' in line:
                 parts = line.split(';')
 
-                # Extraer las primeras dos columnas (solo x e y1)
+                # x e y1 son obligatorios
                 try:
                     x_val = float(parts[0])
                     y1_val = float(parts[1])
-                    x_values.append(x_val)
-                    y1_values.append(y1_val)
-
                 except (ValueError, IndexError):
                     # Saltar líneas que no se pueden convertir a números
                     continue
 
-        # Convertir a arrays de NumPy - solo almacenamos x e y1
-        self.data = {
-            'x': np.array(x_values),
-            'y1': np.array(y1_values)
-        }
+                if n_traces is None:
+                    n_traces = len(parts) - 1
+
+                row = [y1_val]
+                for part in parts[2:n_traces + 1]:
+                    try:
+                        row.append(float(part))
+                    except ValueError:
+                        row.append(np.nan)
+                row.extend([np.nan] * (n_traces - len(row)))
+
+                x_values.append(x_val)
+                trace_rows.append(row)
+
+        # Convertir a arrays de NumPy
+        traces = np.array(trace_rows, dtype=float).reshape(len(trace_rows), n_traces or 1)
+        return np.array(x_values), traces
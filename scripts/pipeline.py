@@ -0,0 +1,327 @@
+# pipeline.py - Cadena diferida de operaciones de preprocesado
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+Cadena diferida de recorte, espejado y normalización para SAData.
+
+Las operaciones solo se registran al encadenarlas; al ejecutar la cadena los
+recortes y el espejado se aplican como slices (vistas, sin copiar) y las
+conversiones de escala se acumulan, de modo que se asigna memoria una sola vez
+para el resultado final. La misma cadena se puede aplicar a varios archivos:
+
+    receta = Pipeline().crop(start_index=41, end_index=1946).mirror()
+    for sa in mediciones:
+        receta.apply(sa)
+        sa.save_processed_data('./mediciones/Procesadas')
+
+A diferencia de llamar crop_data() y luego mirror_data() (que siempre parten
+de los datos originales), cada etapa opera sobre el resultado de la anterior.
+
+El espejado también puede decidirse al ejecutar, comparando contra un patrón
+de referencia, para procesar lotes con capturas giradas en ambos sentidos:
+
+    receta = Pipeline().crop(start_index=41, end_index=1946).auto_mirror(medicion_1)
+"""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from .parser_mixin import TraceData
+from .processing_mixin import ProcessingMixin, _mirror_scores, _reference_trace, _values_in_db
+
+
+class Pipeline:
+    """
+    Cadena diferida de operaciones sobre los datos de un SAData
+
+    Cada método de etapa (crop, mirror, to_dBm, to_db) registra la operación y
+    retorna la misma cadena, para poder encadenarlas.
+    """
+
+    def __init__(self, source=None):
+        """
+        Parameters:
+        -----------
+        source : Optional[SAData]
+            Objeto por defecto sobre el que se ejecuta la cadena (ver SAData.pipeline)
+        """
+        self.source = source
+        self._stages: List[Dict] = []
+
+    def crop(self, start_index: Optional[int] = None, end_index: Optional[int] = None,
+             start_value: Optional[float] = None, end_value: Optional[float] = None) -> 'Pipeline':
+        """
+        Agrega un recorte por índices o por valores de x (mismos argumentos que crop_data)
+
+        Los índices se interpretan sobre el resultado de la etapa anterior.
+
+        Returns:
+        --------
+        Pipeline
+            La misma cadena
+        """
+        if (start_index is None or end_index is None) and (start_value is None or end_value is None):
+            raise ValueError("Debe proporcionar start_index y end_index, o start_value y end_value")
+        self._stages.append({'operation': 'crop', 'start_index': start_index, 'end_index': end_index,
+                             'start_value': start_value, 'end_value': end_value})
+        return self
+
+    def mirror(self) -> 'Pipeline':
+        """
+        Agrega un espejado de las trazas (el eje x se mantiene, como en mirror_data)
+
+        Returns:
+        --------
+        Pipeline
+            La misma cadena
+        """
+        self._stages.append({'operation': 'mirror'})
+        return self
+
+    def auto_mirror(self, reference, trace: str = 'y1', n_points: int = 360) -> 'Pipeline':
+        """
+        Agrega un espejado condicional: se aplica solo si la ventana vigente está
+        girada en sentido inverso al de la referencia (ver detect_mirror)
+
+        La decisión se toma al ejecutar la cadena, sobre el resultado de la
+        etapa anterior (por ejemplo, después del recorte).
+
+        Parameters:
+        -----------
+        reference : Union[SAData, np.ndarray]
+            Patrón de referencia: una medición previa, la simulación de la misma
+            frecuencia, o un array en dB de una vuelta
+        trace : str, optional
+            Traza a comparar
+        n_points : int, optional
+            Puntos de la grilla angular común para la comparación
+
+        Returns:
+        --------
+        Pipeline
+            La misma cadena
+        """
+        if hasattr(reference, 'header_data'):
+            description = reference.file_path or 'SAData'
+        else:
+            description = f"array de {len(reference)} puntos"
+        # El patrón queda en un campo privado: las etapas públicas (y el
+        # historial) solo guardan la descripción, serializable a JSON
+        self._stages.append({'operation': 'auto_mirror', 'reference': description,
+                             'trace': trace, 'grid_points': n_points,
+                             '_pattern': _reference_trace(reference, trace)})
+        return self
+
+    def to_dBm(self) -> 'Pipeline':
+        """
+        Agrega la conversión a dBm según la unidad del header (como convert_to_dBm)
+
+        Returns:
+        --------
+        Pipeline
+            La misma cadena
+        """
+        if any(stage['operation'] in ('to_dBm', 'to_db') for stage in self._stages):
+            raise ValueError("La conversión a dBm debe ir antes de cualquier otra conversión")
+        self._stages.append({'operation': 'to_dBm'})
+        return self
+
+    def to_db(self) -> 'Pipeline':
+        """
+        Agrega la normalización P - max(P) de cada traza (como convert_to_db)
+
+        El máximo se toma sobre la ventana vigente en esta etapa.
+
+        Returns:
+        --------
+        Pipeline
+            La misma cadena
+        """
+        self._stages.append({'operation': 'to_db'})
+        return self
+
+    @property
+    def stages(self) -> List[Dict]:
+        """Etapas registradas, en orden (copias: modificarlas no altera la cadena)"""
+        return [self._public(stage) for stage in self._stages]
+
+    @staticmethod
+    def _public(stage: Dict) -> Dict:
+        """Copia de una etapa sin los campos privados (los que empiezan con '_')"""
+        return {key: value for key, value in stage.items() if not key.startswith('_')}
+
+    def _source(self, sa):
+        """Retorna el objeto sobre el que ejecutar, o lanza ValueError si no hay datos"""
+        sa = self.source if sa is None else sa
+        if sa is None or sa.data is None:
+            raise ValueError("No hay datos disponibles para ejecutar la cadena")
+        return sa
+
+    def _walk(self, sa):
+        """
+        Recorre las etapas sobre vistas de los datos, sin copiar
+
+        Yields:
+        -------
+        Tuple[Dict, np.ndarray, np.ndarray, bool, Optional[np.ndarray]]
+            (etapa pública, con la decisión 'mirror' en las etapas auto_mirror;
+            vista de x, vista de trazas, si hay conversión a dBm pendiente,
+            offset por traza de la normalización a dB o None)
+        """
+        x_data = sa.data['x']
+        traces = TraceData.stack(sa.data)
+        in_dBm = False
+        offset = None
+
+        for stage in self._stages:
+            operation = stage['operation']
+            if operation == 'crop':
+                start_idx, end_idx = ProcessingMixin._crop_indices(
+                    x_data, stage['start_index'], stage['end_index'],
+                    stage['start_value'], stage['end_value'])
+                x_data = x_data[start_idx:end_idx]
+                traces = traces[start_idx:end_idx]
+            elif operation == 'mirror':
+                traces = traces[::-1]
+            elif operation == 'auto_mirror':
+                column = int(stage['trace'][1:]) - 1
+                scores = _mirror_scores([_values_in_db(sa, traces[:, column])],
+                                        stage['_pattern'], stage['grid_points'])
+                mirror = bool(scores['reversed'][0] > scores['direct'][0])
+                if mirror:
+                    traces = traces[::-1]
+                stage = dict(stage, mirror=mirror)
+            elif operation == 'to_dBm':
+                in_dBm = True
+            elif operation == 'to_db':
+                # Las conversiones son monótonas: el máximo convertido es la
+                # conversión del máximo, sin convertir la ventana completa
+                peak = np.max(traces, axis=0)
+                if in_dBm:
+                    peak = sa._y_to_dBm(peak)
+                if offset is not None:
+                    peak = peak - offset
+                offset = peak if offset is None else offset + peak
+            yield self._public(stage), x_data, traces, in_dBm, offset
+
+    def run(self, sa=None) -> TraceData:
+        """
+        Ejecuta la cadena y retorna el resultado, asignando memoria una sola vez
+
+        Parameters:
+        -----------
+        sa : Optional[SAData]
+            Objeto sobre el que ejecutar (default: el de la cadena)
+
+        Returns:
+        --------
+        TraceData
+            Datos resultantes con x y todas las trazas (arrays nuevos y contiguos)
+
+        Raises:
+        -------
+        ValueError
+            Si no hay datos disponibles
+        """
+        return self._execute(self._source(sa))[0]
+
+    def _execute(self, sa) -> Tuple[TraceData, List[Dict]]:
+        """
+        Ejecuta la cadena sobre sa
+
+        Returns:
+        --------
+        Tuple[TraceData, List[Dict]]
+            (datos resultantes, etapas ejecutadas con las decisiones tomadas)
+        """
+        x_data = sa.data['x']
+        traces = TraceData.stack(sa.data)
+        in_dBm = False
+        offset = None
+        executed = []
+        for stage, x_data, traces, in_dBm, offset in self._walk(sa):
+            executed.append(stage)
+
+        # Única asignación: la conversión, la resta o la copia producen el array final
+        if in_dBm:
+            values = sa._y_to_dBm(traces)
+            if offset is not None:
+                values -= offset
+        elif offset is not None:
+            values = traces - offset
+        else:
+            values = np.array(traces)
+
+        return TraceData(np.array(x_data), np.ascontiguousarray(values)), executed
+
+    def apply(self, sa=None, in_place: bool = False) -> TraceData:
+        """
+        Ejecuta la cadena y guarda el resultado en el objeto, como crop_data/mirror_data
+
+        Las conversiones de escala no modifican el header: las unidades de
+        salida siguen siendo las del archivo original. El historial registra
+        las etapas ejecutadas, con la decisión tomada por cada auto_mirror.
+
+        Parameters:
+        -----------
+        sa : Optional[SAData]
+            Objeto sobre el que ejecutar (default: el de la cadena)
+        in_place : bool, optional
+            Si es True, reemplaza los datos originales; si es False, guarda el
+            resultado en processed_data
+
+        Returns:
+        --------
+        TraceData
+            Datos resultantes
+        """
+        sa = self._source(sa)
+        result, executed = self._execute(sa)
+        sa.history.append({'operation': 'pipeline', 'stages': executed, 'in_place': in_place})
+
+        if in_place:
+            sa.data = result
+            sa.n_points = len(result['x'])
+        else:
+            sa.processed_data = result
+        return result
+
+    def inspect(self, sa=None) -> List[Dict]:
+        """
+        Retorna el estado después de cada etapa, para depuración
+
+        No asigna memoria para los datos: 'x' y 'traces' son vistas de solo
+        lectura de la ventana vigente, antes de aplicar las conversiones pendientes.
+
+        Parameters:
+        -----------
+        sa : Optional[SAData]
+            Objeto sobre el que ejecutar (default: el de la cadena)
+
+        Returns:
+        --------
+        List[Dict]
+            Por etapa: la etapa, 'n_points', 'x' y 'traces' (vistas), 'scale'
+            ('raw', 'dBm') y 'offset' (referencia de la normalización a dB o None).
+            Las etapas auto_mirror incluyen además la decisión tomada ('mirror')
+        """
+        sa = self._source(sa)
+        states = []
+        for stage, x_data, traces, in_dBm, offset in self._walk(sa):
+            x_view = x_data.view()
+            traces_view = traces.view()
+            x_view.flags.writeable = False
+            traces_view.flags.writeable = False
+            states.append(dict(stage, n_points=len(x_view), x=x_view, traces=traces_view,
+                               scale='dBm' if in_dBm else 'raw',
+                               offset=None if offset is None else offset.copy()))
+        return states
+
+    def __len__(self) -> int:
+        return len(self._stages)
+
+    def __repr__(self) -> str:
+        """Representación string del objeto"""
+        steps = ' -> '.join(stage['operation'] for stage in self._stages) or 'vacía'
+        return f"Pipeline({steps})"
@@ -18,6 +18,8 @@ class PlotMixin:
     - Polar representation
     """
 
+    __slots__ = ()
+
     def plot_time(self, mag: Literal['dB', 'dBm'] = 'dB', y_limits: Optional[Tuple[float, float]] = None, savefig: str = '', legend: bool = False, **kwargs):
         """
         Plot data in the time domain.
@@ -37,13 +39,13 @@ class PlotMixin:
 
         """
         # Get x-axis data (time)
-        x_data = self.get_x_data()
+        x_data = self.get_x_data(copy=False)
 
         # Get y-axis data and convert to specified unit
         if mag == 'dB':
-            y_data = self.convert_to_db()
+            y_data = self.convert_to_db(copy=False)
         elif mag == 'dBm':
-            y_data = self.convert_to_dBm()
+            y_data = self.convert_to_dBm(copy=False)
         else:
             raise ValueError(f"Invalid magnitude unit: {mag}. Use 'dB' or 'dBm'")
 
@@ -139,13 +141,13 @@ class PlotMixin:
 
         """
         # Get x-axis data converted to degrees
-        x_data = self.convert_to_degree(min_deg, max_deg)
+        x_data = self.convert_to_degree(min_deg, max_deg, copy=False)
 
         # Get y-axis data and convert to specified unit
         if mag == 'dB':
-            y_data = self.convert_to_db()
+            y_data = self.convert_to_db(copy=False)
         elif mag == 'dBm':
-            y_data = self.convert_to_dBm()
+            y_data = self.convert_to_dBm(copy=False)
         else:
             raise ValueError(f"Invalid magnitude unit: {mag}. Use 'dB' or 'dBm'")
 
@@ -269,14 +271,14 @@ class PlotMixin:
         """
         # Get magnitude data and convert to specified unit
         if mag == 'dB':
-            magnitude_data = self.convert_to_db()
+            magnitude_data = self.convert_to_db(copy=False)
         elif mag == 'dBm':
-            magnitude_data = self.convert_to_dBm()
+            magnitude_data = self.convert_to_dBm(copy=False)
         else:
             raise ValueError(f"Invalid magnitude unit: {mag}. Use 'dB' or 'dBm'")
 
         # Get angular data in radians
-        angle_data = self.convert_to_polar()
+        angle_data = self.convert_to_polar(copy=False)
 
         # Create figure and polar axes
         fig_kwargs = {'figsize': (8, 8), 'subplot_kw': {'projection': 'polar'}}
@@ -392,13 +394,13 @@ class PlotMixin:
         - The method handles circular data (0-360°) correctly
         """
         # Get magnitude data in dB (normalized)
-        magnitude_data = self.convert_to_db()
+        magnitude_data = self.convert_to_db(copy=False)
 
         # Get angular data
         if plot_type == 'polar':
-            angle_data = self.convert_to_polar()
+            angle_data = self.convert_to_polar(copy=False)
         else:  # cartesian plot
-            angle_data = self.convert_to_degree()
+            angle_data = self.convert_to_degree(copy=False)
 
         # Find maximum directivity point (should be 0 dB for normalized data)
         max_idx = np.argmax(magnitude_data)
@@ -557,14 +559,14 @@ class PlotMixin:
         - Returns maximum sidelobe level
         """
         # Get magnitude data in dB (normalized)
-        magnitude_data = self.convert_to_db()
+        magnitude_data = self.convert_to_db(copy=False)
 
         # Get angular data
         if plot_type == 'polar':
-            angle_data = self.convert_to_polar()
+            angle_data = self.convert_to_polar(copy=False)
             angles_deg = np.rad2deg(angle_data)
         else:  # cartesian plot
-            angles_deg = self.convert_to_degree()
+            angles_deg = self.convert_to_degree(copy=False)
             angle_data = np.deg2rad(angles_deg)
 
         # Find maximum directivity point (should be 0 dB for normalized data)
@@ -754,11 +756,11 @@ class PlotMixin:
             Dictionary with calculated crop indices {'start_index': int, 'end_index': int}
         """
         # Get original data
-        x_data = self.get_x_data()
+        x_data = self.get_x_data(copy=False)
         if mag == 'dB':
-            y_data = self.convert_to_db()
+            y_data = self.convert_to_db(copy=False)
         elif mag == 'dBm':
-            y_data = self.convert_to_dBm()
+            y_data = self.convert_to_dBm(copy=False)
         else:
             raise ValueError(f"Invalid magnitude unit: {mag}. Use 'dB' or 'dBm'")
 
@@ -769,20 +771,8 @@ class PlotMixin:
         right_y = y_data[mid_point:]   # Segunda mitad como derecha visual (espejada)
         left_y = y_data[:mid_point]    # Primera mitad como izquierda visual
 
-        # Calculate crop indices based on angular shifts
-        # right_shift_deg applies to visual left (original right data)
-        # left_shift_deg applies to visual right (original left data)
-        total_points = n_points
-
-        # Calculate number of points to crop from each side
-        left_crop_points = int((right_shift_deg / 360.0) * len(right_y))
-        right_crop_points = int((left_shift_deg / 360.0) * len(left_y))
-
-        # Calculate crop indices for the original data
-        # start_index: crop from beginning (visual right side)
-        start_index = right_crop_points
-        # end_index: crop from end (visual left side)
-        end_index = total_points - left_crop_points
+        # Crop indices from the angular shifts (same math as the headless helper)
+        crop_info = self.superposition_crop(left_shift_deg, right_shift_deg)
 
         # Calculate shift factors from degrees (invertir para coincidir con visualización)
         # Positive shift means the side is "too far", so we need to move it inward
@@ -837,9 +827,4 @@ class PlotMixin:
         plt.tight_layout()
 
         # Return crop indices for use with crop_data
-        crop_info = {
-            'start_index': start_index,
-            'end_index': end_index
-        }
-
         return crop_info
@@ -6,6 +6,244 @@ from typing import Dict, List, Tuple, Optional
 import numpy as np
 import os
 
+from .compression import COMPRESSION_EXTENSIONS, open_file, split_compression_extension
+from .parser_mixin import TraceData
+from .resampling import AngularResampler
+
+CROP_ALIGNMENTS = ('center', 'start', 'end')
+
+# Puntos mínimos superpuestos para que la correlación de un desplazamiento tenga sentido
+MIN_OVERLAP_POINTS = 8
+
+
+def _values_in_db(sa, values: np.ndarray) -> np.ndarray:
+    """Valores de sa en escala logarítmica: tal cual si ya están en dB (dBm, dBi, ...), si no en dBm"""
+    values = np.asarray(values, dtype=float)
+    if sa.header_data.get('y-Unit', '').upper().startswith('DB'):
+        return values
+    return sa._y_to_dBm(values)
+
+
+def _trace_in_db(sa, trace: str) -> np.ndarray:
+    """Traza de sa en escala logarítmica (ver _values_in_db)"""
+    return _values_in_db(sa, sa.data[trace])
+
+
+def _overlap_correlation(block: np.ndarray, lags: np.ndarray) -> np.ndarray:
+    """
+    Correlación de Pearson entre y[:n - L] e y[L:] para cada desplazamiento L
+
+    Parameters:
+    -----------
+    block : np.ndarray
+        Trazas (N, n) de igual largo
+    lags : np.ndarray
+        Desplazamientos L a evaluar (0 < L < n)
+
+    Returns:
+    --------
+    np.ndarray
+        Correlaciones (N, len(lags))
+    """
+    n_points = block.shape[1]
+    centered = block - block.mean(axis=1, keepdims=True)
+
+    # Productos cruzados de todos los desplazamientos con una FFT: el relleno a
+    # 2n hace que la correlación circular coincida con la lineal
+    n_fft = 2 * n_points
+    spectrum = np.fft.rfft(centered, n=n_fft, axis=1)
+    cross = np.fft.irfft(np.conj(spectrum) * spectrum, n=n_fft, axis=1)[:, lags]
+
+    # Sumas de cada segmento por sumas acumuladas
+    zeros = np.zeros((len(block), 1))
+    sums = np.concatenate((zeros, np.cumsum(centered, axis=1)), axis=1)
+    squares = np.concatenate((zeros, np.cumsum(centered ** 2, axis=1)), axis=1)
+    overlap = n_points - lags
+    head_sum = sums[:, overlap]
+    tail_sum = sums[:, -1:] - sums[:, lags]
+    head_var = squares[:, overlap] - head_sum ** 2 / overlap
+    tail_var = squares[:, -1:] - squares[:, lags] - tail_sum ** 2 / overlap
+
+    covariance = cross - head_sum * tail_sum / overlap
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlation = covariance / np.sqrt(head_var * tail_var)
+    return np.nan_to_num(correlation, nan=0.0)
+
+
+def _estimate_crops(block: np.ndarray, span_deg: float, tolerance_deg: float,
+                    align: str) -> Tuple[List[Dict[str, int]], np.ndarray]:
+    """
+    Estima el recorte a una vuelta de un bloque (N, n) de trazas en dBm
+
+    Returns:
+    --------
+    Tuple[List[Dict[str, int]], np.ndarray]
+        (índices de recorte por traza, confianza por traza)
+    """
+    if align not in CROP_ALIGNMENTS:
+        raise ValueError(f"Alineación '{align}' no válida. Use una de {CROP_ALIGNMENTS}")
+    if tolerance_deg < 0 or span_deg - tolerance_deg <= 0:
+        raise ValueError("El recorrido nominal debe ser mayor que su tolerancia")
+
+    n_points = block.shape[1]
+    # Una vuelta son 360 / (span / (n - 1)) muestras según el recorrido real
+    shortest = int(np.floor(360.0 * (n_points - 1) / (span_deg + tolerance_deg)))
+    longest = int(np.ceil(360.0 * (n_points - 1) / (span_deg - tolerance_deg)))
+    lags = np.arange(max(shortest, 1), min(longest, n_points - MIN_OVERLAP_POINTS) + 1)
+    if len(lags) == 0:
+        raise ValueError(f"Una traza de {n_points} puntos no alcanza para buscar una vuelta "
+                         f"con recorrido {span_deg}±{tolerance_deg}°")
+
+    correlation = _overlap_correlation(block, lags)
+    best = np.argmax(correlation, axis=1)
+    periods = lags[best]
+
+    crops = []
+    for period in periods:
+        surplus = n_points - 1 - int(period)
+        if align == 'center':
+            start_index = surplus // 2
+        elif align == 'start':
+            start_index = 0
+        else:
+            start_index = surplus
+        crops.append({'start_index': start_index, 'end_index': start_index + int(period) + 1})
+    confidence = np.clip(correlation[np.arange(len(block)), best], 0.0, 1.0)
+    return crops, confidence
+
+
+def estimate_crops(measurements, trace: str = 'y1', span_deg: float = 380.0, tolerance_deg: float = 30.0,
+                   align: str = 'center') -> List[Tuple[Dict[str, int], float]]:
+    """
+    Estima el recorte de la superposición de un lote de mediciones (ver
+    ProcessingMixin.estimate_crop)
+
+    Las mediciones de igual largo se procesan juntas en una sola FFT por lote.
+
+    Parameters:
+    -----------
+    measurements : Sequence[SAData]
+        Mediciones sin recortar
+    trace, span_deg, tolerance_deg, align
+        Como en ProcessingMixin.estimate_crop
+
+    Returns:
+    --------
+    List[Tuple[Dict[str, int], float]]
+        (índices para crop_data, confianza) por medición, en el mismo orden
+    """
+    rows_by_length: Dict[int, List[int]] = {}
+    traces = []
+    for row, sa in enumerate(measurements):
+        if sa.data is None:
+            raise ValueError("No hay datos disponibles para recortar")
+        traces.append(_trace_in_db(sa, trace))
+        rows_by_length.setdefault(len(traces[-1]), []).append(row)
+
+    results: List[Optional[Tuple[Dict[str, int], float]]] = [None] * len(traces)
+    for rows in rows_by_length.values():
+        crops, confidence = _estimate_crops(np.vstack([traces[row] for row in rows]),
+                                            span_deg, tolerance_deg, align)
+        for row, crop, score in zip(rows, crops, confidence):
+            results[row] = (crop, float(score))
+    return results
+
+
+def _reference_trace(reference, trace: str = 'y1') -> np.ndarray:
+    """Patrón de referencia en dB: un SAData (se usa su traza) o un array de una vuelta"""
+    if hasattr(reference, 'header_data'):
+        if reference.data is None:
+            raise ValueError("La referencia no tiene datos")
+        return _trace_in_db(reference, trace)
+    return np.asarray(reference, dtype=float)
+
+
+def _mirror_scores(traces, reference: np.ndarray, n_points: int) -> Dict[str, np.ndarray]:
+    """
+    Correlación circular de cada traza contra la referencia y contra la referencia invertida
+
+    Todas las trazas y la referencia se remuestrean a n_points ángulos de una
+    vuelta, se normalizan (media cero, norma uno) y se correlacionan por FFT
+    para todos los giros relativos a la vez.
+
+    Parameters:
+    -----------
+    traces : Sequence[np.ndarray]
+        Trazas en dB de una vuelta cada una (pueden tener largos distintos)
+    reference : np.ndarray
+        Patrón de referencia en dB de una vuelta
+    n_points : int
+        Puntos de la grilla común
+
+    Returns:
+    --------
+    Dict[str, np.ndarray]
+        'direct' y 'reversed': máxima correlación por traza en cada sentido;
+        'shift_deg': giro de la referencia que maximiza la correlación del
+        sentido elegido
+    """
+    resampler = AngularResampler(angles=np.arange(n_points) * (360.0 / n_points))
+    block = resampler.resample(list(traces))
+    pattern = resampler.resample(reference)
+    block = np.vstack((pattern, pattern[::-1], block))
+
+    block -= block.mean(axis=1, keepdims=True)
+    norm = np.linalg.norm(block, axis=1, keepdims=True)
+    block = np.divide(block, norm, out=np.zeros_like(block), where=norm > 0)
+
+    # Una FFT para todo el bloque; la correlación circular es irfft(C * conj(R))
+    spectrum = np.fft.rfft(block, axis=1)
+    captures = spectrum[2:]
+    direct = np.fft.irfft(captures * np.conj(spectrum[0]), n=n_points, axis=1)
+    reverse = np.fft.irfft(captures * np.conj(spectrum[1]), n=n_points, axis=1)
+
+    direct_score = direct.max(axis=1)
+    reversed_score = reverse.max(axis=1)
+    shift = np.where(reversed_score > direct_score, reverse.argmax(axis=1), direct.argmax(axis=1))
+    return {'direct': direct_score, 'reversed': reversed_score, 'shift_deg': shift * (360.0 / n_points)}
+
+
+def _direction_results(scores: Dict[str, np.ndarray]) -> List[Dict]:
+    """Arma el resultado de detect_mirror por traza a partir de _mirror_scores"""
+    return [{'mirror': bool(reverse > direct),
+             'confidence': float(abs(reverse - direct)),
+             'direct_score': float(direct),
+             'reversed_score': float(reverse),
+             'shift_deg': float(shift)}
+            for direct, reverse, shift in zip(scores['direct'], scores['reversed'], scores['shift_deg'])]
+
+
+def detect_mirrors(measurements, reference, trace: str = 'y1', n_points: int = 360) -> List[Dict]:
+    """
+    Detecta el sentido de giro de un lote de mediciones (ver ProcessingMixin.detect_mirror)
+
+    Todas las mediciones se comparan contra la referencia en una sola pasada vectorizada.
+
+    Parameters:
+    -----------
+    measurements : Sequence[SAData]
+        Mediciones de una vuelta (idealmente ya recortadas)
+    reference : Union[SAData, np.ndarray]
+        Patrón de referencia: una medición previa, la simulación de la misma
+        frecuencia, o un array en dB de una vuelta
+    trace, n_points
+        Como en ProcessingMixin.detect_mirror
+
+    Returns:
+    --------
+    List[Dict]
+        Resultado de la detección por medición, en el mismo orden
+    """
+    traces = []
+    for sa in measurements:
+        if sa.data is None:
+            raise ValueError("No hay datos disponibles para detectar el sentido de giro")
+        traces.append(_trace_in_db(sa, trace))
+    if not traces:
+        return []
+    return _direction_results(_mirror_scores(traces, _reference_trace(reference, trace), n_points))
+
+
 class ProcessingMixin:
     """
     Mixin para funcionalidad de procesamiento de datos de archivos .DAT de analizadores de espectro
@@ -16,10 +254,13 @@ class ProcessingMixin:
     - Preparar archivos para guardado
     """
 
+    __slots__ = ()
+
     def __init__(self):
         """Inicializa variables de procesamiento"""
         self.processed_data: Optional[Dict[str, np.ndarray]] = None
         self.output_filename: Optional[str] = None
+        self.history: List[Dict] = []
 
     def set_output_filename(self, filename: str) -> None:
         """
@@ -28,11 +269,13 @@ class ProcessingMixin:
         Parameters:
         -----------
         filename : str
-            Nombre del archivo de salida (sin extensión o con extensión .DAT)
+            Nombre del archivo de salida (sin extensión o con extensión .DAT).
+            Puede terminar en .gz, .xz o .bz2 para guardar comprimido (p. ej. 'x.DAT.gz')
         """
-        if not filename.endswith('.DAT'):
-            filename += '.DAT'
-        self.output_filename = filename
+        base, compression_extension = split_compression_extension(filename)
+        if not base.endswith('.DAT'):
+            base += '.DAT'
+        self.output_filename = base + compression_extension
 
     def get_output_filename(self) -> Optional[str]:
         """
@@ -47,7 +290,7 @@ class ProcessingMixin:
 
     def mirror_data(self, in_place: bool = False) -> Dict[str, np.ndarray]:
         """
-        Espeja los datos invirtiendo solo los valores de y1 (potencia)
+        Espeja los datos invirtiendo solo los valores de las trazas (potencia)
 
         Útil para corregir el sentido de la tornamesa cuando se giró en direcciones opuestas.
         Mantiene el eje x (tiempo) intacto para preservar la cronología.
@@ -65,10 +308,12 @@ class ProcessingMixin:
         if self.data is None:
             raise ValueError("No hay datos disponibles para espejar")
 
-        mirrored_data = {
-            'x': self.data['x'].copy(),  # Mantener tiempo en orden cronológico
-            'y1': self.data['y1'][::-1].copy()  # Solo invertir valores de potencia
-        }
+        # Mantener tiempo en orden cronológico y solo invertir valores de potencia,
+        # todas las trazas en una sola operación
+        mirrored_data = TraceData(self.data['x'].copy(),
+                                  TraceData.stack(self.data)[::-1].copy())
+
+        self.history.append({'operation': 'mirror', 'in_place': in_place})
 
         if in_place:
             self.data = mirrored_data
@@ -77,6 +322,52 @@ class ProcessingMixin:
             self.processed_data = mirrored_data
             return mirrored_data
 
+    def subtract_noise(self, noise, min_snr_db: Optional[float] = 3.0,
+                       in_place: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Resta el piso de ruido en potencia lineal y enmascara los puntos con SNR baja
+
+        El resultado queda en dBm, con NaN en los puntos enmascarados. Con
+        in_place=True el header pasa a 'dBm'. Con in_place=False el header no
+        cambia, así que los datos deben estar ya en dBm (para que
+        save_processed_data escriba la unidad correcta); para otras unidades
+        use in_place=True o NoiseFloor.apply, que retorna un SAData nuevo.
+
+        Parameters:
+        -----------
+        noise : NoiseFloor
+            Referencia de ruido (ver scripts.noise)
+        min_snr_db : Optional[float]
+            SNR mínima en dB; None solo enmascara los puntos sin potencia por
+            encima del ruido
+        in_place : bool, optional
+            Si es True, modifica los datos originales. Si es False, retorna una copia
+
+        Returns:
+        --------
+        Dict[str, np.ndarray]
+            Diccionario con los datos sin ruido, en dBm
+
+        Raises:
+        -------
+        ValueError
+            Si in_place es False y los datos no están en dBm
+        """
+        y_unit = self.header_data.get('y-Unit', '')
+        if not in_place and y_unit.upper() not in ('DBM', 'DBM;'):
+            raise ValueError(f"subtract_noise con in_place=False requiere datos en dBm, pero la unidad es "
+                             f"'{y_unit}'. Use in_place=True o NoiseFloor.apply")
+        cleaned_data = noise.clean_traces(self, min_snr_db)
+        self.history.append(dict(noise._history_entry(min_snr_db), in_place=in_place))
+
+        if in_place:
+            self.header_data = dict(self.header_data, **{'y-Unit': 'dBm'})
+            self.data = cleaned_data
+            return self.data
+        else:
+            self.processed_data = cleaned_data
+            return cleaned_data
+
     def crop_data(self, start_index: Optional[int] = None, end_index: Optional[int] = None,
                   start_value: Optional[float] = None, end_value: Optional[float] = None,
                   in_place: bool = False) -> Dict[str, np.ndarray]:
@@ -110,9 +401,50 @@ class ProcessingMixin:
             raise ValueError("No hay datos disponibles para recortar")
 
         x_data = self.data['x']
-        y_data = self.data['y1']
+        traces = TraceData.stack(self.data)
+        start_idx, end_idx = self._crop_indices(x_data, start_index, end_index, start_value, end_value)
+
+        # Aplicar recorte a todas las trazas a la vez
+        cropped_data = TraceData(x_data[start_idx:end_idx].copy(),
+                                 traces[start_idx:end_idx].copy())
+
+        self.history.append({'operation': 'crop', 'start_index': int(start_idx),
+                             'end_index': int(end_idx), 'in_place': in_place})
+
+        if in_place:
+            self.data = cropped_data
+            self.n_points = len(cropped_data['x'])
+            return self.data
+        else:
+            self.processed_data = cropped_data
+            return cropped_data
+
+    @staticmethod
+    def _crop_indices(x_data: np.ndarray, start_index: Optional[int] = None,
+                      end_index: Optional[int] = None, start_value: Optional[float] = None,
+                      end_value: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Resuelve los índices de un recorte dados por índice o por valor de x
+
+        Parameters:
+        -----------
+        x_data : np.ndarray
+            Valores del eje x sobre los que se recorta
+        start_index, end_index : Optional[int]
+            Índices de inicio y fin (exclusivo)
+        start_value, end_value : Optional[float]
+            Valores de x (se usa el índice más cercano)
+
+        Returns:
+        --------
+        Tuple[int, int]
+            (inicio, fin) ordenados
 
-        # Determinar índices de recorte
+        Raises:
+        -------
+        ValueError
+            Si no se proporcionan parámetros válidos para el recorte
+        """
         if start_index is not None and end_index is not None:
             # Usar índices directamente
             start_idx = start_index
@@ -127,20 +459,156 @@ class ProcessingMixin:
         # Asegurar que los índices estén en orden correcto
         if start_idx > end_idx:
             start_idx, end_idx = end_idx, start_idx
+        return start_idx, end_idx
 
-        # Aplicar recorte
-        cropped_data = {
-            'x': x_data[start_idx:end_idx].copy(),
-            'y1': y_data[start_idx:end_idx].copy()
-        }
+    def superposition_crop(self, left_shift_deg: float = 0.0, right_shift_deg: float = 0.0) -> Dict[str, int]:
+        """
+        Calcula los índices de recorte de plot_superposition sin graficar
 
-        if in_place:
-            self.data = cropped_data
-            self.n_points = len(cropped_data['x'])
-            return self.data
-        else:
-            self.processed_data = cropped_data
-            return cropped_data
+        Parameters:
+        -----------
+        left_shift_deg : float, optional
+            Corrimiento en grados del lado izquierdo visual (recorta el comienzo)
+        right_shift_deg : float, optional
+            Corrimiento en grados del lado derecho visual (recorta el final)
+
+        Returns:
+        --------
+        Dict[str, int]
+            Índices {'start_index': int, 'end_index': int} para crop_data
+        """
+        if self.data is None:
+            raise ValueError("No hay datos disponibles para recortar")
+
+        n_points = len(self.data['x'])
+        mid_point = n_points // 2
+        # Cada corrimiento se mide sobre la mitad de los datos que desplaza
+        left_crop_points = int((right_shift_deg / 360.0) * (n_points - mid_point))
+        right_crop_points = int((left_shift_deg / 360.0) * mid_point)
+        return {'start_index': right_crop_points, 'end_index': n_points - left_crop_points}
+
+    def estimate_crop(self, trace: str = 'y1', span_deg: float = 380.0, tolerance_deg: float = 30.0,
+                      align: str = 'center') -> Tuple[Dict[str, int], float]:
+        """
+        Estima el recorte de la superposición de la tornamesa (reemplaza el ajuste
+        manual de plot_superposition)
+
+        La captura cubre más de una vuelta (de -190° a +190°), así que la traza se
+        repite con un período de P muestras: y[i] ≈ y[i + P]. P se busca como el
+        desplazamiento con mayor correlación (Pearson) entre el comienzo y el
+        final de la traza, calculada por FFT para todos los desplazamientos a la vez.
+        El recorte conserva P + 1 puntos: una vuelta completa con el extremo repetido.
+
+        Parameters:
+        -----------
+        trace : str, optional
+            Traza usada para la estimación (se correlaciona en escala logarítmica)
+        span_deg : float, optional
+            Recorrido nominal de la tornamesa durante la captura
+        tolerance_deg : float, optional
+            Incertidumbre del recorrido (disparo manual de los instrumentos)
+        align : str, optional
+            'center' (default) reparte la superposición entre ambos extremos,
+            'start' conserva el comienzo y 'end' conserva el final
+
+        Returns:
+        --------
+        Tuple[Dict[str, int], float]
+            (índices {'start_index', 'end_index'} para crop_data, confianza entre
+            0 y 1: correlación de los segmentos superpuestos)
+
+        Raises:
+        -------
+        ValueError
+            Si no hay datos o los parámetros no permiten buscar una vuelta
+        """
+        if self.data is None:
+            raise ValueError("No hay datos disponibles para recortar")
+
+        y_data = _trace_in_db(self, trace)
+        (crop,), confidence = _estimate_crops(y_data[np.newaxis, :], span_deg, tolerance_deg, align)
+        return crop, float(confidence[0])
+
+    def detect_mirror(self, reference, trace: str = 'y1', n_points: int = 360) -> Dict:
+        """
+        Detecta si la tornamesa giró en sentido inverso al de la referencia
+
+        Compara la traza contra el patrón de referencia y contra el patrón
+        invertido, tomando para cada uno la máxima correlación circular sobre
+        todos los giros relativos (la posición inicial no necesita coincidir).
+
+        Parameters:
+        -----------
+        reference : Union[SAData, np.ndarray]
+            Patrón de referencia: una medición previa, la simulación de la misma
+            frecuencia, o un array en dB de una vuelta
+        trace : str, optional
+            Traza a comparar (también se usa de la referencia si es un SAData)
+        n_points : int, optional
+            Puntos de la grilla angular común para la comparación
+
+        Returns:
+        --------
+        Dict
+            'mirror' (True si hay que espejar), 'confidence' (diferencia entre
+            las correlaciones de ambos sentidos), 'direct_score',
+            'reversed_score' y 'shift_deg' (giro relativo estimado)
+        """
+        if self.data is None:
+            raise ValueError("No hay datos disponibles para detectar el sentido de giro")
+        return detect_mirrors([self], reference, trace, n_points)[0]
+
+    def mirror_if_needed(self, reference, trace: str = 'y1', n_points: int = 360,
+                         in_place: bool = False) -> Dict:
+        """
+        Espeja los datos solo si detect_mirror indica giro inverso
+
+        Parameters:
+        -----------
+        reference : Union[SAData, np.ndarray]
+            Patrón de referencia (ver detect_mirror)
+        trace : str, optional
+            Traza a comparar
+        n_points : int, optional
+            Puntos de la grilla angular común para la comparación
+        in_place : bool, optional
+            Como en mirror_data
+
+        Returns:
+        --------
+        Dict
+            Resultado de detect_mirror
+        """
+        result = self.detect_mirror(reference, trace, n_points)
+        if result['mirror']:
+            self.mirror_data(in_place=in_place)
+        return result
+
+    def pipeline(self) -> 'Pipeline':
+        """
+        Crea una cadena diferida de operaciones sobre los datos de este objeto
+
+        Ejemplo: sa.pipeline().crop(40, 1950).mirror().to_db().apply()
+
+        Returns:
+        --------
+        Pipeline
+            Cadena vacía asociada a este objeto (ver scripts.pipeline)
+        """
+        # Import local para evitar el ciclo processing_mixin -> pipeline -> processing_mixin
+        from .pipeline import Pipeline
+        return Pipeline(self)
+
+    def get_history(self) -> List[Dict]:
+        """
+        Retorna el historial de operaciones de procesamiento aplicadas
+
+        Returns:
+        --------
+        List[Dict]
+            Una entrada por operación con su nombre ('operation') y parámetros
+        """
+        return [dict(entry) for entry in self.history]
 
     def get_processed_data(self) -> Optional[Dict[str, np.ndarray]]:
         """
@@ -159,7 +627,8 @@ class ProcessingMixin:
         """
         self.processed_data = None
 
-    def save_processed_data(self, output_dir: str = '.', use_original_name: bool = False) -> str:
+    def save_processed_data(self, output_dir: str = '.', use_original_name: bool = False,
+                            precision: Optional[int] = None, compression: Optional[str] = None) -> str:
         """
         Guarda los datos procesados en un archivo .DAT compatible
 
@@ -169,6 +638,11 @@ class ProcessingMixin:
             Directorio donde guardar el archivo
         use_original_name : bool
             Si es True, usa el nombre del archivo original con sufijo '_processed'
+        precision : Optional[int]
+            Decimales fijos para los datos; None (default) conserva la precisión completa
+        compression : Optional[str]
+            Extensión de compresión a agregar ('.gz', '.xz' o '.bz2'); None (default)
+            respeta la del nombre de salida, si la tiene
 
         Returns:
         --------
@@ -185,43 +659,95 @@ class ProcessingMixin:
 
         # Determinar nombre del archivo
         if use_original_name:
-            base_name = os.path.splitext(os.path.basename(self.file_path))[0]
+            original_name = split_compression_extension(os.path.basename(self.file_path))[0]
+            base_name = os.path.splitext(original_name)[0]
             filename = f"{base_name}_processed.DAT"
         elif self.output_filename:
             filename = self.output_filename
         else:
             raise ValueError("No se configuró nombre de salida. Use set_output_filename() o use_original_name=True")
 
+        if compression is not None:
+            if compression not in COMPRESSION_EXTENSIONS:
+                raise ValueError(f"Compresión '{compression}' no válida. Use una de {tuple(COMPRESSION_EXTENSIONS)}")
+            filename = split_compression_extension(filename)[0] + compression
+
         output_path = os.path.join(output_dir, filename)
 
         # Guardar archivo .DAT compatible
-        self._save_dat_file(output_path, self.processed_data)
+        self._save_dat_file(output_path, self.processed_data, precision=precision)
 
         return output_path
 
-    def _save_dat_file(self, output_path: str, data_dict: Dict[str, np.ndarray]) -> None:
+    @staticmethod
+    def _format_data_block(columns: np.ndarray, precision: Optional[int] = None) -> str:
+        """
+        Formatea un bloque de datos completo en un único string
+
+        Parameters:
+        -----------
+        columns : np.ndarray
+            Array (n_points, n_columns) con x y las trazas. Un array de objetos
+            (valores ya convertidos a str o float) se escribe con '%s'
+        precision : Optional[int]
+            None para la representación exacta de cada float (ida y vuelta sin
+            pérdida, salida idéntica a la histórica), o número de decimales fijos
+
+        Returns:
+        --------
+        str
+            Líneas 'x;y1;...;yN' terminadas en salto de línea
+        """
+        n_points, n_columns = columns.shape
+        if columns.dtype == object:
+            value_format = '%s'
+        elif precision is None:
+            value_format = '%r'
+        else:
+            value_format = f'%.{int(precision)}f'
+        row_format = ';'.join([value_format] * n_columns) + '\n'
+
+        # Una sola operación de formateo sobre floats de Python para todo el bloque
+        return (row_format * n_points) % tuple(columns.ravel().tolist())
+
+    def _save_dat_file(self, output_path: str, data_dict: Dict[str, np.ndarray],
+                       precision: Optional[int] = None) -> None:
         """
         Guarda datos en formato .DAT compatible con Rhode & Schwarz
 
+        Header y datos se arman en un único buffer y se escriben de una vez.
+
         Parameters:
         -----------
         output_path : str
             Ruta donde guardar el archivo
         data_dict : Dict[str, np.ndarray]
             Diccionario con datos a guardar
+        precision : Optional[int]
+            None (default) escribe cada valor con precisión completa; un entero
+            escribe ese número de decimales fijos (archivos más chicos y rápidos)
         """
-        with open(output_path, 'w', encoding='utf-8') as f:
-            # Escribir header original
-            for key, value in self.header_data.items():
-                f.write(f"{key};{value}\n")
-
-            # Escribir línea de valores con el nuevo número de puntos
-            n_points = len(data_dict['x'])
-            f.write(f"Values;{n_points};\n")
-
-            # Escribir datos
-            for i in range(n_points):
-                x = data_dict['x'][i]
-                y1 = data_dict['y1'][i]
-                y2 = data_dict['y1'][i]  # Para compatibilidad, usar y1 también como y2
-                f.write(f"{x};{y1};{y2}\n")
+        # Header original
+        header = ''.join(f"{key};{value}\n" for key, value in self.header_data.items())
+
+        # Línea de valores con el nuevo número de puntos
+        n_points = len(data_dict['x'])
+        header += f"Values;{n_points};\n"
+
+        # Datos con todas las trazas reales
+        traces = TraceData.stack(data_dict)
+        if traces.shape[1] == 1:
+            # Para compatibilidad, usar y1 también como y2
+            traces = np.column_stack((traces, traces))
+        if precision is None and traces.dtype.itemsize < 8:
+            # Trazas float32: escribir la representación más corta del float32
+            # (la de float64 agregaría dígitos espurios, p. ej. 0.10000000149011612)
+            columns = np.empty((len(traces), traces.shape[1] + 1), dtype=object)
+            columns[:, 0] = np.asarray(data_dict['x']).tolist()
+            columns[:, 1:] = traces.astype(str)
+        else:
+            columns = np.column_stack((data_dict['x'], traces))
+
+        # La extensión (.gz, .xz, .bz2) decide si se comprime en streaming
+        with open_file(output_path, 'wt', encoding='utf-8') as f:
+            f.write(header + self._format_data_block(columns, precision))
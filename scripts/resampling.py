@@ -0,0 +1,246 @@
+# resampling.py - Remuestreo angular de trazas a una grilla común
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+"""
+Remuestreo de muchas trazas a una grilla angular común en una sola operación.
+
+Una medición de una vuelta de tornamesa con n puntos se interpreta como
+muestras en np.linspace(min_deg, max_deg, n), igual que convert_to_degree.
+Los ángulos son periódicos: 360° coincide con 0°, de modo que la
+interpolación envuelve entre el último y el primer punto.
+
+Modos:
+- 'linear': interpolación lineal periódica, para cualquier grilla creciente
+- 'fft': interpolación de banda limitada (relleno/truncado del espectro),
+  para grillas equiespaciadas que cubren la vuelta completa
+
+Los pesos (índices y factores de interpolación, o la fase del espectro) se
+calculan una vez por grilla de origen y se reutilizan en todas las trazas de
+ese largo.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+
+RESAMPLING_MODES = ('linear', 'fft')
+
+
+class AngularResampler:
+    """
+    Remuestreador a una grilla angular destino fija
+
+    Ejemplo (reemplaza a `normalizar_ejes` de los notebooks de ploteo):
+
+        resampler = AngularResampler(n_points=2001, min_deg=-180, max_deg=180)
+        comunes = resampler.resample([directa_27.convert_to_dBm(),
+                                      directa_29.convert_to_dBm(),
+                                      directa_31.convert_to_dBm()])
+        # comunes.shape == (3, 2001), sobre resampler.angles
+    """
+
+    def __init__(self, n_points: Optional[int] = None, angles: Optional[np.ndarray] = None,
+                 min_deg: float = 0.0, max_deg: float = 360.0, period: float = 360.0,
+                 mode: str = 'linear'):
+        """
+        Parameters:
+        -----------
+        n_points : Optional[int]
+            Número de puntos de la grilla destino, equiespaciados entre
+            min_deg y max_deg (ambos incluidos)
+        angles : Optional[np.ndarray]
+            Grilla destino explícita en grados (alternativa a n_points)
+        min_deg : float, optional
+            Ángulo inicial de la grilla destino y de las grillas de origen por defecto
+        max_deg : float, optional
+            Ángulo final de la grilla destino y de las grillas de origen por defecto
+        period : float, optional
+            Período angular (360° por defecto)
+        mode : str, optional
+            'linear' (default) o 'fft'
+
+        Raises:
+        -------
+        ValueError
+            Si el modo no es válido o no se indica exactamente una grilla destino
+        """
+        if mode not in RESAMPLING_MODES:
+            raise ValueError(f"Modo '{mode}' no válido. Use uno de {RESAMPLING_MODES}")
+        if (n_points is None) == (angles is None):
+            raise ValueError("Indique n_points o angles (uno de los dos)")
+
+        if angles is None:
+            angles = np.linspace(min_deg, max_deg, n_points)
+        self.angles = np.asarray(angles, dtype=float)
+        self.min_deg = min_deg
+        self.max_deg = max_deg
+        self.period = period
+        self.mode = mode
+        self._weights: Dict[Tuple, Tuple] = {}
+
+    def _source_grid(self, n_points: int) -> np.ndarray:
+        """Grilla de origen por defecto para trazas de n_points puntos"""
+        return np.linspace(self.min_deg, self.max_deg, n_points)
+
+    def _unique_samples(self, angles: np.ndarray) -> int:
+        """
+        Número de muestras distintas de una grilla creciente: las del final que
+        coinciden (módulo el período) con la primera son duplicadas
+        """
+        duplicated = angles >= angles[0] + self.period - 1e-9 * self.period
+        return int(len(angles) - np.count_nonzero(duplicated))
+
+    def _linear_weights(self, source: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcula índices inferior/superior y peso del superior para cada ángulo destino
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            (índice inferior, índice superior, peso), cada uno de largo len(self.angles)
+        """
+        if np.any(np.diff(source) <= 0):
+            raise ValueError("La grilla de origen debe ser estrictamente creciente")
+        n_unique = self._unique_samples(source)
+        end = source[0] + self.period
+
+        if n_unique < len(source):
+            # El último punto ya es la vuelta completa: se conserva su valor medido
+            positions = source[:n_unique + 1]
+            indices = np.arange(n_unique + 1)
+        else:
+            # Cerrar la vuelta con la primera muestra un período después
+            positions = np.append(source, end)
+            indices = np.append(np.arange(len(source)), 0)
+
+        # Los ángulos dentro del rango de origen se interpolan tal cual; el resto se envuelve
+        inside = (self.angles >= source[0]) & (self.angles <= positions[-1])
+        targets = np.where(inside, self.angles, source[0] + np.mod(self.angles - source[0], self.period))
+        segment = np.clip(np.searchsorted(positions, targets, side='right') - 1, 0, len(positions) - 2)
+        weight = (targets - positions[segment]) / (positions[segment + 1] - positions[segment])
+        return indices[segment], indices[segment + 1], weight
+
+    def _uniform_grid(self, angles: np.ndarray, what: str) -> Tuple[float, int, bool]:
+        """
+        Verifica que una grilla sea equiespaciada y cubra la vuelta completa
+
+        Returns:
+        --------
+        Tuple[float, int, bool]
+            (ángulo inicial, muestras distintas, si el último punto repite el primero)
+
+        Raises:
+        -------
+        ValueError
+            Si la grilla no es equiespaciada sobre el período completo
+        """
+        n_unique = self._unique_samples(angles)
+        step = self.period / n_unique
+        expected = angles[0] + step * np.arange(len(angles))
+        if n_unique < 2 or len(angles) - n_unique > 1 or not np.allclose(angles, expected, atol=1e-9 * self.period):
+            raise ValueError(f"El modo 'fft' requiere una grilla {what} equiespaciada que cubra "
+                             f"el período completo ({self.period}°)")
+        return float(angles[0]), n_unique, len(angles) > n_unique
+
+    def _fft_weights(self, source: np.ndarray) -> Tuple:
+        """
+        Calcula el factor complejo por frecuencia que desplaza y reescala el espectro
+
+        Returns:
+        --------
+        Tuple
+            (muestras de origen, muestras destino, factor por bin, si repetir el primer punto al final)
+        """
+        source_start, n_source, _ = self._uniform_grid(source, 'de origen')
+        target_start, n_target, repeat_first = self._uniform_grid(self.angles, 'destino')
+
+        n_bins = min(n_source, n_target) // 2 + 1
+        k = np.arange(n_bins)
+        shift = (target_start - source_start) / self.period
+        factor = np.exp(2j * np.pi * k * shift) * (n_target / n_source)
+        if n_source % 2 == 0 and n_target > n_source:
+            # El bin de Nyquist del origen se reparte entre +f y -f al ampliar
+            factor[n_source // 2] *= 0.5
+        return n_source, n_target, factor, repeat_first
+
+    def _weights_for(self, source: np.ndarray) -> Tuple:
+        """Pesos de una grilla de origen, calculados una sola vez por grilla"""
+        key = (len(source), float(source[0]), float(source[-1]), hash(source.tobytes()))
+        if key not in self._weights:
+            if self.mode == 'linear':
+                self._weights[key] = self._linear_weights(source)
+            else:
+                self._weights[key] = self._fft_weights(source)
+        return self._weights[key]
+
+    def _resample_block(self, block: np.ndarray, source: np.ndarray) -> np.ndarray:
+        """Remuestrea un bloque (N, n) de trazas que comparten la grilla de origen"""
+        if self.mode == 'linear':
+            lower, upper, weight = self._weights_for(source)
+            # Dos gathers y una combinación lineal para todas las trazas a la vez
+            return block[:, lower] * (1 - weight) + block[:, upper] * weight
+
+        n_source, n_target, factor, repeat_first = self._weights_for(source)
+        spectrum = np.fft.rfft(block[:, :n_source], axis=1)[:, :len(factor)] * factor
+        result = np.fft.irfft(spectrum, n=n_target, axis=1)
+        if repeat_first:
+            result = np.concatenate((result, result[:, :1]), axis=1)
+        return result
+
+    def resample(self, traces: Union[np.ndarray, Sequence[np.ndarray]],
+                 source_angles: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Remuestrea una o varias trazas a la grilla destino
+
+        Parameters:
+        -----------
+        traces : Union[np.ndarray, Sequence[np.ndarray]]
+            Una traza 1D, un array (N, n), o una secuencia de trazas de largos
+            distintos (se agrupan por largo y cada grupo se procesa de una vez)
+        source_angles : Optional[np.ndarray]
+            Grilla de origen en grados, común a todas las trazas. Por defecto,
+            cada traza de n puntos se ubica en linspace(min_deg, max_deg, n)
+
+        Returns:
+        --------
+        np.ndarray
+            Array (len(angles),) para una traza 1D, o (N, len(angles))
+
+        Raises:
+        -------
+        ValueError
+            Si la grilla de origen no coincide con el largo de las trazas
+        """
+        if isinstance(traces, np.ndarray) and traces.ndim == 1:
+            return self.resample(traces[np.newaxis, :], source_angles)[0]
+
+        if isinstance(traces, np.ndarray):
+            groups = {traces.shape[1]: (np.arange(len(traces)), traces)}
+        else:
+            rows_by_length: Dict[int, list] = {}
+            for row, trace in enumerate(traces):
+                rows_by_length.setdefault(len(trace), []).append(row)
+            groups = {length: (np.array(rows), np.vstack([traces[row] for row in rows]))
+                      for length, rows in rows_by_length.items()}
+
+        result = np.empty((sum(len(rows) for rows, _ in groups.values()), len(self.angles)))
+        for length, (rows, block) in groups.items():
+            if source_angles is None:
+                source = self._source_grid(length)
+            else:
+                source = np.asarray(source_angles, dtype=float)
+                if len(source) != length:
+                    raise ValueError(f"La grilla de origen tiene {len(source)} puntos y las trazas {length}")
+            result[rows] = self._resample_block(block, source)
+        return result
+
+    def clear_cache(self) -> None:
+        """
+        Descarta los pesos precalculados
+        """
+        self._weights.clear()
+
+    def __repr__(self) -> str:
+        """Representación string del objeto"""
+        return (f"AngularResampler(points={len(self.angles)}, mode='{self.mode}', "
+                f"cached_grids={len(self._weights)})")
@@ -2,23 +2,50 @@
 # Autor: [Simón Aulet]
 # Fecha: 2025-09-10
 
-from typing import Dict, List, Tuple, Optional
+import glob
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional, Sequence, Union
 import numpy as np
 
+from .binary_format import BINARY_EXTENSION, read_binary, write_binary
+from .cache_mixin import CacheMixin
 from .conversion_mixin import ConversionMixin
-from .parser_mixin import ParserMixin
+from .parser_mixin import ParserMixin, TraceData
 from .plot_mixin import PlotMixin
 from .processing_mixin import ProcessingMixin
 
-class SAData(ParserMixin, ConversionMixin, PlotMixin, ProcessingMixin):
+class SAData(ParserMixin, CacheMixin, ConversionMixin, PlotMixin, ProcessingMixin):
     """
     Clase para manejar datos de archivos .DAT generados por analizadores de espectro.
 
     Esta clase carga, parsea y almacena tanto los metadatos del header como los datos de medición
     en un objeto Python para su posterior análisis y procesamiento.
+
+    Contrato de aliasing de los accesores (get_data, get_x_data, get_y1_data,
+    get_traces, get_trace):
+    - copy=True: retornan copias independientes; modificarlas no afecta al objeto.
+    - copy=False: retornan vistas de solo lectura (writeable=False) sobre los
+      arrays internos, sin asignar memoria para los datos. Las vistas reflejan
+      los datos mientras no se reemplacen (por ejemplo, una nueva carga); para
+      modificarlas hay que copiarlas explícitamente con np.array(vista).
+    - copy=None (default): usa el modo del objeto, `view_mode` (False por
+      defecto, es decir copias). Con set_view_mode(True) todos los accesores
+      retornan vistas sin cambiar las llamadas existentes.
+
+    Almacenamiento compacto: los atributos se guardan en __slots__ (sin
+    __dict__ por instancia); con trace_dtype=np.float32 las trazas ocupan la
+    mitad, y con share_header=True los headers idénticos (misma configuración
+    del instrumento) se comparten entre instancias. Ver nbytes().
     """
 
-    def __init__(self, file_path: str):
+    __slots__ = ('file_path', 'parser_engine', 'trace_dtype', 'header_data', '_data',
+                 '_data_pending', '_data_offset', 'n_points', 'view_mode',
+                 'processed_data', 'output_filename', 'history', '_conversion_cache')
+
+    def __init__(self, file_path: str, parser_engine: str = 'numpy', lazy: bool = False,
+                 cache: bool = False, trace_dtype: Optional[np.dtype] = None,
+                 share_header: bool = False):
         """
         Inicializa el objeto de datos con la ruta al archivo .DAT
 
@@ -26,17 +53,223 @@ class SAData(ParserMixin, ConversionMixin, PlotMixin, ProcessingMixin):
         -----------
         file_path : str
             Ruta completa al archivo .DAT
+        parser_engine : str, optional
+            Motor de parsing del bloque de datos ('numpy' o 'python')
+        lazy : bool, optional
+            Si es True, solo se parsea el header. Los datos se cargan la primera
+            vez que se accede a `data` (accesores, conversiones, ploteos, etc.)
+        cache : bool, optional
+            Si es True, usa el cache binario en `.sa_cache/`: si es válido se mapean
+            los arrays cacheados en lugar de parsear el texto; si no, se parsea el
+            archivo completo y se escribe el cache
+        trace_dtype : Optional[np.dtype]
+            Tipo de almacenamiento de las trazas (por ejemplo np.float32, suficiente
+            para potencias en dB). None conserva float64. El eje x no se convierte
+        share_header : bool, optional
+            Si es True, el header se interna y se comparte con las demás instancias
+            que tengan exactamente el mismo header. El header compartido no debe
+            modificarse en el lugar (get_header() retorna una copia)
         """
+        self._init_state(file_path, parser_engine, trace_dtype)
+
+        if cache:
+            # Carga en caliente desde el cache o parseo completo y escritura del cache
+            if not self._load_from_cache():
+                self._parse_into_cache()
+        elif lazy:
+            # Solo el header; el bloque de datos queda pendiente
+            self._parse_header_only()
+            self._data_pending = True
+        else:
+            # Parsear el archivo al inicializar
+            self._parse_file()
+
+        if share_header:
+            self.header_data = _shared_header(self.header_data)
+
+    def _init_state(self, file_path: str, parser_engine: str = 'numpy',
+                    trace_dtype: Optional[np.dtype] = None) -> None:
+        """Inicializa los atributos comunes a todos los constructores"""
         self.file_path = file_path
+        self.parser_engine = parser_engine
+        self.trace_dtype = None if trace_dtype is None else np.dtype(trace_dtype)
+        self.view_mode = False
+        self._conversion_cache: Dict[Tuple, np.ndarray] = {}
         self.header_data: Dict[str, str] = {}
-        self.data: Optional[Dict[str, np.ndarray]] = None
+        self._data: Optional[Dict[str, np.ndarray]] = None
+        self._data_pending = False
+        self._data_offset = 0
         self.n_points: Optional[int] = None
-        
+
         # Inicializar mixin de procesamiento
         ProcessingMixin.__init__(self)
 
-        # Parsear el archivo al inicializar
-        self._parse_file()
+    @classmethod
+    def from_arrays(cls, x_values: np.ndarray, traces: np.ndarray,
+                    header_data: Optional[Dict[str, str]] = None, file_path: str = '') -> 'SAData':
+        """
+        Crea un objeto a partir de arrays ya disponibles, sin leer ningún archivo
+
+        Parameters:
+        -----------
+        x_values : np.ndarray
+            Valores del eje x
+        traces : np.ndarray
+            Array (n_points,) o (n_points, n_traces) con las trazas
+        header_data : Optional[Dict[str, str]]
+            Metadatos del header (por ejemplo {'x-Unit': 's', 'y-Unit': 'dBm'})
+        file_path : str, optional
+            Ruta de referencia del origen de los datos
+
+        Returns:
+        --------
+        SAData
+            Instancia con los datos indicados
+        """
+        sa = cls.__new__(cls)
+        sa._init_state(file_path)
+        sa.header_data = dict(header_data or {})
+        sa.data = TraceData(np.asarray(x_values), np.asarray(traces))
+        sa.n_points = len(sa.data['x'])
+        return sa
+
+    def save_binary(self, output_path: str, processed: bool = False) -> str:
+        """
+        Guarda header, historial de procesamiento y arrays en un contenedor binario .sab
+
+        Parameters:
+        -----------
+        output_path : str
+            Ruta del archivo a escribir (se agrega la extensión .sab si falta)
+        processed : bool, optional
+            Si es True, guarda los datos procesados en lugar de los originales
+
+        Returns:
+        --------
+        str
+            Ruta del archivo guardado
+
+        Raises:
+        -------
+        ValueError
+            Si no hay datos para guardar
+        """
+        data_dict = self.processed_data if processed else self.data
+        if data_dict is None:
+            raise ValueError("No hay datos para guardar")
+
+        if not output_path.endswith(BINARY_EXTENSION):
+            output_path += BINARY_EXTENSION
+
+        return write_binary(output_path, self.header_data, data_dict['x'],
+                            TraceData.stack(data_dict), history=self.history,
+                            source=self.file_path)
+
+    @classmethod
+    def load_binary(cls, file_path: str, mmap_mode: Optional[str] = 'c') -> 'SAData':
+        """
+        Carga un contenedor .sab mapeando los arrays en memoria, sin parseo
+
+        Parameters:
+        -----------
+        file_path : str
+            Ruta del archivo .sab
+        mmap_mode : Optional[str]
+            Modo de mapeo ('c' copy-on-write por defecto, 'r', o None para leer a memoria)
+
+        Returns:
+        --------
+        SAData
+            Instancia con header, historial y datos del contenedor
+        """
+        meta, x_values, traces = read_binary(file_path, mmap_mode=mmap_mode)
+        sa = cls.from_arrays(x_values, traces, meta['header'], file_path=file_path)
+        sa.n_points = meta['n_points']
+        sa.history = list(meta['history'])
+        return sa
+
+    @property
+    def data(self) -> Optional[Dict[str, np.ndarray]]:
+        """Datos de medición; en modo lazy se cargan en el primer acceso"""
+        if self._data_pending:
+            self._load_data()
+        return self._data
+
+    @data.setter
+    def data(self, value: Optional[Dict[str, np.ndarray]]) -> None:
+        self._data = value
+        self._data_pending = False
+        # Los resultados de conversión memoizados dependen de los datos
+        self._conversion_cache.clear()
+
+    def is_loaded(self) -> bool:
+        """
+        Indica si el bloque de datos ya fue cargado
+
+        Returns:
+        --------
+        bool
+            False si el objeto es lazy y todavía no se accedió a los datos
+        """
+        return not self._data_pending
+
+    def set_view_mode(self, enabled: bool = True) -> None:
+        """
+        Activa o desactiva el modo vista de los accesores
+
+        Parameters:
+        -----------
+        enabled : bool, optional
+            Si es True, los accesores sin `copy` explícito retornan vistas de
+            solo lectura en lugar de copias
+        """
+        self.view_mode = enabled
+
+    def _export_array(self, array: np.ndarray, copy: Optional[bool]) -> np.ndarray:
+        """Retorna una copia o una vista de solo lectura según `copy` y el modo del objeto"""
+        if copy is None:
+            copy = not self.view_mode
+        if copy:
+            return array.copy()
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def nbytes(self) -> Dict[str, int]:
+        """
+        Reporta la memoria ocupada por el objeto, en bytes
+
+        Los buffers compartidos (por ejemplo vistas o un header compartido) se
+        cuentan una sola vez. Los arrays mapeados en memoria (cache, .sab) se
+        cuentan por su tamaño aunque no estén residentes.
+
+        Returns:
+        --------
+        Dict[str, int]
+            Bytes de 'data', 'processed_data', 'header' y el 'total'
+        """
+        seen = set()
+
+        def arrays_nbytes(data_dict: Optional[Dict[str, np.ndarray]]) -> int:
+            total = 0
+            for array in (data_dict or {}).values():
+                # Subir hasta el array dueño de la memoria para no contar vistas
+                while isinstance(array.base, np.ndarray):
+                    array = array.base
+                if id(array) not in seen:
+                    seen.add(id(array))
+                    total += array.nbytes
+            return total
+
+        header = sys.getsizeof(self.header_data) + sum(
+            sys.getsizeof(key) + sys.getsizeof(value) for key, value in self.header_data.items())
+        report = {
+            'data': arrays_nbytes(self._data),
+            'processed_data': arrays_nbytes(self.processed_data),
+            'header': header
+        }
+        report['total'] = sum(report.values())
+        return report
 
     def get_header(self) -> Dict[str, str]:
         """
@@ -49,10 +282,16 @@ class SAData(ParserMixin, ConversionMixin, PlotMixin, ProcessingMixin):
         """
         return self.header_data.copy()
 
-    def get_data(self) -> Dict[str, np.ndarray]:
+    def get_data(self, copy: Optional[bool] = None) -> Dict[str, np.ndarray]:
         """
         Retorna los datos de medición como arrays de NumPy
 
+        Parameters:
+        -----------
+        copy : Optional[bool]
+            True para copias, False para vistas de solo lectura, None para
+            usar el modo del objeto (ver contrato de aliasing de la clase)
+
         Returns:
         --------
         Dict[str, np.ndarray]
@@ -60,29 +299,96 @@ class SAData(ParserMixin, ConversionMixin, PlotMixin, ProcessingMixin):
         """
         if self.data is None:
             raise ValueError("No hay datos disponibles")
-        return self.data.copy()
+        return {key: self._export_array(array, copy) for key, array in self.data.items()}
 
-    def get_x_data(self) -> np.ndarray:
+    def get_x_data(self, copy: Optional[bool] = None) -> np.ndarray:
         """
         Retorna los datos del eje x
 
+        Parameters:
+        -----------
+        copy : Optional[bool]
+            True para una copia, False para una vista de solo lectura, None
+            para usar el modo del objeto
+
         Returns:
         --------
         np.ndarray
             Array con los valores del eje x
         """
-        return self.data['x'].copy() if self.data else None
+        return self._export_array(self.data['x'], copy) if self.data else None
 
-    def get_y1_data(self) -> np.ndarray:
+    def get_y1_data(self, copy: Optional[bool] = None) -> np.ndarray:
         """
         Retorna los datos del primer canal y
 
+        Parameters:
+        -----------
+        copy : Optional[bool]
+            True para una copia, False para una vista de solo lectura, None
+            para usar el modo del objeto
+
         Returns:
         --------
         np.ndarray
             Array con los valores del primer canal y
         """
-        return self.data['y1'].copy() if self.data else None
+        return self._export_array(self.data['y1'], copy) if self.data else None
+
+    def get_traces(self, copy: Optional[bool] = None) -> Optional[np.ndarray]:
+        """
+        Retorna todas las trazas como un único array 2D
+
+        Parameters:
+        -----------
+        copy : Optional[bool]
+            True para una copia, False para una vista de solo lectura (sin
+            asignar memoria si las trazas no se reemplazaron individualmente),
+            None para usar el modo del objeto
+
+        Returns:
+        --------
+        np.ndarray
+            Array (n_points, n_traces) con una columna por traza (y1...yN)
+        """
+        return self._export_array(TraceData.stack(self.data), copy) if self.data else None
+
+    def get_trace(self, name: str, copy: Optional[bool] = None) -> np.ndarray:
+        """
+        Retorna una traza por nombre
+
+        Parameters:
+        -----------
+        name : str
+            Nombre de la traza ('y1', 'y2', ...)
+        copy : Optional[bool]
+            True para una copia, False para una vista de solo lectura, None
+            para usar el modo del objeto
+
+        Returns:
+        --------
+        np.ndarray
+            Array con los valores de la traza
+
+        Raises:
+        -------
+        KeyError
+            Si la traza no existe
+        """
+        if self.data is None or name not in TraceData.trace_names(self.data):
+            raise KeyError(f"La traza '{name}' no existe")
+        return self._export_array(self.data[name], copy)
+
+    def get_trace_names(self) -> List[str]:
+        """
+        Retorna los nombres de las trazas disponibles
+
+        Returns:
+        --------
+        List[str]
+            Nombres de traza ordenados ('y1', 'y2', ...)
+        """
+        return TraceData.trace_names(self.data) if self.data else []
 
     def get_n_points(self) -> Optional[int]:
         """
@@ -107,18 +413,21 @@ class SAData(ParserMixin, ConversionMixin, PlotMixin, ProcessingMixin):
         if self.data is None:
             return (0, 0)
         n_points = len(self.data['x'])
-        # Solo tenemos 1 canal (y1)
-        n_channels = 1
+        n_channels = len(TraceData.trace_names(self.data))
         return (n_points, n_channels)
 
     def __repr__(self) -> str:
         """Representación string del objeto"""
-        if self.data is None:
+        if self._data_pending:
+            # No forzar la carga: usar el número de puntos del header
+            n_points = self.n_points or 0
+            n_channels = '?'
+        elif self._data is None:
             n_points = 0
             n_channels = 0
         else:
-            n_points = len(self.data['x'])
-            n_channels = 1  # Solo y1
+            n_points = len(self._data['x'])
+            n_channels = len(TraceData.trace_names(self._data))
 
         return (f"SAData(file_path='{self.file_path}', "
                 f"header_params={len(self.header_data)}, "
@@ -133,7 +442,7 @@ class SAData(ParserMixin, ConversionMixin, PlotMixin, ProcessingMixin):
             data_types = "N/A"
         else:
             n_points = len(self.data['x'])
-            n_channels = 1  # Solo y1
+            n_channels = len(TraceData.trace_names(self.data))
             data_types = {key: str(arr.dtype) for key, arr in self.data.items()}
 
         return (f"SAData - Archivo: {self.file_path}\n"
@@ -142,19 +451,133 @@ class SAData(ParserMixin, ConversionMixin, PlotMixin, ProcessingMixin):
                 f"Canales: {n_channels}\n"
                 f"Tipos de datos: {data_types}")
 
+# Headers compartidos entre instancias, indexados por su contenido
+_HEADER_POOL: Dict[Tuple[Tuple[str, str], ...], Dict[str, str]] = {}
+
+
+def _shared_header(header_data: Dict[str, str]) -> Dict[str, str]:
+    """
+    Retorna la instancia compartida de un header, con claves y valores internados
+
+    Parameters:
+    -----------
+    header_data : Dict[str, str]
+        Header recién parseado
+
+    Returns:
+    --------
+    Dict[str, str]
+        Diccionario compartido por todas las instancias con el mismo header
+    """
+    key = tuple((sys.intern(name), sys.intern(value)) for name, value in header_data.items())
+    if key not in _HEADER_POOL:
+        _HEADER_POOL[key] = dict(key)
+    return _HEADER_POOL[key]
+
+
 # Función de conveniencia para crear instancias fácilmente
-def load_sa_data(file_path: str) -> SAData:
+def load_sa_data(file_path: str, parser_engine: str = 'numpy', lazy: bool = False,
+                 cache: bool = False, trace_dtype: Optional[np.dtype] = None,
+                 share_header: bool = False) -> SAData:
     """
     Función de conveniencia para cargar datos de archivos de analizador de espectro
 
     Parameters:
     -----------
     file_path : str
-        Ruta al archivo .DAT
+        Ruta al archivo .DAT, o a un contenedor binario .sab (ver SAData.save_binary)
+    parser_engine : str, optional
+        Motor de parsing del bloque de datos ('numpy' o 'python')
+    lazy : bool, optional
+        Si es True, solo se lee el header y los datos se cargan bajo demanda
+    cache : bool, optional
+        Si es True, usa el cache binario junto al archivo (ver CacheMixin)
+    trace_dtype : Optional[np.dtype]
+        Tipo de almacenamiento de las trazas (por ejemplo np.float32)
+    share_header : bool, optional
+        Si es True, comparte el header con las instancias de header idéntico
 
     Returns:
     --------
     SAData
         Instancia con los datos cargados
     """
-    return SAData(file_path)
+    if file_path.endswith(BINARY_EXTENSION):
+        # Contenedor binario: mapeo directo, sin parseo
+        return SAData.load_binary(file_path)
+    return SAData(file_path, parser_engine=parser_engine, lazy=lazy, cache=cache,
+                  trace_dtype=trace_dtype, share_header=share_header)
+
+
+def _load_sa_data_worker(file_path: str, options: Dict) -> SAData:
+    """Carga un archivo dentro de un worker del pool (debe ser picklable)"""
+    return load_sa_data(file_path, **options)
+
+
+def load_sa_data_many(paths: Union[str, Sequence[str]], max_workers: Optional[int] = None,
+                      executor: str = 'process', **options) -> Tuple[List[Optional[SAData]], Dict[str, Exception]]:
+    """
+    Carga varios archivos .DAT en paralelo usando un pool de procesos o hilos
+
+    Parameters:
+    -----------
+    paths : Union[str, Sequence[str]]
+        Lista de rutas, o un patrón glob (por ejemplo './mediciones/*.DAT').
+        Con un patrón, los archivos se ordenan alfabéticamente.
+    max_workers : Optional[int]
+        Número de workers del pool (default: el del executor de Python)
+    executor : str, optional
+        'process' (default), 'thread', o 'serial' para cargar sin pool
+    **options
+        Argumentos adicionales para load_sa_data (parser_engine, lazy, cache,
+        trace_dtype, share_header)
+
+    Returns:
+    --------
+    Tuple[List[Optional[SAData]], Dict[str, Exception]]
+        Lista de objetos en el mismo orden que las rutas (None para los archivos
+        que fallaron) y diccionario {ruta: excepción} con los errores de cada archivo
+
+    Raises:
+    -------
+    ValueError
+        Si el executor no es válido
+    """
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(paths, recursive=True))
+    paths = list(paths)
+
+    results: List[Optional[SAData]] = [None] * len(paths)
+    errors: Dict[str, Exception] = {}
+
+    if executor == 'serial':
+        for i, path in enumerate(paths):
+            try:
+                results[i] = load_sa_data(path, **options)
+            except Exception as e:
+                errors[path] = e
+        return results, errors
+
+    if executor == 'process':
+        pool_class = ProcessPoolExecutor
+    elif executor == 'thread':
+        pool_class = ThreadPoolExecutor
+    else:
+        raise ValueError(f"Executor '{executor}' no válido. Use 'process', 'thread' o 'serial'")
+
+    with pool_class(max_workers=max_workers) as pool:
+        futures = [pool.submit(_load_sa_data_worker, path, options) for path in paths]
+        for i, (path, future) in enumerate(zip(paths, futures)):
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                # Registrar el error del archivo sin abortar el lote
+                errors[path] = e
+
+    if options.get('share_header') and executor == 'process':
+        # Cada worker comparte headers en su propio proceso: volver a compartirlos acá
+        for sa in results:
+            if sa is not None:
+                sa.header_data = _shared_header(sa.header_data)
+
+    return results, errors
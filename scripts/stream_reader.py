@@ -0,0 +1,295 @@
+# SAStreamReader - Lectura por bloques de archivos .DAT muy largos
+# Autor: [Simón Aulet]
+# Fecha: 2026-10-17
+
+import mmap
+from typing import Dict, Iterator, Optional, Tuple
+import numpy as np
+
+from .compression import detect_compression, open_file
+from .conversion_mixin import ConversionMixin
+from .parser_mixin import ParserMixin
+
+# Estimación de bytes por línea de datos para dimensionar los bloques leídos
+_BYTES_PER_LINE_ESTIMATE = 48
+
+
+class SAStreamReader(ParserMixin, ConversionMixin):
+    """
+    Lector por bloques de archivos .DAT pensado para capturas muy largas.
+
+    El archivo se mapea en memoria y el bloque de datos se recorre en chunks de
+    tamaño fijo de arrays (x, y1), sin cargar nunca la traza completa. El header
+    se parsea una sola vez al crear el lector. Los archivos comprimidos no se
+    pueden mapear y se leen en streaming desde el descompresor.
+
+    Las operaciones que en SAData trabajan sobre la traza completa (conversión a
+    dBm, mínimo/máximo y recorte) están disponibles aquí como versiones por chunks.
+    """
+
+    # El lector nunca materializa la traza completa
+    data = None
+
+    def __init__(self, file_path: str, chunk_size: int = 65536, parser_engine: str = 'numpy'):
+        """
+        Inicializa el lector y parsea el header
+
+        Parameters:
+        -----------
+        file_path : str
+            Ruta completa al archivo .DAT
+        chunk_size : int, optional
+            Número de puntos por chunk (default 65536)
+        parser_engine : str, optional
+            Motor de parsing de cada bloque ('numpy' o 'python')
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size debe ser mayor que cero")
+
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.parser_engine = parser_engine
+        self.header_data: Dict[str, str] = {}
+        self.n_points: Optional[int] = None
+        self._data_offset = 0
+
+        self._parse_header_only()
+
+    def _iter_blocks(self, block_bytes: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Recorre el bloque de datos en bloques de líneas completas
+
+        Los archivos planos se mapean en memoria; los comprimidos se leen en
+        streaming desde el descompresor.
+
+        Parameters:
+        -----------
+        block_bytes : int
+            Tamaño aproximado en bytes de cada bloque (se extiende hasta fin de línea)
+
+        Yields:
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Arrays (x, y1) de cada bloque, de longitud variable
+        """
+        if detect_compression(self.file_path) is None:
+            raw_blocks = self._iter_mapped_bytes(block_bytes)
+        else:
+            raw_blocks = self._iter_stream_bytes(block_bytes)
+
+        for raw_block in raw_blocks:
+            lines = raw_block.decode('utf-8').splitlines()
+            if lines:
+                x_block, traces = self._parse_columns(lines)
+                yield x_block, traces[:, 0]
+
+    def _iter_mapped_bytes(self, block_bytes: int) -> Iterator[bytes]:
+        """Recorre un archivo plano mapeado en memoria en bloques de líneas completas"""
+        with open(self.file_path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                size = len(mapped)
+                position = self._data_offset
+
+                while position < size:
+                    stop = min(position + block_bytes, size)
+                    if stop < size:
+                        # Extender el bloque hasta el final de la línea en curso
+                        newline = mapped.find(b'\n', stop)
+                        stop = size if newline == -1 else newline + 1
+
+                    yield mapped[position:stop]
+                    position = stop
+
+    def _iter_stream_bytes(self, block_bytes: int) -> Iterator[bytes]:
+        """Recorre un archivo comprimido en bloques de líneas completas"""
+        with open_file(self.file_path, 'rb') as file:
+            file.seek(self._data_offset)
+            while True:
+                # Completar la última línea del bloque
+                raw_block = file.read(block_bytes) + file.readline()
+                if not raw_block:
+                    break
+                yield raw_block
+
+    def iter_chunks(self, chunk_size: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Recorre la traza en chunks de tamaño fijo
+
+        Parameters:
+        -----------
+        chunk_size : Optional[int]
+            Número de puntos por chunk; si es None se usa el del lector
+
+        Yields:
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Arrays (x, y1) de chunk_size puntos (el último puede ser más corto)
+        """
+        chunk_size = chunk_size or self.chunk_size
+        pending_x = np.empty(0)
+        pending_y = np.empty(0)
+
+        for x_block, y_block in self._iter_blocks(chunk_size * _BYTES_PER_LINE_ESTIMATE):
+            if len(pending_x):
+                x_block = np.concatenate((pending_x, x_block))
+                y_block = np.concatenate((pending_y, y_block))
+
+            n_full = (len(x_block) // chunk_size) * chunk_size
+            for start in range(0, n_full, chunk_size):
+                yield x_block[start:start + chunk_size], y_block[start:start + chunk_size]
+
+            pending_x = x_block[n_full:]
+            pending_y = y_block[n_full:]
+
+        if len(pending_x):
+            yield pending_x, pending_y
+
+    def iter_dBm_chunks(self, chunk_size: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Recorre la traza en chunks con y1 convertido a dBm
+
+        Parameters:
+        -----------
+        chunk_size : Optional[int]
+            Número de puntos por chunk; si es None se usa el del lector
+
+        Yields:
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Arrays (x, y1 en dBm)
+        """
+        for x_chunk, y_chunk in self.iter_chunks(chunk_size):
+            yield x_chunk, self._y_to_dBm(y_chunk)
+
+    def min_max(self, dBm: bool = False, chunk_size: Optional[int] = None) -> Dict[str, float]:
+        """
+        Calcula mínimo y máximo de y1 recorriendo la traza por chunks
+
+        Parameters:
+        -----------
+        dBm : bool, optional
+            Si es True, los valores se convierten a dBm antes de comparar
+        chunk_size : Optional[int]
+            Número de puntos por chunk; si es None se usa el del lector
+
+        Returns:
+        --------
+        Dict[str, float]
+            Diccionario con 'min', 'max', los valores de x donde ocurren
+            ('x_at_min', 'x_at_max') y el número de puntos recorridos ('n_points')
+
+        Raises:
+        -------
+        ValueError
+            Si el archivo no tiene datos
+        """
+        chunks = self.iter_dBm_chunks(chunk_size) if dBm else self.iter_chunks(chunk_size)
+        result = {'min': np.inf, 'max': -np.inf, 'x_at_min': np.nan, 'x_at_max': np.nan, 'n_points': 0}
+
+        for x_chunk, y_chunk in chunks:
+            result['n_points'] += len(y_chunk)
+
+            i_min = int(np.argmin(y_chunk))
+            if y_chunk[i_min] < result['min']:
+                result['min'] = float(y_chunk[i_min])
+                result['x_at_min'] = float(x_chunk[i_min])
+
+            i_max = int(np.argmax(y_chunk))
+            if y_chunk[i_max] > result['max']:
+                result['max'] = float(y_chunk[i_max])
+                result['x_at_max'] = float(x_chunk[i_max])
+
+        if result['n_points'] == 0:
+            raise ValueError(f"No hay datos en el archivo {self.file_path}")
+
+        return result
+
+    def _nearest_indices(self, start_value: float, end_value: float,
+                         chunk_size: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Busca los índices globales con x más cercano a cada valor (igual que crop_data)
+        """
+        best = {start_value: (np.inf, 0), end_value: (np.inf, 0)}
+        offset = 0
+
+        for x_chunk, _ in self.iter_chunks(chunk_size):
+            for value in best:
+                distances = np.abs(x_chunk - value)
+                i = int(np.argmin(distances))
+                # Con '<' estricto se conserva la primera ocurrencia, como np.argmin
+                if distances[i] < best[value][0]:
+                    best[value] = (distances[i], offset + i)
+            offset += len(x_chunk)
+
+        return best[start_value][1], best[end_value][1]
+
+    def iter_crop(self, start_index: Optional[int] = None, end_index: Optional[int] = None,
+                  start_value: Optional[float] = None, end_value: Optional[float] = None,
+                  chunk_size: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Recorre solo la porción recortada de la traza, con la misma semántica que crop_data
+
+        Con start_value/end_value se hace una primera pasada para encontrar los
+        índices más cercanos y una segunda para entregar los chunks recortados.
+        Los índices negativos cuentan desde el final, como en el slicing de
+        crop_data (si el header no indica el número de puntos, se cuentan con
+        una pasada previa).
+
+        Parameters:
+        -----------
+        start_index : Optional[int]
+            Índice de inicio para el recorte (0-based, o negativo desde el final)
+        end_index : Optional[int]
+            Índice de fin para el recorte (exclusivo, o negativo desde el final)
+        start_value : Optional[float]
+            Valor de x para iniciar el recorte (se usará el índice más cercano)
+        end_value : Optional[float]
+            Valor de x para finalizar el recorte (se usará el índice más cercano)
+        chunk_size : Optional[int]
+            Número de puntos por chunk; si es None se usa el del lector
+
+        Yields:
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Arrays (x, y1) recortados
+
+        Raises:
+        -------
+        ValueError
+            Si no se proporcionan parámetros válidos para el recorte
+        """
+        if start_index is not None and end_index is not None:
+            start_idx, end_idx = start_index, end_index
+        elif start_value is not None and end_value is not None:
+            start_idx, end_idx = self._nearest_indices(start_value, end_value, chunk_size)
+        else:
+            raise ValueError("Debe proporcionar start_index y end_index, o start_value y end_value")
+
+        # Asegurar que los índices estén en orden correcto
+        if start_idx > end_idx:
+            start_idx, end_idx = end_idx, start_idx
+
+        if start_idx < 0 or end_idx < 0:
+            # Resolver como el slice data[start_idx:end_idx] de crop_data
+            n_points = self.n_points
+            if n_points is None:
+                n_points = sum(len(x_chunk) for x_chunk, _ in self.iter_chunks(chunk_size))
+            start_idx, end_idx, _ = slice(start_idx, end_idx).indices(n_points)
+
+        offset = 0
+        for x_chunk, y_chunk in self.iter_chunks(chunk_size):
+            chunk_end = offset + len(x_chunk)
+            if chunk_end > start_idx and offset < end_idx:
+                lo = max(start_idx - offset, 0)
+                hi = min(end_idx - offset, len(x_chunk))
+                yield x_chunk[lo:hi], y_chunk[lo:hi]
+            offset = chunk_end
+            if offset >= end_idx:
+                break
+
+    def __repr__(self) -> str:
+        """Representación string del objeto"""
+        return (f"SAStreamReader(file_path='{self.file_path}', "
+                f"header_params={len(self.header_data)}, "
+                f"data_points={self.n_points}, "
+                f"chunk_size={self.chunk_size})")
@@ -2,9 +2,21 @@
 # Author: [Simón Aulet]
 # Date: 2025-09-10
 
+import argparse
+import fnmatch
 import re
-from typing import List, Tuple
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
 import os
+import numpy as np
+
+# Frecuencia codificada en el nombre de las exportaciones ('Diagrama_2_7GHz_...' -> '2.7')
+_FREQUENCY_PATTERN = re.compile(r'(\d+)_(\d+)GHz')
+
+# Entrada del header con los parámetros de conversión de cada .DAT generado
+_PARAMETERS_KEY = 'Conversion'
 
 def load_text_file(file_path: str, y_col: int, 
                   start_row: int, end_row: int, y_unit: str, circular_shift: int = 0, 
@@ -33,39 +45,6 @@ def load_text_file(file_path: str, y_col: int,
         Path of the generated .DAT file
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
-        # Encontrar la línea donde comienzan los datos (después del header)
-        data_start = _find_text_data_start(lines)
-
-        # Procesar datos según los parámetros especificados
-        y_values = []
-        
-        for i in range(max(data_start, start_row), min(end_row, len(lines))):
-            line = lines[i].strip()
-            if not line:
-                continue
-                
-            # Parsear línea separando por espacios múltiples
-            parts = re.split(r'\s+', line)
-            parts = [p for p in parts if p]  # Remover strings vacíos
-            
-            if len(parts) > y_col:
-                try:
-                    y_val = float(parts[y_col])
-                    y_values.append(y_val)
-                except (ValueError, IndexError):
-                    continue
-        
-        # Aplicar desplazamiento circular si se especificó
-        if circular_shift != 0 and len(y_values) > 0:
-            shift_amount = circular_shift % len(y_values)
-            y_values = y_values[-shift_amount:] + y_values[:-shift_amount]
-        
-        # Generar eje X automático (0, 1, 2, 3...)
-        x_values = list(range(len(y_values)))
-
         # Generar archivo .DAT
         if output_path is None:
             base_name = os.path.splitext(file_path)[0]
@@ -75,14 +54,112 @@ def load_text_file(file_path: str, y_col: int,
             base_name = os.path.basename(file_path)
             output_file_name = os.path.splitext(base_name)[0] + '.DAT'
             output_path = os.path.join(output_path, output_file_name)
-        
-        _generate_dat_file(output_path, x_values, y_values, y_unit, len(x_values))
+
+        export_columns(file_path, {y_col: output_path}, start_row, end_row, y_unit,
+                       circular_shift=circular_shift)
 
         return output_path
 
     except Exception as e:
         raise ValueError(f"Error loading text file {file_path}: {str(e)}")
 
+def load_text_columns(file_path: str, y_cols: Sequence[int],
+                      start_row: int, end_row: int) -> Dict[int, np.ndarray]:
+    """
+    Lee las columnas indicadas de un archivo de texto en una sola pasada
+
+    La tabla numérica se convierte con una sola llamada a NumPy. Si las filas
+    no son uniformes se recurre al parser línea por línea, que descarta por
+    columna las filas sin valor válido (igual que load_text_file).
+
+    Parameters:
+    -----------
+    file_path : str
+        Ruta del archivo de texto a cargar
+    y_cols : Sequence[int]
+        Números de columna a extraer (0-based)
+    start_row : int
+        Número de fila inicial (incluida)
+    end_row : int
+        Número de fila final (no incluida)
+
+    Returns:
+    --------
+    Dict[int, np.ndarray]
+        Array de valores por número de columna
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        lines = file.readlines()
+
+    data_start = _find_text_data_start(lines)
+    rows = lines[max(data_start, start_row):min(end_row, len(lines))]
+
+    try:
+        table = np.loadtxt(rows, ndmin=2)
+        if table.shape[0] and table.shape[1] > max(y_cols):
+            return {col: table[:, col] for col in y_cols}
+    except ValueError:
+        pass
+
+    # Filas no uniformes: parsear línea por línea
+    columns = {col: [] for col in y_cols}
+    for line in rows:
+        parts = line.split()
+        for col in y_cols:
+            if len(parts) > col:
+                try:
+                    columns[col].append(float(parts[col]))
+                except ValueError:
+                    continue
+    return {col: np.array(values) for col, values in columns.items()}
+
+def export_columns(file_path: str, outputs: Dict[int, str], start_row: int, end_row: int,
+                   y_unit: str, circular_shift: int = 0) -> List[str]:
+    """
+    Genera un archivo .DAT por columna a partir de una sola lectura del archivo de texto
+
+    Parameters:
+    -----------
+    file_path : str
+        Ruta del archivo de texto a cargar
+    outputs : Dict[int, str]
+        Número de columna (0-based) -> ruta completa del .DAT a generar
+        (por ejemplo {3: 'directa_2.7GHz.DAT', 5: 'cruzada_2.7GHz.DAT'})
+    start_row : int
+        Número de fila inicial (incluida)
+    end_row : int
+        Número de fila final (no incluida)
+    y_unit : str
+        Y-axis unit ('dBm', 'dBi', 'dB')
+    circular_shift : int
+        Circular shift amount for Y data (0 = no shift)
+
+    Returns:
+    --------
+    List[str]
+        Paths of the generated .DAT files, in the order of `outputs`
+    """
+    columns = load_text_columns(file_path, list(outputs), start_row, end_row)
+
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) == 1 and circular_shift != 0:
+        # Todas las columnas con el mismo largo: un solo desplazamiento sobre la tabla
+        stacked = np.roll(np.column_stack(list(columns.values())), circular_shift, axis=0)
+        columns = {col: stacked[:, i] for i, col in enumerate(columns)}
+    elif circular_shift != 0:
+        columns = {col: np.roll(values, circular_shift) for col, values in columns.items()}
+
+    written = []
+    for col, output_path in outputs.items():
+        y_values = columns[col]
+        # Generar eje X automático (0, 1, 2, 3...)
+        x_values = np.arange(len(y_values))
+        _generate_dat_file(output_path, x_values, y_values, y_unit, len(x_values),
+                           _conversion_parameters(col, start_row, end_row, y_unit, circular_shift))
+        written.append(output_path)
+
+    return written
+
 def _find_text_data_start(lines: List[str]) -> int:
     """
     Find the index where numeric data starts in text files
@@ -116,8 +193,9 @@ def _find_text_data_start(lines: List[str]) -> int:
                 pass
     return 0  # If not found, assume it starts from first line
 
-def _generate_dat_file(output_path: str, x_values: List[float], 
-                      y_values: List[float], y_unit: str, n_points: int) -> None:
+def _generate_dat_file(output_path: str, x_values: Sequence[float],
+                      y_values: Sequence[float], y_unit: str, n_points: int,
+                      parameters: Optional[str] = None) -> None:
     """
     Generate a .DAT file with the expected structure
 
@@ -133,6 +211,8 @@ def _generate_dat_file(output_path: str, x_values: List[float],
         Unidad del eje Y
     n_points : int
         Número de puntos
+    parameters : Optional[str]
+        Parámetros de conversión a registrar en el header (ver _conversion_parameters)
     """
     with open(output_path, 'w', encoding='utf-8') as file:
         # Write minimal header consistent with R&S format
@@ -151,9 +231,212 @@ def _generate_dat_file(output_path: str, x_values: List[float],
         else:
             file.write(f"y-Unit;{y_unit};\n")
 
+        if parameters is not None:
+            file.write(f"{_PARAMETERS_KEY};{parameters};\n")
         file.write(f"Values;{n_points};\n")
         file.write("Data Start\n")
 
-        # Escribir datos
-        for x, y in zip(x_values, y_values):
-            file.write(f"{x};{y}\n")
+        # Escribir datos: un solo formateo para todo el bloque
+        values = np.empty(2 * len(y_values), dtype=object)
+        values[0::2] = np.asarray(x_values).tolist()
+        values[1::2] = np.asarray(y_values).tolist()
+        file.write(("%r;%r\n" * len(y_values)) % tuple(values))
+
+def _frequency_label(file_name: str) -> str:
+    """Extrae la frecuencia del nombre del archivo como texto ('2_7GHz' -> '2.7')"""
+    match = _FREQUENCY_PATTERN.search(file_name)
+    if match is None:
+        raise ValueError(f"No se encontró la frecuencia (por ejemplo '2_7GHz') en {file_name}")
+    return f"{match.group(1)}.{match.group(2)}"
+
+def _conversion_parameters(y_col: int, start_row: int, end_row: int, y_unit: str,
+                           circular_shift: int) -> str:
+    """Parámetros que determinan el contenido de un .DAT generado, como texto del header"""
+    return f"col={y_col},rows={start_row}:{end_row},shift={circular_shift},unit={y_unit}"
+
+def _recorded_parameters(output_path: str) -> Optional[str]:
+    """Parámetros de conversión registrados en el header de un .DAT generado, o None"""
+    with open(output_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.startswith('Data Start'):
+                break
+            key, _, value = line.rstrip('\n').partition(';')
+            if key == _PARAMETERS_KEY:
+                return value.rstrip(';')
+    return None
+
+def _is_up_to_date(source_path: str, outputs: Dict[int, str], start_row: int, end_row: int,
+                   y_unit: str, circular_shift: int) -> bool:
+    """
+    Indica si todas las salidas existen, son más nuevas que el archivo de origen
+    y se generaron con los mismos parámetros de conversión
+    """
+    source_mtime = os.stat(source_path).st_mtime_ns
+    for col, output_path in outputs.items():
+        if not os.path.exists(output_path) or os.stat(output_path).st_mtime_ns < source_mtime:
+            return False
+        expected = _conversion_parameters(col, start_row, end_row, y_unit, circular_shift)
+        if _recorded_parameters(output_path) != expected:
+            return False
+    return True
+
+def _convert_directory_worker(file_path: str, outputs: Dict[int, str], start_row: int,
+                              end_row: int, y_unit: str, circular_shift: int) -> float:
+    """Convierte un archivo y retorna el tiempo empleado (debe ser picklable para el pool)"""
+    start = time.perf_counter()
+    export_columns(file_path, outputs, start_row, end_row, y_unit, circular_shift=circular_shift)
+    return time.perf_counter() - start
+
+def convert_directory(input_dir: str, columns: Dict[int, str], output_dir: Optional[str] = None,
+                      circular_shift: int = 0, start_row: int = 3, end_row: int = 363,
+                      y_unit: str = 'dBi', pattern: str = '*.txt', force: bool = False,
+                      max_workers: Optional[int] = None, executor: str = 'process') -> List[Dict]:
+    """
+    Convierte todas las exportaciones de un directorio a archivos .DAT en paralelo
+
+    Cada archivo se lee una sola vez y genera un .DAT por columna (ver export_columns).
+    Se omiten los archivos cuyas salidas ya existen, son más nuevas que el origen
+    y registran en el header los mismos parámetros (columna, filas, desplazamiento
+    y unidad); cambiar cualquiera de ellos regenera las salidas.
+
+    Parameters:
+    -----------
+    input_dir : str
+        Directorio con las exportaciones del simulador
+    columns : Dict[int, str]
+        Número de columna (0-based) -> plantilla del nombre de salida. La plantilla
+        puede usar {freq} (frecuencia tomada del nombre, por ejemplo '2.7') y
+        {name} (nombre del archivo sin extensión), por ejemplo
+        {3: 'directa_{freq}GHz.DAT', 5: 'cruzada_{freq}GHz.DAT'}
+    output_dir : Optional[str]
+        Directorio de salida (default: input_dir)
+    circular_shift : int
+        Circular shift amount for Y data (0 = no shift)
+    start_row : int
+        Número de fila inicial (incluida)
+    end_row : int
+        Número de fila final (no incluida)
+    y_unit : str
+        Y-axis unit ('dBm', 'dBi', 'dB')
+    pattern : str
+        Patrón de nombres de archivo a convertir
+    force : bool
+        Si es True, regenera también las salidas al día
+    max_workers : Optional[int]
+        Número de workers del pool (default: el del executor de Python)
+    executor : str
+        'process' (default), 'thread', o 'serial' para convertir sin pool
+
+    Returns:
+    --------
+    List[Dict]
+        Un reporte por archivo con 'source', 'outputs', 'status'
+        ('converted', 'skipped' o 'error'), 'seconds' y 'error'
+
+    Raises:
+    -------
+    ValueError
+        Si el executor no es válido
+    """
+    if executor not in ('process', 'thread', 'serial'):
+        raise ValueError(f"Executor '{executor}' no válido. Use 'process', 'thread' o 'serial'")
+    if output_dir is None:
+        output_dir = input_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    reports = []
+    pending = []
+    for name in sorted(fnmatch.filter(os.listdir(input_dir), pattern)):
+        source_path = os.path.join(input_dir, name)
+        report = {'source': source_path, 'outputs': [], 'status': 'converted',
+                  'seconds': 0.0, 'error': None}
+        reports.append(report)
+        try:
+            fields = {'name': os.path.splitext(name)[0], 'freq': _frequency_label(name)}
+            outputs = {col: os.path.join(output_dir, template.format(**fields))
+                       for col, template in columns.items()}
+        except (ValueError, KeyError) as e:
+            report.update(status='error', error=str(e))
+            continue
+
+        report['outputs'] = list(outputs.values())
+        if not force and _is_up_to_date(source_path, outputs, start_row, end_row, y_unit, circular_shift):
+            report['status'] = 'skipped'
+            continue
+        pending.append((report, (source_path, outputs, start_row, end_row, y_unit, circular_shift)))
+
+    if executor == 'serial':
+        for report, args in pending:
+            try:
+                report['seconds'] = _convert_directory_worker(*args)
+            except Exception as e:
+                report.update(status='error', error=str(e))
+        return reports
+
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    with pool_class(max_workers=max_workers) as pool:
+        futures = [(report, pool.submit(_convert_directory_worker, *args)) for report, args in pending]
+        for report, future in futures:
+            try:
+                report['seconds'] = future.result()
+            except Exception as e:
+                # Registrar el error del archivo sin abortar el lote
+                report.update(status='error', error=str(e))
+
+    return reports
+
+def _parse_column_mapping(text: str) -> Tuple[int, str]:
+    """Convierte 'COLUMNA=PLANTILLA' (por ejemplo '3=directa_{freq}GHz.DAT') en una tupla"""
+    column, separator, template = text.partition('=')
+    if not separator or not column.strip().isdigit() or not template:
+        raise argparse.ArgumentTypeError(f"Mapeo '{text}' no válido. Use COLUMNA=PLANTILLA")
+    return int(column), template
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Línea de comandos de convert_directory
+
+    Ejemplo (regenera los .DAT de `simulaciones/`):
+
+        python -m scripts.txt2dat simulaciones/originales -o simulaciones --shift 180 \\
+            -c '3=directa_{freq}GHz.DAT' -c '5=cruzada_{freq}GHz.DAT'
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m scripts.txt2dat',
+        description='Convierte las exportaciones de texto del simulador a archivos .DAT')
+    parser.add_argument('input_dir', help='directorio con las exportaciones')
+    parser.add_argument('-c', '--column', dest='columns', action='append', required=True,
+                        type=_parse_column_mapping, metavar='COLUMNA=PLANTILLA',
+                        help="columna (0-based) y nombre de salida; admite {freq} y {name}")
+    parser.add_argument('-o', '--output-dir', help='directorio de salida (default: input_dir)')
+    parser.add_argument('--shift', type=int, default=0, help='desplazamiento circular de Y')
+    parser.add_argument('--start-row', type=int, default=3, help='fila inicial (incluida)')
+    parser.add_argument('--end-row', type=int, default=363, help='fila final (no incluida)')
+    parser.add_argument('--unit', default='dBi', help='unidad del eje Y')
+    parser.add_argument('--pattern', default='*.txt', help='patrón de archivos a convertir')
+    parser.add_argument('--force', action='store_true', help='regenerar salidas al día')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='número de workers')
+    parser.add_argument('--executor', choices=('process', 'thread', 'serial'), default='process')
+    args = parser.parse_args(argv)
+
+    reports = convert_directory(args.input_dir, dict(args.columns), output_dir=args.output_dir,
+                                circular_shift=args.shift, start_row=args.start_row,
+                                end_row=args.end_row, y_unit=args.unit, pattern=args.pattern,
+                                force=args.force, max_workers=args.workers, executor=args.executor)
+
+    for report in reports:
+        name = os.path.basename(report['source'])
+        if report['status'] == 'converted':
+            print(f"  {name}: {report['seconds'] * 1e3:.1f} ms -> {len(report['outputs'])} archivos")
+        elif report['status'] == 'skipped':
+            print(f"  {name}: al día")
+        else:
+            print(f"  {name}: error: {report['error']}")
+
+    counts = {status: sum(r['status'] == status for r in reports)
+              for status in ('converted', 'skipped', 'error')}
+    print(f"Convertidos: {counts['converted']}, al día: {counts['skipped']}, errores: {counts['error']}")
+    return 1 if counts['error'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())